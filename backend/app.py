@@ -5,24 +5,51 @@ This is the main application file that sets up the FastAPI server,
 configures CORS, and defines API endpoints for text analysis.
 """
 
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
 from fastapi import FastAPI, HTTPException, status, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, Response
+import asyncio
 import os
+from typing import Any, Dict, List
+import httpx
+import orjson
 from dotenv import load_dotenv
 import logging
 
-from schemas.analysis import AnalysisRequest, AnalysisResponse, ErrorResponse, ChatRequest, ChatResponse
-from core.models_nlp import TextAnalyzer
-from core.suggestions import SuggestionGenerator
+from schemas.analysis import (
+    AnalysisRequest,
+    AnalysisResponse,
+    BatchAnalysisRequest,
+    ErrorResponse,
+    ChatRequest,
+    ChatResponse,
+)
+from core.models_nlp import TextAnalyzer, text_analyzer
+from core.suggestions import SuggestionGenerator, suggestion_generator
 from core.ai_therapist import AITherapist
-from core.dependencies import get_current_user, get_current_user_id
+from core.batching import DynamicBatcher
+from core.response_cache import ResponseCache
+from utils.timestamps import utc_now_iso
+from utils.workers import worker_count
+from core.dependencies import (
+    get_current_user,
+    get_current_user_id,
+    get_text_analyzer,
+    get_suggestion_generator,
+    get_ai_therapist,
+    get_analysis_batcher,
+    get_response_cache,
+    get_http_client,
+)
 from models.user import UserInDB
 from database import init_database, close_database
 from routes import auth_router
 from routes.mood_logs import router as mood_logs_router
 from routes.wellness_plans import router as wellness_plans_router
 from routes.chat_history import router as chat_history_router
+from routes.dashboard import router as dashboard_router
 
 # Load environment variables
 load_dotenv()
@@ -34,6 +61,109 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+
+# Sample input run through the pipeline once at startup
+_WARMUP_TEXT = "I feel a little anxious about work today, but I'm hopeful it will be fine."
+
+
+async def _warm_up_pipeline(app: FastAPI) -> None:
+    """
+    Run one analysis, suggestion and classification pass off the event loop.
+    
+    Exercises first-call code paths so the first real request does not pay
+    for them.
+    
+    Args:
+        app: Application whose engines on ``app.state`` should be warmed
+    """
+    try:
+        analysis_result = await asyncio.to_thread(app.state.text_analyzer.analyze_text, _WARMUP_TEXT)
+        await asyncio.to_thread(
+            app.state.suggestion_generator.generate_complete_suggestions,
+            primary_emotion=analysis_result['primary_emotion'],
+            stress_score=analysis_result['stress_score'],
+            emotions=analysis_result['emotions'],
+            cognitive_distortions=analysis_result['cognitive_distortions']
+        )
+        await asyncio.to_thread(app.state.ai_therapist.classify, _WARMUP_TEXT.lower())
+        logger.info("✅ Analysis pipeline warmed up")
+    except Exception as e:
+        logger.warning("Analysis pipeline warm-up failed: %s", e)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Application lifespan handler.
+    
+    Sets up the analysis engines once per process, initializes the database
+    connection on startup and closes it on shutdown. The engines are stored
+    on ``app.state`` and injected into handlers via dependencies.
+    """
+    logger.info("Starting up application...")
+    
+    # Size the default executor used by asyncio.to_thread for blocking
+    # analysis and Gemini calls
+    thread_pool_size = int(os.getenv('THREAD_POOL_SIZE', '32'))
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=thread_pool_size, thread_name_prefix="analysis")
+    )
+    
+    # Share the process-wide analyzers; build the therapist off the event
+    # loop so startup stays responsive
+    app.state.text_analyzer = text_analyzer
+    app.state.suggestion_generator = suggestion_generator
+    app.state.ai_therapist = await asyncio.to_thread(AITherapist)
+    logger.info("✅ Analysis engines initialized")
+    
+    # Coalesce concurrent /analyze_text requests into batches
+    app.state.analysis_batcher = DynamicBatcher(
+        app.state.text_analyzer.analyze_batch,
+        max_batch_size=int(os.getenv('ANALYSIS_BATCH_SIZE', '16')),
+        max_delay=int(os.getenv('ANALYSIS_BATCH_DELAY_MS', '10')) / 1000,
+    )
+    await app.state.analysis_batcher.start()
+    
+    # Warm the pipeline in the background (or before serving, if requested
+    # so readiness probes only pass once it is warm)
+    warmup_task = asyncio.create_task(_warm_up_pipeline(app))
+    if os.getenv('WARMUP_BLOCKING', 'false').lower() == 'true':
+        await warmup_task
+    
+    # Reuse responses for repeated analysis texts and chat messages
+    app.state.response_cache = ResponseCache(
+        maxsize=int(os.getenv('RESPONSE_CACHE_SIZE', '2048')),
+        ttl=int(os.getenv('RESPONSE_CACHE_TTL_SECONDS', '600')),
+    )
+    
+    # Shared keep-alive HTTP/2 client for Gemini REST calls
+    app.state.http_client = httpx.AsyncClient(
+        http2=True,
+        timeout=float(os.getenv('GEMINI_TIMEOUT_SECONDS', '30')),
+        limits=httpx.Limits(max_keepalive_connections=32),
+    )
+    
+    try:
+        await init_database()
+        logger.info("✅ Database initialized successfully")
+    except Exception as e:
+        logger.error("❌ Failed to initialize database: %s", e)
+        # Don't prevent startup - allow app to run without database for now
+        logger.warning("⚠️  Application starting without database connection")
+    
+    yield
+    
+    logger.info("Shutting down application...")
+    warmup_task.cancel()
+    await app.state.analysis_batcher.stop()
+    await app.state.http_client.aclose()
+    try:
+        await close_database()
+        logger.info("✅ Database connection closed successfully")
+    except Exception as e:
+        logger.error("Error closing database: %s", e)
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="InsightSphere AI API",
@@ -41,79 +171,108 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 # Configure CORS
+# CORS_ORIGINS is a comma-separated list of origins, or "re:<pattern>" to
+# allow every origin matching a regular expression (e.g. preview subdomains)
 origins_str = os.getenv('CORS_ORIGINS', 'http://localhost:5173,http://localhost:3000')
-origins = [origin.strip() for origin in origins_str.split(',')]
+if origins_str.startswith('re:'):
+    cors_origin_options = {'allow_origin_regex': origins_str[3:]}
+else:
+    # frozenset gives O(1) origin checks in the middleware
+    cors_origin_options = {
+        'allow_origins': frozenset(
+            origin.strip() for origin in origins_str.split(',') if origin.strip()
+        )
+    }
 
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=origins,
+    **cors_origin_options,
     allow_credentials=True,
     allow_methods=["GET", "POST", "OPTIONS"],
     allow_headers=["*"],
+    max_age=86400,  # Let browsers cache preflight responses for a day
 )
 
-# Initialize analyzers
-text_analyzer = TextAnalyzer()
-suggestion_generator = SuggestionGenerator()
-ai_therapist = AITherapist()
-
 # Include routers
 app.include_router(auth_router)
 app.include_router(mood_logs_router)
 app.include_router(wellness_plans_router)
 app.include_router(chat_history_router)
+app.include_router(dashboard_router)
 
 logger.info("InsightSphere AI backend initialized successfully")
 
 
-@app.on_event("startup")
-async def startup_event():
+# Health check body, serialized once at import
+_HEALTH_BODY = orjson.dumps({
+    "message": "InsightSphere AI Backend Running",
+    "version": "1.0.0",
+    "status": "healthy"
+})
+
+
+@app.get("/", tags=["Health"])
+async def root():
     """
-    Application startup event handler.
+    Health check endpoint.
     
-    Initializes database connection and creates indexes.
+    Returns:
+        Response: Pre-serialized status message confirming the API is running
     """
-    logger.info("Starting up application...")
-    try:
-        await init_database()
-        logger.info("✅ Database initialized successfully")
-    except Exception as e:
-        logger.error(f"❌ Failed to initialize database: {str(e)}")
-        # Don't prevent startup - allow app to run without database for now
-        logger.warning("⚠️  Application starting without database connection")
+    return Response(content=_HEALTH_BODY, media_type="application/json")
 
 
-@app.on_event("shutdown")
-async def shutdown_event():
+def _build_analysis_response(analysis_result: Dict[str, Any], suggestions: List[str]) -> AnalysisResponse:
     """
-    Application shutdown event handler.
+    Combine analyzer output and suggestions into an AnalysisResponse.
     
-    Closes database connection gracefully.
+    Args:
+        analysis_result: Result dictionary from TextAnalyzer
+        suggestions: Suggestions for that result
+        
+    Returns:
+        AnalysisResponse: Response model built without validation
     """
-    logger.info("Shutting down application...")
-    try:
-        await close_database()
-        logger.info("✅ Database connection closed successfully")
-    except Exception as e:
-        logger.error(f"Error closing database: {str(e)}")
+    # Analyzer output is trusted, so skip re-validating it
+    return AnalysisResponse.model_construct(
+        emotions=analysis_result['emotions'],
+        primary_emotion=analysis_result['primary_emotion'],
+        stress_score=analysis_result['stress_score'],
+        cognitive_distortions=analysis_result['cognitive_distortions'],
+        summary=analysis_result['summary'],
+        suggestions=suggestions,
+        timestamp=analysis_result['timestamp']
+    )
 
 
-@app.get("/", tags=["Health"])
-async def root():
+def _suggest_for_results(
+    suggestion_generator: SuggestionGenerator,
+    analysis_results: List[Dict[str, Any]]
+) -> List[List[str]]:
     """
-    Health check endpoint.
+    Generate suggestions for several analysis results in one call.
     
+    Args:
+        suggestion_generator: Suggestion generator to use
+        analysis_results: Result dictionaries from TextAnalyzer
+        
     Returns:
-        dict: Status message confirming the API is running
+        List of suggestion lists, in the same order as ``analysis_results``
     """
-    return {
-        "message": "InsightSphere AI Backend Running",
-        "version": "1.0.0",
-        "status": "healthy"
-    }
+    return [
+        suggestion_generator.generate_complete_suggestions(
+            primary_emotion=result['primary_emotion'],
+            stress_score=result['stress_score'],
+            emotions=result['emotions'],
+            cognitive_distortions=result['cognitive_distortions']
+        )
+        for result in analysis_results
+    ]
 
 
 @app.post(
@@ -143,7 +302,10 @@ async def root():
 )
 async def analyze_text(
     request: AnalysisRequest,
-    user_id: str = Depends(get_current_user_id)
+    user_id: str = Depends(get_current_user_id),
+    analysis_batcher: DynamicBatcher = Depends(get_analysis_batcher),
+    suggestion_generator: SuggestionGenerator = Depends(get_suggestion_generator),
+    response_cache: ResponseCache = Depends(get_response_cache)
 ):
     """
     Analyze user text for emotions, stress levels, and cognitive patterns.
@@ -165,13 +327,22 @@ async def analyze_text(
         HTTPException: 422 for validation errors, 500 for processing errors
     """
     try:
-        logger.info(f"Received analysis request from user {user_id} (text length: {len(request.text)} chars)")
+        logger.info("Received analysis request from user %s (text length: %d chars)", user_id, len(request.text))
+        
+        # Serve repeated texts from the response cache
+        cache_key = response_cache.analysis_key(request.text)
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            cached['timestamp'] = utc_now_iso()
+            logger.info("Analysis served from cache")
+            return AnalysisResponse.model_construct(**cached)
         
-        # Perform NLP analysis
-        analysis_result = text_analyzer.analyze_text(request.text)
+        # Perform NLP analysis (batched with concurrent requests, run off the event loop)
+        analysis_result = await analysis_batcher.process_batched(request.text)
         
         # Generate suggestions
-        suggestions = suggestion_generator.generate_complete_suggestions(
+        suggestions = await asyncio.to_thread(
+            suggestion_generator.generate_complete_suggestions,
             primary_emotion=analysis_result['primary_emotion'],
             stress_score=analysis_result['stress_score'],
             emotions=analysis_result['emotions'],
@@ -179,28 +350,121 @@ async def analyze_text(
         )
         
         # Build response
-        response = AnalysisResponse(
-            emotions=analysis_result['emotions'],
-            primary_emotion=analysis_result['primary_emotion'],
-            stress_score=analysis_result['stress_score'],
-            cognitive_distortions=analysis_result['cognitive_distortions'],
-            summary=analysis_result['summary'],
-            suggestions=suggestions,
-            timestamp=analysis_result['timestamp']
-        )
+        response = _build_analysis_response(analysis_result, suggestions)
+        response_cache.put(cache_key, response.model_dump())
         
-        logger.info(f"Analysis completed successfully: primary_emotion={response.primary_emotion}, stress_score={response.stress_score}")
+        logger.info("Analysis completed successfully: primary_emotion=%s, stress_score=%s", response.primary_emotion, response.stress_score)
         
         return response
         
     except ValueError as e:
-        logger.error(f"Validation error: {str(e)}")
+        logger.error("Validation error: %s", e)
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail=str(e)
         )
     except Exception as e:
-        logger.error(f"Processing error: {str(e)}", exc_info=True)
+        logger.error("Processing error: %s", e, exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Analysis failed, please try again"
+        )
+
+
+@app.post(
+    "/analyze_text/batch",
+    response_model=List[AnalysisResponse],
+    status_code=status.HTTP_200_OK,
+    tags=["Analysis"],
+    summary="Analyze several texts in one request",
+    responses={
+        200: {
+            "description": "Analysis results, in request order",
+            "model": List[AnalysisResponse]
+        },
+        401: {
+            "description": "Unauthorized - Invalid or missing token",
+            "model": ErrorResponse
+        },
+        422: {
+            "description": "Validation error - invalid input (1-64 items of 20-5000 characters)",
+            "model": ErrorResponse
+        },
+        500: {
+            "description": "Server error",
+            "model": ErrorResponse
+        }
+    }
+)
+async def analyze_text_batch(
+    request: BatchAnalysisRequest,
+    user_id: str = Depends(get_current_user_id),
+    text_analyzer: TextAnalyzer = Depends(get_text_analyzer),
+    suggestion_generator: SuggestionGenerator = Depends(get_suggestion_generator),
+    response_cache: ResponseCache = Depends(get_response_cache)
+):
+    """
+    Analyze several texts in one round trip.
+    
+    Each item is analyzed exactly like a /analyze_text request. Items not
+    already cached are analyzed together in a single worker-thread call.
+    
+    Args:
+        request: BatchAnalysisRequest containing up to 64 texts
+        
+    Returns:
+        List[AnalysisResponse]: One analysis per item, in request order
+        
+    Raises:
+        HTTPException: 422 for validation errors, 500 for processing errors
+    """
+    try:
+        logger.info("Received batch analysis request from user %s (%d items)", user_id, len(request.items))
+        
+        timestamp = utc_now_iso()
+        responses: List[Any] = [None] * len(request.items)
+        
+        # Serve cached texts, and group the rest by cache key so duplicates are analyzed once
+        pending: Dict[Any, List[int]] = {}
+        texts: List[str] = []
+        for index, item in enumerate(request.items):
+            cache_key = response_cache.analysis_key(item.text)
+            cached = response_cache.get(cache_key)
+            if cached is not None:
+                cached['timestamp'] = timestamp
+                responses[index] = AnalysisResponse.model_construct(**cached)
+            else:
+                if cache_key not in pending:
+                    texts.append(item.text)
+                pending.setdefault(cache_key, []).append(index)
+        
+        if texts:
+            # Analyze and build suggestions for all uncached texts off the event loop
+            analysis_results = await asyncio.to_thread(text_analyzer.analyze_batch, texts)
+            suggestion_lists = await asyncio.to_thread(
+                _suggest_for_results, suggestion_generator, analysis_results
+            )
+            
+            for (cache_key, indexes), analysis_result, suggestions in zip(
+                pending.items(), analysis_results, suggestion_lists
+            ):
+                response = _build_analysis_response(analysis_result, suggestions)
+                response_cache.put(cache_key, response.model_dump())
+                for index in indexes:
+                    responses[index] = response
+        
+        logger.info("Batch analysis completed: %d items, %d analyzed", len(responses), len(texts))
+        
+        return responses
+        
+    except ValueError as e:
+        logger.error("Validation error: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.error("Processing error: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Analysis failed, please try again"
@@ -234,7 +498,10 @@ async def analyze_text(
 )
 async def chat_with_therapist(
     request: ChatRequest,
-    user_id: str = Depends(get_current_user_id)
+    user_id: str = Depends(get_current_user_id),
+    ai_therapist: AITherapist = Depends(get_ai_therapist),
+    response_cache: ResponseCache = Depends(get_response_cache),
+    http_client: httpx.AsyncClient = Depends(get_http_client)
 ):
     """
     Have a conversation with the AI therapist for personalized mental health support.
@@ -256,46 +523,69 @@ async def chat_with_therapist(
         HTTPException: 422 for validation errors, 500 for processing errors
     """
     try:
-        logger.info(f"Received chat request from user {user_id} (message length: {len(request.message)} chars)")
+        logger.info("Received chat request from user %s (message length: %d chars)", user_id, len(request.message))
+        
+        conversation_history = request.conversation_history or []
+        
+        # Serve repeated messages in the same conversation state from the cache
+        cache_key = response_cache.chat_key(
+            request.message, conversation_history, request.emotional_context
+        )
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            if cached['crisis_detected']:
+                logger.warning("Crisis detected: %s severity", cached['crisis_severity'])
+            cached['timestamp'] = utc_now_iso()
+            logger.info("Chat response served from cache")
+            return ChatResponse.model_construct(**cached)
         
-        # Assess crisis level
-        crisis_assessment = ai_therapist.assess_crisis_level(request.message)
+        # Assess crisis level and pick the fallback category in one keyword scan
+        classification = ai_therapist.classify(request.message.lower())
+        crisis_assessment = classification.crisis
         
-        # Generate AI response
-        ai_response = ai_therapist.generate_response(
+        # Generate AI response (async Gemini REST call on the shared client)
+        ai_response = await ai_therapist.generate_response_async(
+            http_client,
             user_message=request.message,
-            conversation_history=request.conversation_history or [],
+            conversation_history=conversation_history,
             emotional_context=request.emotional_context
         )
+        from_gemini = ai_response is not None
+        if not from_gemini:
+            ai_response = ai_therapist.fallback_response(
+                request.message, request.emotional_context, classification
+            )
         
         # Get crisis resources if needed
         crisis_resources = None
         if crisis_assessment['crisis_detected']:
-            crisis_resources = ai_therapist.get_crisis_resources()
-            logger.warning(f"Crisis detected: {crisis_assessment['severity']} severity")
+            crisis_resources = dict(ai_therapist.get_crisis_resources())
+            logger.warning("Crisis detected: %s severity", crisis_assessment['severity'])
         
-        from datetime import datetime
-        
-        response = ChatResponse(
+        # Fields are produced by the server, so skip re-validating them
+        response = ChatResponse.model_construct(
             response=ai_response,
             crisis_detected=crisis_assessment['crisis_detected'],
             crisis_severity=crisis_assessment['severity'],
             crisis_resources=crisis_resources,
-            timestamp=datetime.utcnow().isoformat() + 'Z'
+            timestamp=utc_now_iso()
         )
+        # Canned fallbacks are not cached, so the next request retries Gemini
+        if from_gemini:
+            response_cache.put(cache_key, response.model_dump())
         
         logger.info("Chat response generated successfully")
         
         return response
         
     except ValueError as e:
-        logger.error(f"Validation error: {str(e)}")
+        logger.error("Validation error: %s", e)
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail=str(e)
         )
     except Exception as e:
-        logger.error(f"Processing error: {str(e)}", exc_info=True)
+        logger.error("Processing error: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Chat failed, please try again"
@@ -307,7 +597,7 @@ async def http_exception_handler(request, exc):
     """Custom exception handler for HTTP exceptions."""
     error_type = "validation_error" if exc.status_code == 422 else "server_error"
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={
             "detail": exc.detail,
@@ -319,9 +609,9 @@ async def http_exception_handler(request, exc):
 @app.exception_handler(Exception)
 async def general_exception_handler(request, exc):
     """Custom exception handler for unexpected errors."""
-    logger.error(f"Unexpected error: {str(exc)}", exc_info=True)
+    logger.error("Unexpected error: %s", exc, exc_info=True)
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={
             "detail": "An unexpected error occurred. Please try again later.",
@@ -331,11 +621,23 @@ async def general_exception_handler(request, exc):
 
 
 if __name__ == "__main__":
+    import sys
     import uvicorn
+    
+    # Auto-reload for local development only; it runs a single worker
+    dev_mode = os.getenv("ENV", "dev") == "dev"
+    
+    # Each worker is a separate process with its own analyzers, batcher and
+    # response cache
+    workers = worker_count()
+    
     uvicorn.run(
         "app:app",
         host="0.0.0.0",
-        port=8000,
-        reload=True,
+        port=int(os.getenv("PORT", "8000")),
+        loop="asyncio" if sys.platform == "win32" else "uvloop",  # uvloop is not available on Windows
+        http="httptools",
+        workers=workers,
+        reload=dev_mode,
         log_level="info"
     )
@@ -1,6 +1,32 @@
 """
 Core module initialization
 """
-from core.dependencies import get_current_user, get_current_user_id, extract_token_from_header
+from core.models_nlp import TextAnalyzer, text_analyzer
+from core.suggestions import SuggestionGenerator, suggestion_generator
+from core.dependencies import (
+    get_current_user,
+    get_current_user_id,
+    extract_token_from_header,
+    get_text_analyzer,
+    get_suggestion_generator,
+    get_ai_therapist,
+    get_analysis_batcher,
+    get_response_cache,
+    get_http_client,
+)
 
-__all__ = ["get_current_user", "get_current_user_id", "extract_token_from_header"]
+__all__ = [
+    "TextAnalyzer",
+    "text_analyzer",
+    "SuggestionGenerator",
+    "suggestion_generator",
+    "get_current_user",
+    "get_current_user_id",
+    "extract_token_from_header",
+    "get_text_analyzer",
+    "get_suggestion_generator",
+    "get_ai_therapist",
+    "get_analysis_batcher",
+    "get_response_cache",
+    "get_http_client",
+]
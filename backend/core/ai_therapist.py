@@ -5,11 +5,159 @@ This module provides conversational AI therapy using advanced language models.
 It acts as a supportive, empathetic mental health companion.
 """
 
-from typing import List, Dict, Optional
+from typing import Any, List, Dict, Final, Mapping, NamedTuple, Optional
+from types import MappingProxyType
+import logging
 import os
 from datetime import datetime
+from functools import lru_cache
 import json
 
+import httpx
+
+from core.keyword_scanner import KeywordScanner
+
+logger = logging.getLogger(__name__)
+
+# Gemini REST endpoint (gemini-2.5-flash - latest available model)
+GEMINI_API_URL = "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash:generateContent"
+
+
+# Rule-based replies used when Gemini is unavailable, keyed by fallback category
+_FALLBACK_REPLIES: Final[Mapping[str, str]] = MappingProxyType({
+    # Crisis
+    'crisis': """I'm really concerned about what you're sharing. These feelings are serious, and you deserve immediate support.
+
+Please reach out to a crisis helpline right away:
+- National Suicide Prevention Lifeline: 988 (US)
+- Crisis Text Line: Text HOME to 741741
+- International Association for Suicide Prevention: https://www.iasp.info/resources/Crisis_Centres/
+
+You don't have to face this alone. Please talk to someone who can help right now.""",
+
+    # Anxiety
+    'anxiety': """I hear that you're feeling anxious, and that can be really overwhelming. Anxiety is your body's way of trying to protect you, even when it feels uncomfortable.
+
+Let's try something together: Can you take a slow, deep breath with me? Breathe in for 4 counts, hold for 4, and out for 4.
+
+What specifically is worrying you right now? Sometimes naming our worries can help us see them more clearly. And remember - you've gotten through anxious moments before, and you can get through this one too.""",
+
+    # Sadness
+    'sadness': """Thank you for sharing how you're feeling. Sadness can feel so heavy, and it takes courage to acknowledge it.
+
+Your feelings are valid, and it's okay to not be okay sometimes. You don't have to push these feelings away or fix them immediately.
+
+What would feel supportive for you right now? Sometimes it helps to talk about what's weighing on you, and sometimes it helps to just be gentle with yourself. What do you need most in this moment?""",
+
+    # Anger
+    'anger': """I can sense the frustration and anger in what you're sharing. Those are powerful emotions, and they're telling you that something feels wrong or unfair.
+
+Before we dive deeper, let's make sure you're in a space where you can think clearly. Have you had a chance to take a few deep breaths or step away from the situation?
+
+What happened that triggered these feelings? And what do you think you need right now - to be heard, to problem-solve, or something else?""",
+
+    # Stress
+    'stress': """It sounds like you're carrying a lot right now, and feeling overwhelmed is completely understandable when there's so much on your plate.
+
+Let's break this down together. What's the most pressing thing you're dealing with right now? Sometimes when everything feels urgent, it helps to focus on just one thing at a time.
+
+Also, have you been able to take care of your basic needs today - sleep, food, water? When we're stressed, these often get neglected, but they make a big difference in how we cope.""",
+
+    # Relationship
+    'relationship': """Relationships can be one of the most meaningful and challenging parts of life. It sounds like you're navigating something difficult.
+
+Can you tell me more about what's happening? What's the situation, and how is it affecting you?
+
+Sometimes it helps to think about: What do you need from this relationship? What are you hoping will change? And what's within your control to address?""",
+
+    # Work/school
+    'work': """Work and academic pressures can be really intense. It sounds like you're dealing with something challenging in that area.
+
+What specifically is weighing on you? Is it the workload, relationships with others, performance expectations, or something else?
+
+Remember that your worth isn't defined by your productivity or achievements. You're valuable as a person, regardless of how things go at work or school. What support do you need right now?"""
+})
+
+# Default empathetic reply when no category matches
+_DEFAULT_REPLY: Final[str] = """Thank you for sharing that with me. I'm here to listen and support you.
+
+Can you tell me more about what's on your mind? What's been happening, and how are you feeling about it?
+
+Sometimes it helps to talk through things, and I'm here to help you explore your thoughts and feelings without judgment."""
+
+# Crisis assessments by severity, shared by every classification
+_CRISIS_ASSESSMENTS: Final[Mapping[str, Mapping[str, Any]]] = MappingProxyType({
+    'high': MappingProxyType({
+        'crisis_detected': True,
+        'severity': 'high',
+        'message': 'Immediate crisis support needed'
+    }),
+    'medium': MappingProxyType({
+        'crisis_detected': True,
+        'severity': 'medium',
+        'message': 'Concerning content detected'
+    }),
+    'low': MappingProxyType({
+        'crisis_detected': True,
+        'severity': 'low',
+        'message': 'Distress detected'
+    }),
+    'none': MappingProxyType({
+        'crisis_detected': False,
+        'severity': 'none',
+        'message': 'No crisis indicators'
+    })
+})
+
+# Longest lowercased message whose classification is cached
+_CLASSIFY_CACHE_MAX_LENGTH: Final[int] = 128
+
+# Crisis support resources returned with crisis-flagged chat responses
+_CRISIS_RESOURCES: Final[Mapping[str, List[Dict[str, str]]]] = MappingProxyType({
+    'immediate': [
+        {
+            'name': 'National Suicide Prevention Lifeline',
+            'contact': '988',
+            'description': '24/7 crisis support in the US'
+        },
+        {
+            'name': 'Crisis Text Line',
+            'contact': 'Text HOME to 741741',
+            'description': '24/7 text-based crisis support'
+        },
+        {
+            'name': 'Emergency Services',
+            'contact': '911',
+            'description': 'For immediate life-threatening emergencies'
+        }
+    ],
+    'international': [
+        {
+            'name': 'International Association for Suicide Prevention',
+            'contact': 'https://www.iasp.info/resources/Crisis_Centres/',
+            'description': 'Crisis centers worldwide'
+        }
+    ],
+    'online': [
+        {
+            'name': 'BetterHelp',
+            'contact': 'https://www.betterhelp.com',
+            'description': 'Online therapy platform'
+        },
+        {
+            'name': 'Talkspace',
+            'contact': 'https://www.talkspace.com',
+            'description': 'Online therapy and psychiatry'
+        }
+    ]
+})
+
+
+class MessageClassification(NamedTuple):
+    """Result of scanning a message once for crisis and fallback keywords."""
+    crisis: Mapping[str, Any]
+    fallback_category: Optional[str]
+
 
 class AITherapist:
     """
@@ -31,7 +179,41 @@ class AITherapist:
             api_key: Gemini API key (optional, will use env var if not provided)
         """
         self.api_key = api_key or os.getenv('GEMINI_API_KEY')
-        self.model = "gemini-1.5-flash"  # Google's Gemini 1.5 Flash model (latest)
+        
+        # Crisis keywords by severity (highest severity wins)
+        self.crisis_keywords = {
+            'high': ['suicide', 'kill myself', 'end my life', 'want to die', 'no reason to live'],
+            'medium': ['self harm', 'hurt myself', 'cutting', 'can\'t go on', 'give up'],
+            'low': ['hopeless', 'worthless', 'no point', 'better off without me']
+        }
+        
+        # Fallback reply categories (first matching category wins)
+        self.fallback_keywords = {
+            'crisis': ['suicide', 'kill myself', 'end it all', 'want to die', 'no point living'],
+            'anxiety': ['anxious', 'worried', 'panic', 'nervous', 'scared', 'afraid'],
+            'sadness': ['sad', 'depressed', 'down', 'hopeless', 'empty', 'lonely'],
+            'anger': ['angry', 'furious', 'frustrated', 'mad', 'irritated', 'rage'],
+            'stress': ['stressed', 'overwhelmed', 'too much', 'can\'t handle', 'pressure'],
+            'relationship': ['relationship', 'partner', 'friend', 'family', 'conflict', 'argument'],
+            'work': ['work', 'job', 'school', 'exam', 'deadline', 'performance', 'boss', 'teacher']
+        }
+        
+        # One scanner over both keyword sets, so a message is scanned in a single pass
+        self._keyword_scanner = KeywordScanner({
+            **{('crisis', severity): keywords for severity, keywords in self.crisis_keywords.items()},
+            **{('fallback', category): keywords for category, keywords in self.fallback_keywords.items()}
+        })
+        
+        # Short messages repeat often ("i'm anxious", "help"), so cache their classification
+        self._classify_cached = lru_cache(maxsize=2048)(self._classify)
+        
+        # Sampling settings shared by every Gemini request
+        self._generation_config = {
+            'temperature': 0.7,
+            'topP': 0.95,
+            'topK': 40,
+            'maxOutputTokens': 500,
+        }
         
         # System prompt that defines the therapist's behavior
         self.system_prompt = """You are a compassionate, professional AI mental health companion for InsightSphere AI. Your role is to:
@@ -61,79 +243,112 @@ class AITherapist:
 - **Validation**: Acknowledge emotions before problem-solving
 
 Remember: You're here to support, not to fix. Sometimes people just need to be heard."""
+        
+        # Constant start of every prompt
+        self._system_prefix = self.system_prompt + "\n\n"
 
-    def generate_response(
+    async def generate_response_async(
         self,
+        client: httpx.AsyncClient,
         user_message: str,
         conversation_history: List[Dict[str, str]],
         emotional_context: Optional[Dict] = None
-    ) -> str:
+    ) -> Optional[str]:
         """
-        Generate a therapeutic response to the user's message.
+        Generate a therapeutic response without blocking the event loop.
         
         Args:
+            client: Shared async HTTP client used for the Gemini REST call
             user_message: The user's current message
             conversation_history: List of previous messages [{"role": "user/assistant", "content": "..."}]
             emotional_context: Optional emotional analysis data (emotions, stress_score, etc.)
             
         Returns:
-            AI-generated therapeutic response
+            Gemini's reply, or None when Gemini is unavailable or the call
+            fails so the caller can fall back (see ``fallback_response``)
         """
-        # Use Gemini AI if API key is provided, otherwise use fallback
+        if not self.api_key:
+            logger.warning("No Gemini API key found. Using fallback responses.")
+            return None
+        
         try:
-            # Only try Gemini if API key is provided
-            if not self.api_key:
-                print("No Gemini API key found. Using fallback responses.")
-                return self._fallback_response(user_message, emotional_context)
-            
-            print(f"Using Gemini API with key: {self.api_key[:20]}...")
-            
-            import google.generativeai as genai
-            genai.configure(api_key=self.api_key)
-            
-            # Create the model (using gemini-2.5-flash - latest available model)
-            model = genai.GenerativeModel('models/gemini-2.5-flash')
-            
-            # Build the prompt with system instructions and context
-            full_prompt = self.system_prompt + "\n\n"
-            
-            # Add emotional context if available
-            if emotional_context:
-                context_msg = self._format_emotional_context(emotional_context)
-                full_prompt += context_msg + "\n\n"
-            
-            # Add conversation history
-            if conversation_history:
-                full_prompt += "Previous conversation:\n"
-                for msg in conversation_history[-6:]:  # Last 6 messages for context
-                    role = "User" if msg['role'] == 'user' else "Assistant"
-                    full_prompt += f"{role}: {msg['content']}\n"
-                full_prompt += "\n"
+            response = await client.post(
+                GEMINI_API_URL,
+                headers={'x-goog-api-key': self.api_key},
+                json=self._build_request_body(user_message, conversation_history, emotional_context)
+            )
+            response.raise_for_status()
+            return self._extract_response_text(response.json())
             
-            # Add current user message
-            full_prompt += f"User: {user_message}\n\nAssistant:"
+        except Exception as e:
+            # Any error, let the caller fall back
+            logger.error("Error generating Gemini response: %s", e)
+            return None
+    
+    def _build_request_body(
+        self,
+        user_message: str,
+        conversation_history: List[Dict[str, str]],
+        emotional_context: Optional[Dict] = None
+    ) -> Dict:
+        """
+        Build the Gemini generateContent request body.
+        
+        Args:
+            user_message: The user's current message
+            conversation_history: List of previous messages
+            emotional_context: Optional emotional analysis data
             
-            # Generate response
-            response = model.generate_content(
-                full_prompt,
-                generation_config={
-                    'temperature': 0.7,
-                    'top_p': 0.95,
-                    'top_k': 40,
-                    'max_output_tokens': 500,
-                }
+        Returns:
+            JSON-serializable request body
+        """
+        # Build the prompt with system instructions and context
+        parts = [self._system_prefix]
+        
+        # Add emotional context if available
+        if emotional_context:
+            parts.append(self._format_emotional_context(emotional_context))
+            parts.append("\n\n")
+        
+        # Add conversation history (last 6 messages for context)
+        recent_history = conversation_history[-6:]
+        if recent_history:
+            parts.append("Previous conversation:\n")
+            parts.extend(
+                f"{'User' if msg['role'] == 'user' else 'Assistant'}: {msg['content']}\n"
+                for msg in recent_history
             )
+            parts.append("\n")
+        
+        # Add current user message
+        parts.append(f"User: {user_message}\n\nAssistant:")
+        
+        full_prompt = "".join(parts)
+        
+        return {
+            'contents': [{'parts': [{'text': full_prompt}]}],
+            'generationConfig': self._generation_config
+        }
+    
+    def _extract_response_text(self, data: Dict) -> str:
+        """
+        Pull the generated text out of a Gemini generateContent response.
+        
+        Args:
+            data: Decoded JSON response
             
-            return response.text.strip()
+        Returns:
+            Generated text, stripped
             
-        except ImportError:
-            # Gemini not installed, use fallback
-            print("Gemini library not installed. Using fallback responses.")
-            return self._fallback_response(user_message, emotional_context)
-        except Exception as e:
-            # Any other error, use fallback
-            print(f"Error generating Gemini response: {e}")
-            return self._fallback_response(user_message, emotional_context)
+        Raises:
+            ValueError: If the response contains no text (e.g. blocked by safety filters)
+        """
+        candidates = data.get('candidates') or []
+        parts = candidates[0].get('content', {}).get('parts', []) if candidates else []
+        text = ''.join(part.get('text', '') for part in parts).strip()
+        if not text:
+            raise ValueError("Gemini returned no text")
+        return text
     
     def _format_emotional_context(self, emotional_context: Dict) -> str:
         """Format emotional analysis data for the AI."""
@@ -155,87 +370,57 @@ Remember: You're here to support, not to fix. Sometimes people just need to be h
             return "Context from emotional analysis:\n" + "\n".join(context_parts)
         return ""
     
-    def _fallback_response(self, user_message: str, emotional_context: Optional[Dict] = None) -> str:
+    def fallback_response(
+        self,
+        user_message: str,
+        emotional_context: Optional[Dict] = None,
+        classification: Optional[MessageClassification] = None
+    ) -> str:
         """
         Provide a rule-based response when AI is not available.
         This uses pattern matching and templates.
         """
-        message_lower = user_message.lower()
-        
-        # Crisis keywords
-        crisis_keywords = ['suicide', 'kill myself', 'end it all', 'want to die', 'no point living']
-        if any(keyword in message_lower for keyword in crisis_keywords):
-            return """I'm really concerned about what you're sharing. These feelings are serious, and you deserve immediate support.
-
-Please reach out to a crisis helpline right away:
-- National Suicide Prevention Lifeline: 988 (US)
-- Crisis Text Line: Text HOME to 741741
-- International Association for Suicide Prevention: https://www.iasp.info/resources/Crisis_Centres/
-
-You don't have to face this alone. Please talk to someone who can help right now."""
-        
-        # Anxiety keywords
-        anxiety_keywords = ['anxious', 'worried', 'panic', 'nervous', 'scared', 'afraid']
-        if any(keyword in message_lower for keyword in anxiety_keywords):
-            return """I hear that you're feeling anxious, and that can be really overwhelming. Anxiety is your body's way of trying to protect you, even when it feels uncomfortable.
-
-Let's try something together: Can you take a slow, deep breath with me? Breathe in for 4 counts, hold for 4, and out for 4.
-
-What specifically is worrying you right now? Sometimes naming our worries can help us see them more clearly. And remember - you've gotten through anxious moments before, and you can get through this one too."""
-        
-        # Sadness keywords
-        sadness_keywords = ['sad', 'depressed', 'down', 'hopeless', 'empty', 'lonely']
-        if any(keyword in message_lower for keyword in sadness_keywords):
-            return """Thank you for sharing how you're feeling. Sadness can feel so heavy, and it takes courage to acknowledge it.
-
-Your feelings are valid, and it's okay to not be okay sometimes. You don't have to push these feelings away or fix them immediately.
-
-What would feel supportive for you right now? Sometimes it helps to talk about what's weighing on you, and sometimes it helps to just be gentle with yourself. What do you need most in this moment?"""
+        if classification is None:
+            classification = self.classify(user_message.lower())
+        return _FALLBACK_REPLIES.get(classification.fallback_category, _DEFAULT_REPLY)
+    
+    def classify(self, message_lower: str) -> MessageClassification:
+        """
+        Scan a message once for both crisis and fallback keywords.
         
-        # Anger keywords
-        anger_keywords = ['angry', 'furious', 'frustrated', 'mad', 'irritated', 'rage']
-        if any(keyword in message_lower for keyword in anger_keywords):
-            return """I can sense the frustration and anger in what you're sharing. Those are powerful emotions, and they're telling you that something feels wrong or unfair.
-
-Before we dive deeper, let's make sure you're in a space where you can think clearly. Have you had a chance to take a few deep breaths or step away from the situation?
-
-What happened that triggered these feelings? And what do you think you need right now - to be heard, to problem-solve, or something else?"""
+        Results for short messages are cached.
         
-        # Stress keywords
-        stress_keywords = ['stressed', 'overwhelmed', 'too much', 'can\'t handle', 'pressure']
-        if any(keyword in message_lower for keyword in stress_keywords):
-            return """It sounds like you're carrying a lot right now, and feeling overwhelmed is completely understandable when there's so much on your plate.
-
-Let's break this down together. What's the most pressing thing you're dealing with right now? Sometimes when everything feels urgent, it helps to focus on just one thing at a time.
-
-Also, have you been able to take care of your basic needs today - sleep, food, water? When we're stressed, these often get neglected, but they make a big difference in how we cope."""
+        Args:
+            message_lower: Lowercased user message
+            
+        Returns:
+            MessageClassification with the crisis assessment and the fallback
+            reply category (first match in ``fallback_keywords`` order, or None)
+        """
+        if len(message_lower) <= _CLASSIFY_CACHE_MAX_LENGTH:
+            return self._classify_cached(message_lower)
+        return self._classify(message_lower)
+    
+    def _classify(self, message_lower: str) -> MessageClassification:
+        """Uncached implementation of ``classify``."""
+        tags = self._keyword_scanner.scan(message_lower)
         
-        # Relationship keywords
-        relationship_keywords = ['relationship', 'partner', 'friend', 'family', 'conflict', 'argument']
-        if any(keyword in message_lower for keyword in relationship_keywords):
-            return """Relationships can be one of the most meaningful and challenging parts of life. It sounds like you're navigating something difficult.
-
-Can you tell me more about what's happening? What's the situation, and how is it affecting you?
-
-Sometimes it helps to think about: What do you need from this relationship? What are you hoping will change? And what's within your control to address?"""
+        fallback_category = None
+        for category in self.fallback_keywords:
+            if ('fallback', category) in tags:
+                fallback_category = category
+                break
         
-        # Work/school keywords
-        work_keywords = ['work', 'job', 'school', 'exam', 'deadline', 'performance', 'boss', 'teacher']
-        if any(keyword in message_lower for keyword in work_keywords):
-            return """Work and academic pressures can be really intense. It sounds like you're dealing with something challenging in that area.
-
-What specifically is weighing on you? Is it the workload, relationships with others, performance expectations, or something else?
-
-Remember that your worth isn't defined by your productivity or achievements. You're valuable as a person, regardless of how things go at work or school. What support do you need right now?"""
+        # Highest severity wins
+        severity = 'none'
+        for level in ('high', 'medium', 'low'):
+            if ('crisis', level) in tags:
+                severity = level
+                break
         
-        # Default empathetic response
-        return """Thank you for sharing that with me. I'm here to listen and support you.
-
-Can you tell me more about what's on your mind? What's been happening, and how are you feeling about it?
-
-Sometimes it helps to talk through things, and I'm here to help you explore your thoughts and feelings without judgment."""
+        return MessageClassification(_CRISIS_ASSESSMENTS[severity], fallback_category)
     
-    def assess_crisis_level(self, message: str) -> Dict[str, any]:
+    def assess_crisis_level(self, message: str) -> Mapping[str, Any]:
         """
         Assess if the message indicates a mental health crisis.
         
@@ -245,79 +430,8 @@ Sometimes it helps to talk through things, and I'm here to help you explore your
         Returns:
             Dict with crisis_detected (bool) and severity (low/medium/high)
         """
-        message_lower = message.lower()
-        
-        # High severity crisis keywords
-        high_severity = ['suicide', 'kill myself', 'end my life', 'want to die', 'no reason to live']
-        
-        # Medium severity keywords
-        medium_severity = ['self harm', 'hurt myself', 'cutting', 'can\'t go on', 'give up']
-        
-        # Low severity (concerning but not immediate crisis)
-        low_severity = ['hopeless', 'worthless', 'no point', 'better off without me']
-        
-        if any(keyword in message_lower for keyword in high_severity):
-            return {
-                'crisis_detected': True,
-                'severity': 'high',
-                'message': 'Immediate crisis support needed'
-            }
-        elif any(keyword in message_lower for keyword in medium_severity):
-            return {
-                'crisis_detected': True,
-                'severity': 'medium',
-                'message': 'Concerning content detected'
-            }
-        elif any(keyword in message_lower for keyword in low_severity):
-            return {
-                'crisis_detected': True,
-                'severity': 'low',
-                'message': 'Distress detected'
-            }
-        
-        return {
-            'crisis_detected': False,
-            'severity': 'none',
-            'message': 'No crisis indicators'
-        }
+        return self.classify(message.lower()).crisis
     
-    def get_crisis_resources(self) -> Dict[str, List[Dict[str, str]]]:
+    def get_crisis_resources(self) -> Mapping[str, List[Dict[str, str]]]:
         """Get crisis support resources."""
-        return {
-            'immediate': [
-                {
-                    'name': 'National Suicide Prevention Lifeline',
-                    'contact': '988',
-                    'description': '24/7 crisis support in the US'
-                },
-                {
-                    'name': 'Crisis Text Line',
-                    'contact': 'Text HOME to 741741',
-                    'description': '24/7 text-based crisis support'
-                },
-                {
-                    'name': 'Emergency Services',
-                    'contact': '911',
-                    'description': 'For immediate life-threatening emergencies'
-                }
-            ],
-            'international': [
-                {
-                    'name': 'International Association for Suicide Prevention',
-                    'contact': 'https://www.iasp.info/resources/Crisis_Centres/',
-                    'description': 'Crisis centers worldwide'
-                }
-            ],
-            'online': [
-                {
-                    'name': 'BetterHelp',
-                    'contact': 'https://www.betterhelp.com',
-                    'description': 'Online therapy platform'
-                },
-                {
-                    'name': 'Talkspace',
-                    'contact': 'https://www.talkspace.com',
-                    'description': 'Online therapy and psychiatry'
-                }
-            ]
-        }
+        return _CRISIS_RESOURCES
@@ -0,0 +1,141 @@
+"""
+Dynamic Request Batching for InsightSphere AI
+
+This module coalesces concurrent analysis requests into small batches so the
+analyzer processes several texts per worker-thread hop instead of one.
+"""
+
+import asyncio
+import logging
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class DynamicBatcher:
+    """
+    Groups concurrent calls into batches dispatched by a single background task.
+
+    Callers await ``process_batched(item)``; items queued within ``max_delay``
+    seconds of each other (up to ``max_batch_size``) are handed to
+    ``batch_fn`` together in a worker thread, and each caller receives its
+    own result.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List[Any]], Sequence[Any]],
+        max_batch_size: int = 16,
+        max_delay: float = 0.01
+    ):
+        """
+        Initialize the batcher.
+
+        Args:
+            batch_fn: Blocking function mapping a list of items to a list of results
+            max_batch_size: Maximum number of items dispatched together
+            max_delay: Maximum seconds to wait for a batch to fill up
+        """
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        # Batch taken off the queue but not yet answered, failed on stop()
+        self._inflight: List[Tuple[Any, asyncio.Future]] = []
+
+    async def start(self) -> None:
+        """Start the background dispatch task."""
+        if self._worker is not None:
+            return
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run())
+        logger.info(
+            "Dynamic batcher started (max_batch_size=%d, max_delay=%.0fms)",
+            self.max_batch_size, self.max_delay * 1000
+        )
+
+    async def stop(self) -> None:
+        """Stop the background dispatch task and fail any pending callers."""
+        if self._worker is None:
+            return
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+
+        pending = self._inflight
+        self._inflight = []
+        while not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+
+        for _, future in pending:
+            if not future.done():
+                future.set_exception(RuntimeError("Batcher stopped"))
+
+    async def process_batched(self, item: Any) -> Any:
+        """
+        Submit one item and wait for its result.
+
+        Args:
+            item: Input passed to ``batch_fn`` as part of a batch
+
+        Returns:
+            The result produced for this item
+        """
+        if self._worker is None:
+            raise RuntimeError("Batcher not started. Call start() first.")
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, future))
+        return await future
+
+    async def _collect_batch(self) -> List[Tuple[Any, asyncio.Future]]:
+        """Wait for the first item, then gather more until full or timed out."""
+        loop = asyncio.get_running_loop()
+        batch = self._inflight = []
+        batch.append(await self._queue.get())
+        deadline = loop.time() + self.max_delay
+
+        while len(batch) < self.max_batch_size:
+            # Take whatever is already queued without waiting
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    async def _run(self) -> None:
+        """Background loop: collect batches and dispatch them to a worker thread."""
+        while True:
+            batch = await self._collect_batch()
+
+            # Skip callers that gave up (e.g. client disconnected)
+            batch = self._inflight = [(item, future) for item, future in batch if not future.done()]
+            if not batch:
+                continue
+
+            items = [item for item, _ in batch]
+            try:
+                results = await asyncio.to_thread(self.batch_fn, items)
+            except Exception as e:
+                logger.error("Batch of %d failed: %s", len(items), e)
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+            self._inflight = []
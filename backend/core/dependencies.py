@@ -3,12 +3,18 @@ FastAPI Dependencies
 
 Provides reusable dependencies for request handling, including authentication.
 """
-from fastapi import Depends, HTTPException, status, Header
+import httpx
+from fastapi import Depends, HTTPException, status, Header, Request
 from typing import Optional
 import logging
 
 from models.user import UserInDB
 from services.auth_service import auth_service, TokenExpiredError, InvalidTokenError
+from core.models_nlp import TextAnalyzer
+from core.suggestions import SuggestionGenerator
+from core.ai_therapist import AITherapist
+from core.batching import DynamicBatcher
+from core.response_cache import ResponseCache
 
 logger = logging.getLogger(__name__)
 
@@ -33,15 +39,21 @@ def extract_token_from_header(authorization: Optional[str] = Header(None)) -> st
             headers={"WWW-Authenticate": "Bearer"}
         )
     
-    parts = authorization.split()
-    if len(parts) != 2 or parts[0].lower() != "bearer":
+    # Check the "Bearer" scheme and its separator with slices instead of splitting the header
+    token = authorization[7:].strip()
+    if (
+        authorization[:6].lower() != "bearer"
+        or not authorization[6:7].isspace()
+        or not token
+        or any(c.isspace() for c in token)
+    ):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid authorization header format. Expected: Bearer <token>",
             headers={"WWW-Authenticate": "Bearer"}
         )
     
-    return parts[1]
+    return token
 
 
 async def get_current_user(
@@ -80,7 +92,7 @@ async def get_current_user(
         )
     
     except InvalidTokenError as e:
-        logger.warning(f"Authentication failed: {str(e)}")
+        logger.warning("Authentication failed: %s", e)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token",
@@ -88,7 +100,7 @@ async def get_current_user(
         )
     
     except Exception as e:
-        logger.error(f"Authentication error: {str(e)}", exc_info=True)
+        logger.error("Authentication error: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Authentication failed",
@@ -116,3 +128,84 @@ async def get_current_user_id(
             return {"user_id": user_id}
     """
     return current_user.id
+
+
+def get_text_analyzer(request: Request) -> TextAnalyzer:
+    """
+    FastAPI dependency to get the shared text analyzer.
+    
+    The analyzer is built once in the application lifespan and stored on
+    ``app.state``.
+    
+    Args:
+        request: Incoming request
+        
+    Returns:
+        TextAnalyzer: Process-wide text analyzer
+    """
+    return request.app.state.text_analyzer
+
+
+def get_suggestion_generator(request: Request) -> SuggestionGenerator:
+    """
+    FastAPI dependency to get the shared suggestion generator.
+    
+    Args:
+        request: Incoming request
+        
+    Returns:
+        SuggestionGenerator: Process-wide suggestion generator
+    """
+    return request.app.state.suggestion_generator
+
+
+def get_ai_therapist(request: Request) -> AITherapist:
+    """
+    FastAPI dependency to get the shared AI therapist.
+    
+    Args:
+        request: Incoming request
+        
+    Returns:
+        AITherapist: Process-wide AI therapist
+    """
+    return request.app.state.ai_therapist
+
+
+def get_analysis_batcher(request: Request) -> DynamicBatcher:
+    """
+    FastAPI dependency to get the shared text analysis batcher.
+    
+    Args:
+        request: Incoming request
+        
+    Returns:
+        DynamicBatcher: Batcher feeding the process-wide text analyzer
+    """
+    return request.app.state.analysis_batcher
+
+
+def get_response_cache(request: Request) -> ResponseCache:
+    """
+    FastAPI dependency to get the shared response cache.
+    
+    Args:
+        request: Incoming request
+        
+    Returns:
+        ResponseCache: Process-wide cache for analysis and chat responses
+    """
+    return request.app.state.response_cache
+
+
+def get_http_client(request: Request) -> httpx.AsyncClient:
+    """
+    FastAPI dependency to get the shared async HTTP client.
+    
+    Args:
+        request: Incoming request
+        
+    Returns:
+        httpx.AsyncClient: Process-wide client used for Gemini REST calls
+    """
+    return request.app.state.http_client
@@ -0,0 +1,156 @@
+"""
+Keyword Scanner for InsightSphere AI
+
+This module finds which keyword groups occur in a text with a single
+pass over the text, instead of one substring search per keyword. It uses
+an Aho-Corasick automaton when pyahocorasick is installed and a compiled
+trie-shaped regex otherwise.
+"""
+
+import re
+from typing import Dict, FrozenSet, Hashable, Iterable, Iterator, Mapping, Set, Tuple
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+
+def _trie_pattern(keywords: Iterable[str]) -> str:
+    """
+    Build a regex source matching any keyword, factored as a prefix trie.
+
+    Sharing prefixes lets the regex engine reject a position after a
+    single character instead of trying every keyword there, and the greedy
+    optional tails make each match the longest keyword at that position.
+
+    Args:
+        keywords: Literal keywords
+
+    Returns:
+        Regex source string
+    """
+    trie: Dict[str, dict] = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = {}  # End-of-keyword marker
+
+    def build(node: Dict[str, dict]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return f'(?:{body})?' if '' in node else body
+
+    return build(trie)
+
+
+class KeywordScanner:
+    """
+    Single-pass substring matcher for tagged keyword groups.
+
+    A scan returns the same set of tags as checking ``keyword in text`` for
+    every keyword, and ``finditer`` reports every occurrence of every
+    keyword, overlapping ones included. The regex fallback visits every
+    position where some keyword starts and matches the longest keyword
+    there; the keywords that are prefixes of it match at the same position.
+    """
+
+    def __init__(self, groups: Mapping[Hashable, Iterable[str]]):
+        """
+        Compile the scanner.
+
+        Args:
+            groups: Mapping of tag to the keywords that indicate it
+        """
+        keyword_tags: Dict[str, Set[Hashable]] = {}
+        for tag, keywords in groups.items():
+            for keyword in keywords:
+                keyword_tags.setdefault(keyword, set()).add(tag)
+
+        self._keyword_tags: Dict[str, FrozenSet[Hashable]] = {
+            keyword: frozenset(tags) for keyword, tags in keyword_tags.items()
+        }
+        self._automaton = None
+        self._pattern = None
+
+        if ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for keyword, tags in self._keyword_tags.items():
+                self._automaton.add_word(keyword, (keyword, tags))
+            self._automaton.make_automaton()
+        else:
+            # A keyword matching at a position implies all its prefixes match there
+            self._prefixes: Dict[str, Tuple[str, ...]] = {
+                keyword: tuple(other for other in keyword_tags if keyword.startswith(other))
+                for keyword in keyword_tags
+            }
+            self._tags: Dict[str, FrozenSet[Hashable]] = {
+                keyword: frozenset().union(*(self._keyword_tags[other] for other in prefixes))
+                for keyword, prefixes in self._prefixes.items()
+            }
+            self._pattern = re.compile(_trie_pattern(keyword_tags))
+
+    def tags(self, keyword: str) -> FrozenSet[Hashable]:
+        """
+        Get the tags of a keyword.
+
+        Args:
+            keyword: Keyword passed in ``groups``
+
+        Returns:
+            Tags the keyword was registered under
+        """
+        return self._keyword_tags[keyword]
+
+    def scan(self, text: str) -> Set[Hashable]:
+        """
+        Find the tags whose keywords occur in the text.
+
+        Args:
+            text: Text to scan (already lowercased if keywords are lowercase)
+
+        Returns:
+            Set of tags with at least one keyword present
+        """
+        found: Set[Hashable] = set()
+
+        if self._automaton is not None:
+            for _, (_, tags) in self._automaton.iter(text):
+                found |= tags
+            return found
+
+        search = self._pattern.search
+        match = search(text)
+        while match:
+            found |= self._tags[match.group()]
+            # Resume one character later so overlapping keywords are found too
+            match = search(text, match.start() + 1)
+        return found
+
+    def finditer(self, text: str) -> Iterator[Tuple[int, str]]:
+        """
+        Find every keyword occurrence in the text.
+
+        Occurrences of the same keyword are yielded in increasing position.
+
+        Args:
+            text: Text to scan
+
+        Yields:
+            (start index, keyword) for each occurrence, overlapping ones included
+        """
+        if self._automaton is not None:
+            for end, (keyword, _) in self._automaton.iter(text):
+                yield end - len(keyword) + 1, keyword
+            return
+
+        search = self._pattern.search
+        match = search(text)
+        while match:
+            start = match.start()
+            for keyword in self._prefixes[match.group()]:
+                yield start, keyword
+            match = search(text, start + 1)
@@ -5,9 +5,116 @@ This module provides lightweight, rule-based natural language processing
 for emotion detection, stress assessment, and cognitive distortion identification.
 """
 
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, Final, FrozenSet, Mapping, Set, Tuple
+from types import MappingProxyType
+import math
 import re
-from datetime import datetime
+import threading
+from bisect import bisect_right
+
+from core.keyword_scanner import KeywordScanner
+from utils.cache import TTLCache
+from utils.timestamps import utc_now_iso
+
+
+def _is_word_char(char: str) -> bool:
+    """Check whether a character matches the regex class \\w."""
+    return char.isalnum() or char == '_'
+
+
+# Emotion keyword dictionaries
+_EMOTION_KEYWORDS: Final[Mapping[str, Tuple[str, ...]]] = MappingProxyType({
+    'joy': (
+        'happy', 'excited', 'grateful', 'wonderful', 'amazing', 'love', 'joyful',
+        'delighted', 'pleased', 'cheerful', 'content', 'satisfied', 'glad',
+        'thrilled', 'ecstatic', 'blessed', 'fortunate', 'optimistic', 'hopeful'
+    ),
+    'sadness': (
+        'sad', 'depressed', 'hopeless', 'lonely', 'empty', 'crying', 'tears',
+        'miserable', 'unhappy', 'down', 'blue', 'gloomy', 'dejected', 'despair',
+        'heartbroken', 'grief', 'sorrow', 'melancholy', 'disappointed'
+    ),
+    'anxiety': (
+        'anxious', 'worried', 'nervous', 'scared', 'panic', 'fear', 'stress',
+        'stressed', 'overwhelmed', 'tense', 'uneasy', 'apprehensive', 'concerned',
+        'frightened', 'terrified', 'dread', 'restless', 'on edge'
+    ),
+    'anger': (
+        'angry', 'furious', 'irritated', 'frustrated', 'mad', 'rage', 'annoyed',
+        'upset', 'outraged', 'hostile', 'resentful', 'bitter', 'aggravated',
+        'infuriated', 'livid', 'enraged', 'irate'
+    ),
+    'calm': (
+        'calm', 'peaceful', 'relaxed', 'serene', 'content', 'balanced', 'tranquil',
+        'composed', 'centered', 'stable', 'grounded', 'at ease', 'comfortable'
+    )
+})
+
+# Intensity markers that amplify emotions
+_INTENSITY_MARKERS: Final[Tuple[str, ...]] = (
+    'very', 'extremely', 'so', 'really', 'incredibly', 'absolutely',
+    'completely', 'totally', 'utterly', 'deeply', 'intensely'
+)
+
+# Absolute words that indicate stress
+_ABSOLUTE_WORDS: Final[Tuple[str, ...]] = (
+    'always', 'never', 'everyone', 'no one', 'everything', 'nothing',
+    'all the time', 'every time', 'constantly', 'forever'
+)
+
+# Cognitive distortion patterns
+_DISTORTION_PATTERNS: Final[Mapping[str, Tuple[str, ...]]] = MappingProxyType({
+    'overgeneralization': (
+        'always', 'never', 'everyone', 'no one', 'every time', 'all the time',
+        'constantly', 'nobody', 'everybody', 'everything', 'nothing'
+    ),
+    'catastrophizing': (
+        'worst', 'terrible', 'disaster', 'ruined', 'nothing will', 'everything is',
+        'catastrophe', 'horrible', 'awful', 'doomed', 'hopeless', 'end of the world'
+    ),
+    'black-and-white thinking': (
+        'perfect', 'completely', 'total failure', 'absolutely', 'either', 'or',
+        'all or nothing', 'entirely', 'wholly', 'utterly'
+    ),
+    'self-blame': (
+        'my fault', "i'm responsible", 'i should have', "i'm to blame",
+        'i caused', 'because of me', "it's all on me"
+    ),
+    'mind reading': (
+        'they think', 'everyone knows', 'people must think', 'they probably',
+        'i know what', 'they believe'
+    ),
+    'fortune telling': (
+        'will never', 'going to fail', "won't work", 'destined to',
+        'bound to', 'inevitable', 'certain to fail'
+    )
+})
+
+# Stress level labels, indexed by the number of thresholds (34, 67) reached
+_STRESS_LEVELS: Final[Tuple[str, ...]] = ("low stress", "moderate stress", "high stress")
+
+# Empathetic summary templates by primary emotion
+_SUMMARY_TEMPLATES: Final[Mapping[str, str]] = MappingProxyType({
+    'joy': "You're expressing feelings of {emotion} with {stress_level}. It's wonderful to see positive emotions coming through.",
+    'sadness': "You're experiencing {emotion} with {stress_level}. These feelings are valid, and it's okay to feel this way.",
+    'anxiety': "You're feeling {emotion} with {stress_level}. Remember that these feelings are temporary and manageable.",
+    'anger': "You're expressing {emotion} with {stress_level}. It's important to acknowledge these feelings.",
+    'calm': "You're in a state of {emotion} with {stress_level}. This balanced state is valuable."
+})
+_DEFAULT_SUMMARY_TEMPLATE: Final[str] = "You're experiencing {emotion} with {stress_level}."
+
+# Every (emotion, stress level index) summary, formatted once
+_SUMMARIES: Final[Mapping[Tuple[str, int], str]] = MappingProxyType({
+    (emotion, level): template.format(emotion=emotion, stress_level=stress_level)
+    for emotion, template in _SUMMARY_TEMPLATES.items()
+    for level, stress_level in enumerate(_STRESS_LEVELS)
+})
+
+# Separates texts joined for a batch scan; no keyword contains it
+_BATCH_SEPARATOR: Final[str] = '\x00'
+
+# Words that negate a following emotion keyword
+_NEGATION_WORDS: Final[FrozenSet[str]] = frozenset({'not', "n't", 'no', 'never'})
 
 
 class TextAnalyzer:
@@ -15,73 +122,58 @@ class TextAnalyzer:
     
     def __init__(self):
         """Initialize the TextAnalyzer with keyword dictionaries."""
-        # Emotion keyword dictionaries
-        self.emotion_keywords = {
-            'joy': [
-                'happy', 'excited', 'grateful', 'wonderful', 'amazing', 'love', 'joyful',
-                'delighted', 'pleased', 'cheerful', 'content', 'satisfied', 'glad',
-                'thrilled', 'ecstatic', 'blessed', 'fortunate', 'optimistic', 'hopeful'
-            ],
-            'sadness': [
-                'sad', 'depressed', 'hopeless', 'lonely', 'empty', 'crying', 'tears',
-                'miserable', 'unhappy', 'down', 'blue', 'gloomy', 'dejected', 'despair',
-                'heartbroken', 'grief', 'sorrow', 'melancholy', 'disappointed'
-            ],
-            'anxiety': [
-                'anxious', 'worried', 'nervous', 'scared', 'panic', 'fear', 'stress',
-                'stressed', 'overwhelmed', 'tense', 'uneasy', 'apprehensive', 'concerned',
-                'frightened', 'terrified', 'dread', 'restless', 'on edge'
-            ],
-            'anger': [
-                'angry', 'furious', 'irritated', 'frustrated', 'mad', 'rage', 'annoyed',
-                'upset', 'outraged', 'hostile', 'resentful', 'bitter', 'aggravated',
-                'infuriated', 'livid', 'enraged', 'irate'
-            ],
-            'calm': [
-                'calm', 'peaceful', 'relaxed', 'serene', 'content', 'balanced', 'tranquil',
-                'composed', 'centered', 'stable', 'grounded', 'at ease', 'comfortable'
-            ]
+        # Keyword dictionaries (read-only, shared by all instances)
+        self.emotion_keywords = _EMOTION_KEYWORDS
+        self.intensity_markers = _INTENSITY_MARKERS
+        self.absolute_words = _ABSOLUTE_WORDS
+        self.distortion_patterns = _DISTORTION_PATTERNS
+        
+        # One scanner over every keyword list, so a text is scanned in a single pass
+        self._scanner = KeywordScanner({
+            **{('emotion', emotion): keywords for emotion, keywords in self.emotion_keywords.items()},
+            'intensity': self.intensity_markers,
+            'absolute': self.absolute_words,
+            **{('distortion', distortion): patterns for distortion, patterns in self.distortion_patterns.items()}
+        })
+        
+        # Emotions of each keyword with the keyword's position in their lists,
+        # for matching against scan hits
+        emotion_index: Dict[str, List[Tuple[str, int]]] = {}
+        for emotion, keywords in self.emotion_keywords.items():
+            for order, keyword in enumerate(keywords):
+                emotion_index.setdefault(keyword, []).append((emotion, order))
+        self._emotion_index: Dict[str, Tuple[Tuple[str, int], ...]] = {
+            keyword: tuple(placements) for keyword, placements in emotion_index.items()
         }
         
-        # Intensity markers that amplify emotions
-        self.intensity_markers = [
-            'very', 'extremely', 'so', 'really', 'incredibly', 'absolutely',
-            'completely', 'totally', 'utterly', 'deeply', 'intensely'
-        ]
+        # Distortion types indicated by each pattern, for matching against scan hits
+        distortion_index: Dict[str, List[str]] = {}
+        for distortion_type, patterns in self.distortion_patterns.items():
+            for pattern in patterns:
+                distortion_index.setdefault(pattern, []).append(distortion_type)
+        self._distortion_index: Dict[str, Tuple[str, ...]] = {
+            pattern: tuple(types) for pattern, types in distortion_index.items()
+        }
         
-        # Absolute words that indicate stress
-        self.absolute_words = [
-            'always', 'never', 'everyone', 'no one', 'everything', 'nothing',
-            'all the time', 'every time', 'constantly', 'forever'
-        ]
+        # Hashed lookups for negation and stress word counts
+        self._negation_set = _NEGATION_WORDS
+        self._intensity_set = frozenset(self.intensity_markers)
+        self._absolute_set = frozenset(self.absolute_words)
         
-        # Cognitive distortion patterns
-        self.distortion_patterns = {
-            'overgeneralization': [
-                'always', 'never', 'everyone', 'no one', 'every time', 'all the time',
-                'constantly', 'nobody', 'everybody', 'everything', 'nothing'
-            ],
-            'catastrophizing': [
-                'worst', 'terrible', 'disaster', 'ruined', 'nothing will', 'everything is',
-                'catastrophe', 'horrible', 'awful', 'doomed', 'hopeless', 'end of the world'
-            ],
-            'black-and-white thinking': [
-                'perfect', 'completely', 'total failure', 'absolutely', 'either', 'or',
-                'all or nothing', 'entirely', 'wholly', 'utterly'
-            ],
-            'self-blame': [
-                'my fault', "i'm responsible", 'i should have', "i'm to blame",
-                'i caused', 'because of me', "it's all on me"
-            ],
-            'mind reading': [
-                'they think', 'everyone knows', 'people must think', 'they probably',
-                'i know what', 'they believe'
-            ],
-            'fortune telling': [
-                'will never', 'going to fail', "won't work", 'destined to',
-                'bound to', 'inevitable', 'certain to fail'
-            ]
-        }
+        # Precompiled word tokenizer; maximal \w runs are exactly the \b\w+\b words
+        self._tok_re = re.compile(r'\b\w+\b')
+        self._word_re = re.compile(r'\w+')
+        
+        # Analysis is deterministic given the cleaned text, so repeated
+        # inputs reuse the scored result. Analyses run in worker threads,
+        # hence the lock.
+        self._analysis_cache = TTLCache(maxsize=4096, ttl=math.inf)
+        self._analysis_cache_lock = threading.Lock()
+    
+    def reset(self) -> None:
+        """Clear cached analysis results (e.g. between tests)."""
+        with self._analysis_cache_lock:
+            self._analysis_cache.clear()
     
     def _clean_text(self, text: str) -> str:
         """
@@ -112,83 +204,234 @@ class TextAnalyzer:
             List of words
         """
         # Simple word tokenization
-        words = re.findall(r'\b\w+\b', text)
+        words = self._tok_re.findall(text)
         return words
     
-    def _detect_negation(self, text: str, keyword: str) -> bool:
+    def _word_count(self, text: str) -> int:
         """
-        Check if a keyword is negated in the text.
+        Count the words ``_tokenize`` would return, without building the list.
         
         Args:
-            text: Text to check
-            keyword: Keyword to look for
+            text: Cleaned text (single spaces, no leading or trailing space)
             
         Returns:
-            True if keyword is negated, False otherwise
+            Number of words
+        """
+        # Only word characters between single spaces: every space separates two words
+        if text.replace(' ', '').replace('_', '').isalnum():
+            return text.count(' ') + 1
+        return len(self._word_re.findall(text))
+    
+    def _scan(self, text: str) -> Dict[str, List[int]]:
         """
-        negation_words = ['not', "n't", 'no', 'never']
+        Find every keyword, marker and pattern occurrence in one pass.
         
-        # Find keyword position
-        pattern = r'\b' + re.escape(keyword) + r'\b'
-        match = re.search(pattern, text)
+        Args:
+            text: Cleaned text
+            
+        Returns:
+            Dictionary mapping each keyword found (as a substring) to its start positions
+        """
+        hits: Dict[str, List[int]] = {}
+        for start, keyword in self._scanner.finditer(text):
+            hits.setdefault(keyword, []).append(start)
+        return hits
+    
+    def _scan_many(self, texts: List[str]) -> List[Dict[str, List[int]]]:
+        """
+        Scan several cleaned texts with one pass over their concatenation.
         
-        if not match:
-            return False
+        Args:
+            texts: Cleaned texts
+            
+        Returns:
+            Keyword positions for each text (as from ``_scan``), relative to that text
+        """
+        hits_per_text: List[Dict[str, List[int]]] = [{} for _ in texts]
+        
+        # Start offset of each text in the joined string
+        offsets = []
+        position = 0
+        for text in texts:
+            offsets.append(position)
+            position += len(text) + len(_BATCH_SEPARATOR)
+        
+        # No keyword contains the separator, so no hit spans two texts
+        for start, keyword in self._scanner.finditer(_BATCH_SEPARATOR.join(texts)):
+            index = bisect_right(offsets, start) - 1
+            hits_per_text[index].setdefault(keyword, []).append(start - offsets[index])
+        
+        return hits_per_text
+    
+    def _intensity_marker_ends(self, text: str, start: int) -> List[int]:
+        """
+        Find where an intensity marker must end to modify a keyword at ``start``.
+        
+        Mirrors the regex ``marker\\s+\\w*\\s*keyword``: the marker is followed
+        by whitespace, then at most one word (which may be glued to the
+        keyword), then optional whitespace.
+        
+        Args:
+            text: Cleaned text
+            start: Start position of the keyword occurrence
+            
+        Returns:
+            Candidate end positions for the marker
+        """
+        ends = []
+        
+        # Trailing whitespace before the keyword
+        space_start = start
+        while space_start > 0 and text[space_start - 1].isspace():
+            space_start -= 1
+        if space_start < start:
+            # No word in between: the marker ends right before the whitespace
+            ends.append(space_start)
+        
+        # One word in between, preceded by whitespace
+        word_start = space_start
+        while word_start > 0 and _is_word_char(text[word_start - 1]):
+            word_start -= 1
+        if word_start < space_start:
+            marker_end = word_start
+            while marker_end > 0 and text[marker_end - 1].isspace():
+                marker_end -= 1
+            if marker_end < word_start:
+                ends.append(marker_end)
+        
+        return ends
+    
+    def _detect_negation(self, text: str, position: int) -> bool:
+        """
+        Check if a keyword occurrence is negated in the text.
         
+        Args:
+            text: Text to check
+            position: Start position of the keyword occurrence
+            
+        Returns:
+            True if keyword is negated, False otherwise
+        """
         # Check 3 words before keyword for negation
-        start = max(0, match.start() - 20)
-        context = text[start:match.start()]
+        start = max(0, position - 20)
+        context_words = set(text[start:position].split())
         
-        for neg in negation_words:
-            if neg in context.split():
-                return True
+        return bool(context_words & self._negation_set)
+    
+    def _keyword_increments(
+        self,
+        text: str,
+        keyword: str,
+        starts: List[int],
+        intensity_ends: List[Set[int]]
+    ) -> Tuple[float, ...]:
+        """
+        Compute the score increments an emotion keyword contributes.
         
-        return False
+        Args:
+            text: Cleaned text
+            keyword: Emotion keyword found in the text
+            starts: Start positions of the keyword (as a substring)
+            intensity_ends: End positions of each intensity marker found
+            
+        Returns:
+            Increments to add to the emotion score, in order (empty when the
+            keyword never occurs as a whole word)
+        """
+        # Count whole-word occurrences without overlap (like re.findall
+        # with \b on both sides); intensity markers only need the
+        # keyword to end on a word boundary
+        text_length = len(text)
+        keyword_length = len(keyword)
+        count = 0
+        first_start = None
+        next_free = 0
+        end_bounded_starts = []
+        for start in starts:
+            end = start + keyword_length
+            if end < text_length and _is_word_char(text[end]):
+                continue
+            end_bounded_starts.append(start)
+            if start >= next_free and (start == 0 or not _is_word_char(text[start - 1])):
+                count += 1
+                next_free = end
+                if first_start is None:
+                    first_start = start
+        
+        if count == 0:
+            return ()
+        
+        # Check for negation before the first occurrence
+        if self._detect_negation(text, first_start):
+            # Reduce score for negated keywords
+            increments = [count * 0.3]
+        else:
+            increments = [count]
+        
+        # Check for intensity markers near keyword
+        if intensity_ends:
+            candidate_ends = {
+                marker_end
+                for start in end_bounded_starts
+                for marker_end in self._intensity_marker_ends(text, start)
+            }
+            for ends in intensity_ends:
+                if not ends.isdisjoint(candidate_ends):
+                    increments.append(0.5)  # Bonus for intensity
+        
+        return tuple(increments)
     
-    def _calculate_emotions(self, text: str) -> Dict[str, float]:
+    def _calculate_emotions(self, text: str, word_count: int, hits: Dict[str, List[int]]) -> Dict[str, float]:
         """
         Calculate emotion scores using keyword matching.
         
         Args:
             text: Cleaned text
+            word_count: Number of words from ``_word_count``
+            hits: Keyword positions from ``_scan``
             
         Returns:
             Dictionary of emotion scores (0.0-1.0)
         """
-        words = self._tokenize(text)
-        word_count = len(words)
-        
         if word_count == 0:
             return {emotion: 0.0 for emotion in self.emotion_keywords.keys()}
         
+        # End positions of each intensity marker found starting on a word boundary
+        intensity_ends = []
+        for marker in self._intensity_set.intersection(hits):
+            marker_length = len(marker)
+            ends = {
+                start + marker_length
+                for start in hits[marker]
+                if start == 0 or not _is_word_char(text[start - 1])
+            }
+            if ends:
+                intensity_ends.append(ends)
+        
+        # Increments of each found keyword, tagged with its position in each
+        # emotion's keyword list
+        found: Dict[str, List[Tuple[int, Tuple[float, ...]]]] = {emotion: [] for emotion in self.emotion_keywords}
+        for keyword, starts in hits.items():
+            placements = self._emotion_index.get(keyword)
+            if placements is None:
+                continue
+            increments = self._keyword_increments(text, keyword, starts, intensity_ends)
+            if increments:
+                for emotion, order in placements:
+                    found[emotion].append((order, increments))
+        
+        normalizer = max(1, word_count / 10)
         emotion_scores = {}
         
-        for emotion, keywords in self.emotion_keywords.items():
+        for emotion, keyword_increments in found.items():
+            # Add in keyword list order so float sums match a per-keyword walk
             score = 0.0
+            for _, increments in sorted(keyword_increments):
+                for increment in increments:
+                    score += increment
             
-            for keyword in keywords:
-                # Count occurrences
-                pattern = r'\b' + re.escape(keyword) + r'\b'
-                matches = re.findall(pattern, text)
-                count = len(matches)
-                
-                if count > 0:
-                    # Check for negation
-                    if self._detect_negation(text, keyword):
-                        # Reduce score for negated keywords
-                        score += count * 0.3
-                    else:
-                        score += count
-                    
-                    # Check for intensity markers near keyword
-                    for marker in self.intensity_markers:
-                        marker_pattern = r'\b' + re.escape(marker) + r'\s+\w*\s*' + re.escape(keyword) + r'\b'
-                        if re.search(marker_pattern, text):
-                            score += 0.5  # Bonus for intensity
-            
-            # Normalize by word count and cap at 1.0
-            normalized_score = min(1.0, score / max(1, word_count / 10))
-            emotion_scores[emotion] = round(normalized_score, 2)
+            # Normalize by word count and cap at 1.0; most emotions score zero
+            emotion_scores[emotion] = round(min(1.0, score / normalizer), 2) if score else 0.0
         
         return emotion_scores
     
@@ -202,75 +445,71 @@ class TextAnalyzer:
         Returns:
             Name of primary emotion
         """
-        if not emotions or all(score == 0 for score in emotions.values()):
-            return 'calm'
-        
-        # Find max score
-        max_score = max(emotions.values())
+        # 'calm' when every score is zero (scores are never negative)
+        best, best_score = 'calm', 0.0
         
-        # Get all emotions with max score
-        top_emotions = [emotion for emotion, score in emotions.items() if score == max_score]
+        for emotion, score in emotions.items():
+            # Highest score wins; ties go to the alphabetically first emotion
+            if score > best_score or (score == best_score and score > 0 and emotion < best):
+                best, best_score = emotion, score
         
-        # If tie, use alphabetical order
-        return sorted(top_emotions)[0]
+        return best
     
-    def _calculate_stress_score(self, text: str, emotions: Dict[str, float]) -> float:
+    def _calculate_stress_score(
+        self,
+        text: str,
+        word_count: int,
+        hits: Dict[str, List[int]],
+        emotions: Dict[str, float]
+    ) -> float:
         """
         Calculate stress score (0-100).
         
         Args:
             text: Cleaned text
+            word_count: Number of words from ``_word_count``
+            hits: Keyword positions from ``_scan``
             emotions: Emotion scores
             
         Returns:
             Stress score between 0 and 100
         """
-        words = self._tokenize(text)
-        word_count = len(words)
-        
         if word_count == 0:
             return 0.0
         
-        # Base stress from negative emotions
-        negative_emotions = emotions.get('sadness', 0) + emotions.get('anxiety', 0) + emotions.get('anger', 0)
-        base_stress = negative_emotions / 3 * 60  # Scale to 0-60
-        
-        # Intensity factor
-        intensity_count = sum(1 for marker in self.intensity_markers if marker in text)
-        intensity_factor = min(30, (intensity_count / word_count) * 100 * 30)
-        
-        # Absolute words factor
-        absolute_count = sum(1 for word in self.absolute_words if word in text)
-        absolute_factor = min(10, absolute_count * 2)
+        intensity_count = len(self._intensity_set.intersection(hits))
+        absolute_count = len(self._absolute_set.intersection(hits))
         
-        # Length factor (longer stressed text = higher stress)
-        length_factor = min(10, len(text) / 100)
-        
-        # Calculate total stress
-        stress_score = base_stress + intensity_factor + absolute_factor + length_factor
+        # Negative emotions (0-60) + intensity marker density (0-30)
+        # + absolute words (0-10) + length (0-10, longer stressed text = higher stress).
+        # Operations keep their original order so rounding is unchanged.
+        stress_score = (
+            (emotions.get('sadness', 0) + emotions.get('anxiety', 0) + emotions.get('anger', 0)) / 3 * 60
+            + min(30, (intensity_count / word_count) * 100 * 30)
+            + min(10, absolute_count * 2)
+            + min(10, len(text) / 100)
+        )
         
         # Cap at 100
         return round(min(100.0, stress_score), 1)
     
-    def _detect_cognitive_distortions(self, text: str) -> List[str]:
+    def _detect_cognitive_distortions(self, hits: Dict[str, List[int]]) -> List[str]:
         """
         Identify cognitive distortion patterns.
         
         Args:
-            text: Cleaned text
+            hits: Keyword positions from ``_scan``
             
         Returns:
             List of detected distortion types (unique)
         """
         detected = set()
+        distortion_index = self._distortion_index
         
-        for distortion_type, patterns in self.distortion_patterns.items():
-            for pattern in patterns:
-                if pattern in text:
-                    detected.add(distortion_type)
-                    break  # Found one pattern for this type, move to next type
+        for keyword in hits:
+            detected.update(distortion_index.get(keyword, ()))
         
-        return sorted(list(detected))  # Return sorted for consistency
+        return sorted(detected)  # Return sorted for consistency
     
     def _generate_summary(self, text: str, primary_emotion: str, stress_score: float) -> str:
         """
@@ -284,61 +523,164 @@ class TextAnalyzer:
         Returns:
             1-2 sentence summary
         """
-        # Determine stress level
-        if stress_score < 34:
-            stress_level = "low stress"
-        elif stress_score < 67:
-            stress_level = "moderate stress"
-        else:
-            stress_level = "high stress"
-        
-        # Create empathetic summary based on primary emotion
-        summaries = {
-            'joy': f"You're expressing feelings of {primary_emotion} with {stress_level}. It's wonderful to see positive emotions coming through.",
-            'sadness': f"You're experiencing {primary_emotion} with {stress_level}. These feelings are valid, and it's okay to feel this way.",
-            'anxiety': f"You're feeling {primary_emotion} with {stress_level}. Remember that these feelings are temporary and manageable.",
-            'anger': f"You're expressing {primary_emotion} with {stress_level}. It's important to acknowledge these feelings.",
-            'calm': f"You're in a state of {primary_emotion} with {stress_level}. This balanced state is valuable."
-        }
+        # Determine stress level: low (< 34), moderate (< 67) or high
+        level = (stress_score >= 34) + (stress_score >= 67)
         
-        return summaries.get(primary_emotion, f"You're experiencing {primary_emotion} with {stress_level}.")
+        summary = _SUMMARIES.get((primary_emotion, level))
+        if summary is None:
+            summary = _DEFAULT_SUMMARY_TEMPLATE.format(emotion=primary_emotion, stress_level=_STRESS_LEVELS[level])
+        return summary
     
-    def analyze_text(self, text: str) -> Dict[str, Any]:
+    def _score(
+        self,
+        cleaned_text: str,
+        word_count: int,
+        hits: Dict[str, List[int]]
+    ) -> Tuple[Tuple[Tuple[str, float], ...], str, float, Tuple[str, ...]]:
         """
-        Main analysis orchestrator.
+        Score a cleaned text.
+        
+        Results are immutable so they can be shared through the cache.
         
         Args:
-            text: Raw input text from user
+            cleaned_text: Text from ``_clean_text``
+            word_count: Number of words from ``_word_count``
+            hits: Keyword positions from ``_scan``
             
         Returns:
-            Complete analysis results dictionary
+            Tuple of (emotion score items, primary emotion, stress score,
+            cognitive distortions)
         """
-        # Clean text
-        cleaned_text = self._clean_text(text)
-        
         # Calculate emotions
-        emotions = self._calculate_emotions(cleaned_text)
+        emotions = self._calculate_emotions(cleaned_text, word_count, hits)
         
         # Get primary emotion
         primary_emotion = self._get_primary_emotion(emotions)
         
         # Calculate stress score
-        stress_score = self._calculate_stress_score(cleaned_text, emotions)
+        stress_score = self._calculate_stress_score(cleaned_text, word_count, hits, emotions)
         
         # Detect cognitive distortions
-        cognitive_distortions = self._detect_cognitive_distortions(cleaned_text)
+        cognitive_distortions = self._detect_cognitive_distortions(hits)
+        
+        return tuple(emotions.items()), primary_emotion, stress_score, tuple(cognitive_distortions)
+    
+    def _analyze_cleaned(
+        self,
+        cleaned_text: str
+    ) -> Tuple[Tuple[Tuple[str, float], ...], str, float, Tuple[str, ...]]:
+        """
+        Score a cleaned text, reusing a cached result when available.
+        
+        Args:
+            cleaned_text: Text from ``_clean_text``
+            
+        Returns:
+            Scored result as returned by ``_score``
+        """
+        with self._analysis_cache_lock:
+            scored = self._analysis_cache.get(cleaned_text)
+        
+        if scored is None:
+            # Count words and scan once for all stages; a text without words
+            # has nothing to scan
+            word_count = self._word_count(cleaned_text)
+            hits = self._scan(cleaned_text) if word_count else {}
+            scored = self._score(cleaned_text, word_count, hits)
+            
+            with self._analysis_cache_lock:
+                self._analysis_cache.set(cleaned_text, scored)
+        
+        return scored
+    
+    def _build_result(
+        self,
+        text: str,
+        scored: Tuple[Tuple[Tuple[str, float], ...], str, float, Tuple[str, ...]]
+    ) -> Dict[str, Any]:
+        """
+        Build the analysis results dictionary for a scored text.
+        
+        Args:
+            text: Raw input text from user
+            scored: Scored result from ``_score``
+            
+        Returns:
+            Complete analysis results dictionary
+        """
+        emotion_items, primary_emotion, stress_score, cognitive_distortions = scored
         
         # Generate summary
         summary = self._generate_summary(text, primary_emotion, stress_score)
         
         # Generate timestamp
-        timestamp = datetime.utcnow().isoformat() + 'Z'
+        timestamp = utc_now_iso()
         
         return {
-            'emotions': emotions,
+            'emotions': dict(emotion_items),
             'primary_emotion': primary_emotion,
             'stress_score': stress_score,
-            'cognitive_distortions': cognitive_distortions,
+            'cognitive_distortions': list(cognitive_distortions),
             'summary': summary,
             'timestamp': timestamp
         }
+    
+    def analyze_text(self, text: str) -> Dict[str, Any]:
+        """
+        Main analysis orchestrator.
+        
+        Args:
+            text: Raw input text from user
+            
+        Returns:
+            Complete analysis results dictionary
+        """
+        # Clean text
+        cleaned_text = self._clean_text(text)
+        
+        # Score the text (cached by cleaned text)
+        scored = self._analyze_cleaned(cleaned_text)
+        
+        return self._build_result(text, scored)
+    
+    def analyze_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """
+        Analyze several texts in one call.
+        
+        Texts without a cached result are scanned together in a single
+        pass over their concatenation.
+        
+        Args:
+            texts: Raw input texts
+            
+        Returns:
+            List of analysis results, in the same order as ``texts``
+        """
+        cleaned_texts = [self._clean_text(text) for text in texts]
+        
+        scored_by_text = {}
+        with self._analysis_cache_lock:
+            for cleaned_text in cleaned_texts:
+                scored = self._analysis_cache.get(cleaned_text)
+                if scored is not None:
+                    scored_by_text[cleaned_text] = scored
+        
+        # Score each distinct uncached text, scanning them all at once
+        pending = [text for text in dict.fromkeys(cleaned_texts) if text not in scored_by_text]
+        if pending:
+            for cleaned_text, hits in zip(pending, self._scan_many(pending)):
+                word_count = self._word_count(cleaned_text)
+                scored_by_text[cleaned_text] = self._score(cleaned_text, word_count, hits)
+            
+            with self._analysis_cache_lock:
+                for cleaned_text in pending:
+                    self._analysis_cache.set(cleaned_text, scored_by_text[cleaned_text])
+        
+        return [
+            self._build_result(text, scored_by_text[cleaned_text])
+            for text, cleaned_text in zip(texts, cleaned_texts)
+        ]
+
+
+# Global text analyzer instance
+text_analyzer = TextAnalyzer()
@@ -0,0 +1,93 @@
+"""
+Response Cache for InsightSphere AI
+
+This module caches /analyze_text and /chat responses so repeated or
+trivially reworded inputs (case, spacing, trailing punctuation) skip the
+analysis pipeline and the Gemini call.
+"""
+
+import json
+import re
+from typing import Any, Dict, Hashable, List, Optional
+
+from utils.cache import TTLCache
+
+
+class ResponseCache:
+    """Caches analysis and chat responses keyed by normalized input."""
+
+    # Characters ignored at the end of an input when building the key
+    _TRAILING_PUNCTUATION = re.compile(r'[\s.!?,;:]+$')
+
+    # Number of recent history messages that take part in the chat key
+    CHAT_HISTORY_WINDOW = 3
+
+    def __init__(self, maxsize: int = 2048, ttl: float = 600):
+        """
+        Initialize the response cache.
+
+        Args:
+            maxsize: Maximum number of cached responses
+            ttl: Seconds a cached response stays valid
+        """
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def normalize(self, text: str) -> str:
+        """
+        Normalize text so near-identical inputs share a cache key.
+
+        Args:
+            text: Raw input text
+
+        Returns:
+            Lowercased text with collapsed whitespace and no trailing punctuation
+        """
+        text = ' '.join(text.lower().split())
+        return self._TRAILING_PUNCTUATION.sub('', text)
+
+    def analysis_key(self, text: str) -> Hashable:
+        """Build the cache key for a text analysis request."""
+        return ('analysis', self.normalize(text))
+
+    def chat_key(
+        self,
+        message: str,
+        conversation_history: List[Dict[str, str]],
+        emotional_context: Optional[Dict] = None
+    ) -> Hashable:
+        """
+        Build the cache key for a chat request.
+
+        The most recent history messages and the emotional context are part
+        of the key so the same message in a different conversation state
+        does not reuse an unrelated reply.
+        """
+        recent = tuple(
+            (msg.get('role'), msg.get('content'))
+            for msg in conversation_history[-self.CHAT_HISTORY_WINDOW:]
+        )
+        context = json.dumps(emotional_context, sort_keys=True, default=str) if emotional_context else None
+        return ('chat', self.normalize(message), recent, context)
+
+    def get(self, key: Hashable) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached response.
+
+        Args:
+            key: Key from ``analysis_key`` or ``chat_key``
+
+        Returns:
+            A copy of the cached response payload, or None on miss
+        """
+        payload = self._cache.get(key)
+        return dict(payload) if payload is not None else None
+
+    def put(self, key: Hashable, payload: Dict[str, Any]) -> None:
+        """
+        Store a response payload.
+
+        Args:
+            key: Key from ``analysis_key`` or ``chat_key``
+            payload: Response fields to cache
+        """
+        self._cache.set(key, dict(payload))
@@ -6,35 +6,84 @@ error handling, and automatic retry logic.
 """
 import os
 import logging
-from typing import Optional
-from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
-from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError
+from typing import Any, Dict, Final, List, Optional, Tuple, Union
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorCollection, AsyncIOMotorDatabase
+from pymongo.collation import Collation, CollationStrength
+from pymongo.errors import ConnectionFailure, OperationFailure, ServerSelectionTimeoutError
+from pymongo.write_concern import WriteConcern
 import asyncio
 
 logger = logging.getLogger(__name__)
 
+# Version of the index definitions below; bump it whenever they change so
+# existing deployments build the new indexes on their next startup
+INDEX_SCHEMA_VERSION: Final[int] = 5
+
+# Collection holding internal bookkeeping documents such as the index version
+META_COLLECTION: Final[str] = "_meta"
+
+# Case-insensitive comparison for emails; queries must pass the same
+# collation to use the unique email index
+EMAIL_COLLATION: Final[Collation] = Collation(locale="en", strength=CollationStrength.SECONDARY)
+
+# Index definitions: (collection name, keys, create_index options).
+# Compound keys follow the filter-then-sort order of the repository queries.
+_INDEXES: Final[Tuple[Tuple[str, Union[str, List[Tuple[str, int]]], Dict[str, Any]], ...]] = (
+    # Users collection indexes (one account per email, in any letter case)
+    ("users", "email", {"unique": True, "collation": EMAIL_COLLATION, "name": "email_ci"}),
+    # Mood logs collection indexes (listing pages by created_at, then _id)
+    ("mood_logs", [("user_id", 1), ("created_at", -1), ("_id", -1)], {}),
+    ("mood_logs", [("user_id", 1), ("date", -1)], {}),
+    # Wellness plans collection indexes
+    ("wellness_plans", [("user_id", 1), ("created_at", -1)], {}),
+    # Chat conversations collection indexes (optionally filtered by type)
+    ("chat_conversations", [("user_id", 1), ("updated_at", -1)], {}),
+    ("chat_conversations", [("user_id", 1), ("conversation_type", 1), ("updated_at", -1)], {}),
+    # Deleted conversations are removed once their expires_at has passed
+    ("chat_conversations", "expires_at", {"expireAfterSeconds": 0}),
+)
+
+# Indexes from earlier versions that no query uses: (collection name, index name).
+# Dropping them saves work on every write.
+_DROPPED_INDEXES: Final[Tuple[Tuple[str, str], ...]] = (
+    ("users", "email_1"),
+    ("users", "created_at_1"),
+    ("mood_logs", "created_at_1"),
+    ("mood_logs", "user_id_1_created_at_-1"),
+    ("chat_conversations", "created_at_1"),
+)
+
+# Write concerns that override the connection default for collections whose
+# writes need not wait for replication or the journal. A mood log or plan
+# written just before a primary crash may be lost; users (credentials) and
+# chat keep the default from MONGODB_URI.
+_COLLECTION_WRITE_CONCERNS: Final[Dict[str, WriteConcern]] = {
+    "mood_logs": WriteConcern(w=1, j=False),
+    "wellness_plans": WriteConcern(w=1, j=False),
+}
+
+# Collections whose documents reference their owner by user_id
+_USER_ID_COLLECTIONS: Final[Tuple[str, ...]] = ("mood_logs", "wellness_plans", "chat_conversations")
+
 
 class DatabaseManager:
     """
     Manages MongoDB connections with connection pooling and error handling.
     
-    Implements singleton pattern to ensure only one connection pool exists.
+    The application shares the module-level ``db_manager`` instance so only
+    one connection pool exists; import it rather than creating another.
     """
     
-    _instance: Optional['DatabaseManager'] = None
-    _client: Optional[AsyncIOMotorClient] = None
-    _database: Optional[AsyncIOMotorDatabase] = None
-    
-    def __new__(cls):
-        """Singleton pattern implementation"""
-        if cls._instance is None:
-            cls._instance = super(DatabaseManager, cls).__new__(cls)
-        return cls._instance
-    
     def __init__(self):
         """Initialize database manager"""
         self.max_retries = 3
         self.retry_delay = 1  # seconds
+        self._client: Optional[AsyncIOMotorClient] = None
+        self._database: Optional[AsyncIOMotorDatabase] = None
+        # Collection handles of the current database, built on first use
+        self._collections: Dict[str, AsyncIOMotorCollection] = {}
+        # Connection check and index builds started by init_database
+        self._background_tasks: Tuple[asyncio.Task, ...] = ()
     
     @property
     def mongodb_uri(self) -> Optional[str]:
@@ -48,10 +97,14 @@ class DatabaseManager:
         
     async def connect(self) -> None:
         """
-        Establish connection to MongoDB with retry logic.
+        Create the MongoDB client.
+        
+        The driver connects lazily and its background monitors detect
+        unreachable servers, so no round trip is made here. Use
+        ``check_connection`` to verify the deployment answers.
         
         Raises:
-            ConnectionFailure: If unable to connect after max retries
+            ValueError: If MONGODB_URI is not set
         """
         if self._client is not None:
             logger.info("Database already connected")
@@ -60,54 +113,83 @@ class DatabaseManager:
         if not self.mongodb_uri:
             raise ValueError("MONGODB_URI environment variable not set")
         
+        try:
+            # Create MongoDB client with connection pooling
+            self._client = AsyncIOMotorClient(
+                self.mongodb_uri,
+                appname=os.getenv("MONGODB_APP_NAME", "insightsphere-backend"),
+                # Maximum / minimum number of connections in the pool
+                maxPoolSize=int(os.getenv("MONGODB_MAX_POOL_SIZE", "100")),
+                minPoolSize=int(os.getenv("MONGODB_MIN_POOL_SIZE", "20")),
+                # Connections being established concurrently (driver default is 2)
+                maxConnecting=int(os.getenv("MONGODB_MAX_CONNECTING", "8")),
+                # Close idle sockets before firewalls silently drop them
+                maxIdleTimeMS=int(os.getenv("MONGODB_MAX_IDLE_MS", "60000")),
+                # Fail fast instead of queuing forever when the pool is exhausted
+                waitQueueTimeoutMS=int(os.getenv("MONGODB_WAIT_QUEUE_TIMEOUT_MS", "5000")),
+                # Wire compression, in order of preference; the server picks the
+                # first one it also supports
+                compressors=os.getenv("MONGODB_COMPRESSORS", "zstd,zlib"),
+                zlibCompressionLevel=int(os.getenv("MONGODB_ZLIB_LEVEL", "6")),
+                serverSelectionTimeoutMS=5000,  # 5 second timeout
+                connectTimeoutMS=10000,  # 10 second connection timeout
+                socketTimeoutMS=30000,  # 30 second socket timeout
+                # Server monitoring interval; dead servers are noticed between requests
+                heartbeatFrequencyMS=int(os.getenv("MONGODB_HEARTBEAT_MS", "10000")),
+                retryWrites=True,
+                retryReads=True,
+            )
+            
+            # Get database reference
+            self._database = self._client[self.db_name]
+            self._collections = {}
+            
+            logger.info(f"✅ MongoDB client created for database: {self.db_name}")
+            
+        except Exception as e:
+            logger.error(f"Unexpected error during connection: {str(e)}")
+            raise
+    
+    async def check_connection(self) -> bool:
+        """
+        Ping MongoDB with retry logic.
+        
+        Returns:
+            bool: True if the server answered, False after max retries
+        """
         for attempt in range(1, self.max_retries + 1):
+            if self._client is None:
+                return False
+            
             try:
-                logger.info(f"Attempting to connect to MongoDB (attempt {attempt}/{self.max_retries})...")
-                
-                # Create MongoDB client with connection pooling
-                self._client = AsyncIOMotorClient(
-                    self.mongodb_uri,
-                    maxPoolSize=50,  # Maximum number of connections in the pool
-                    minPoolSize=10,  # Minimum number of connections in the pool
-                    serverSelectionTimeoutMS=5000,  # 5 second timeout
-                    connectTimeoutMS=10000,  # 10 second connection timeout
-                    socketTimeoutMS=30000,  # 30 second socket timeout
-                )
-                
-                # Test the connection
                 await self._client.admin.command('ping')
-                
-                # Get database reference
-                self._database = self._client[self.db_name]
-                
                 logger.info(f"✅ Successfully connected to MongoDB database: {self.db_name}")
-                return
+                return True
                 
             except (ConnectionFailure, ServerSelectionTimeoutError) as e:
-                logger.error(f"❌ Connection attempt {attempt} failed: {str(e)}")
+                logger.error(f"❌ Connection attempt {attempt}/{self.max_retries} failed: {str(e)}")
                 
                 if attempt < self.max_retries:
                     logger.info(f"Retrying in {self.retry_delay} seconds...")
                     await asyncio.sleep(self.retry_delay)
-                else:
-                    logger.error("Max retries reached. Unable to connect to MongoDB.")
-                    raise ConnectionFailure(
-                        f"Failed to connect to MongoDB after {self.max_retries} attempts"
-                    )
-            
-            except Exception as e:
-                logger.error(f"Unexpected error during connection: {str(e)}")
-                raise
+        
+        logger.error("Max retries reached. Unable to connect to MongoDB.")
+        return False
     
     async def disconnect(self) -> None:
         """
         Close MongoDB connection gracefully.
         """
+        for task in self._background_tasks:
+            task.cancel()
+        self._background_tasks = ()
+        
         if self._client is not None:
             logger.info("Closing MongoDB connection...")
             self._client.close()
             self._client = None
             self._database = None
+            self._collections = {}
             logger.info("✅ MongoDB connection closed")
         else:
             logger.info("No active MongoDB connection to close")
@@ -128,10 +210,15 @@ class DatabaseManager:
             )
         return self._database
     
-    def get_collection(self, collection_name: str):
+    def get_collection(self, collection_name: str) -> AsyncIOMotorCollection:
         """
         Get a collection from the database.
         
+        Handles are cached per connection, so repositories can call this
+        on every operation without rebuilding the Motor collection object.
+        Collections listed in ``_COLLECTION_WRITE_CONCERNS`` get their
+        relaxed write concern.
+        
         Args:
             collection_name: Name of the collection
             
@@ -141,49 +228,131 @@ class DatabaseManager:
         Raises:
             RuntimeError: If database is not connected
         """
-        database = self.get_database()
-        return database[collection_name]
+        collection = self._collections.get(collection_name)
+        if collection is None:
+            collection = self.get_database().get_collection(
+                collection_name,
+                write_concern=_COLLECTION_WRITE_CONCERNS.get(collection_name)
+            )
+            self._collections[collection_name] = collection
+        return collection
     
     async def create_indexes(self) -> None:
         """
-        Create database indexes for optimal performance.
+        Create database indexes for optimal performance and drop obsolete ones.
         
         This should be called after connecting to ensure all indexes exist.
+        Startup is skipped when the ``_meta`` collection records that the
+        current ``INDEX_SCHEMA_VERSION`` was already built.
         """
         try:
-            logger.info("Creating database indexes...")
-            
             database = self.get_database()
+            meta_collection = database[META_COLLECTION]
             
-            # Users collection indexes
-            users_collection = database["users"]
-            await users_collection.create_index("email", unique=True)
-            await users_collection.create_index("created_at")
-            logger.info("✅ Created indexes for 'users' collection")
+            marker = await meta_collection.find_one({"_id": "indexes"})
+            if marker and marker.get("version") == INDEX_SCHEMA_VERSION:
+                logger.info(f"Database indexes are up to date (version {INDEX_SCHEMA_VERSION})")
+                return
             
-            # Mood logs collection indexes
-            mood_logs_collection = database["mood_logs"]
-            await mood_logs_collection.create_index([("user_id", 1), ("date", -1)])
-            await mood_logs_collection.create_index("created_at")
-            logger.info("✅ Created indexes for 'mood_logs' collection")
+            logger.info("Creating database indexes...")
             
-            # Wellness plans collection indexes
-            wellness_plans_collection = database["wellness_plans"]
-            await wellness_plans_collection.create_index([("user_id", 1), ("created_at", -1)])
-            logger.info("✅ Created indexes for 'wellness_plans' collection")
+            # Index builds are independent, so issue them concurrently
+            results = await asyncio.gather(
+                *(
+                    database[collection_name].create_index(keys, background=True, **options)
+                    for collection_name, keys, options in _INDEXES
+                ),
+                return_exceptions=True
+            )
+            
+            failures = 0
+            for (collection_name, keys, _), result in zip(_INDEXES, results):
+                if isinstance(result, Exception):
+                    failures += 1
+                    logger.error(f"Error creating index {keys} on '{collection_name}': {str(result)}")
             
-            # Chat conversations collection indexes
-            chat_conversations_collection = database["chat_conversations"]
-            await chat_conversations_collection.create_index([("user_id", 1), ("updated_at", -1)])
-            await chat_conversations_collection.create_index("created_at")
-            logger.info("✅ Created indexes for 'chat_conversations' collection")
+            # Remove obsolete indexes once their replacements exist; ones that
+            # never existed are fine
+            if not failures:
+                drop_results = await asyncio.gather(
+                    *(
+                        database[collection_name].drop_index(index_name)
+                        for collection_name, index_name in _DROPPED_INDEXES
+                    ),
+                    return_exceptions=True
+                )
+                for (collection_name, index_name), result in zip(_DROPPED_INDEXES, drop_results):
+                    if isinstance(result, OperationFailure) and result.code == 27:  # IndexNotFound
+                        continue
+                    if isinstance(result, Exception):
+                        failures += 1
+                        logger.error(f"Error dropping index '{index_name}' on '{collection_name}': {str(result)}")
             
-            logger.info("✅ All database indexes created successfully")
+            if failures:
+                # Leave the version marker alone so the next startup retries
+                logger.warning(f"{failures} database index operations failed")
+            else:
+                await meta_collection.update_one(
+                    {"_id": "indexes"},
+                    {"$set": {"version": INDEX_SCHEMA_VERSION}},
+                    upsert=True
+                )
+                logger.info("✅ All database indexes created successfully")
             
         except Exception as e:
             logger.error(f"Error creating indexes: {str(e)}")
             # Don't raise - indexes are important but not critical for startup
     
+    async def migrate_user_ids(self) -> None:
+        """
+        Convert string ``user_id`` fields written by earlier versions to ObjectIds.
+        
+        Ids that are not valid ObjectIds are left unchanged. The migration is
+        skipped once the ``_meta`` collection records that it completed.
+        """
+        try:
+            database = self.get_database()
+            meta_collection = database[META_COLLECTION]
+            
+            if await meta_collection.find_one({"_id": "user_ids"}):
+                return
+            
+            logger.info("Converting stored user ids to ObjectIds...")
+            
+            results = await asyncio.gather(
+                *(
+                    database[collection_name].update_many(
+                        {"user_id": {"$type": "string"}},
+                        [{"$set": {"user_id": {
+                            "$convert": {"input": "$user_id", "to": "objectId", "onError": "$user_id"}
+                        }}}]
+                    )
+                    for collection_name in _USER_ID_COLLECTIONS
+                ),
+                return_exceptions=True
+            )
+            
+            failures = 0
+            for collection_name, result in zip(_USER_ID_COLLECTIONS, results):
+                if isinstance(result, Exception):
+                    failures += 1
+                    logger.error(f"Error converting user ids in '{collection_name}': {str(result)}")
+            
+            if failures:
+                # Leave the marker unset so the next startup retries
+                logger.warning(f"{failures} user id migrations failed")
+            else:
+                await meta_collection.update_one(
+                    {"_id": "user_ids"},
+                    {"$set": {"object_ids": True}},
+                    upsert=True
+                )
+                logger.info("✅ Stored user ids converted to ObjectIds")
+            
+        except Exception as e:
+            logger.error(f"Error converting user ids: {str(e)}")
+            # Don't raise - the app still starts; old documents stay unmatched until it succeeds
+    
     @property
     def is_connected(self) -> bool:
         """Check if database is connected"""
@@ -210,10 +379,19 @@ async def init_database() -> None:
     """
     Initialize database connection and create indexes.
     
-    This should be called during application startup.
+    The connection check and index builds run in the background so the
+    server accepts requests without waiting on them; repositories work
+    without the indexes, only slower. This should be called during
+    application startup.
     """
     await db_manager.connect()
-    await db_manager.create_indexes()
+    # Awaited so no request queries ObjectId user ids while documents still
+    # store strings; after the first run this is a single marker lookup
+    await db_manager.migrate_user_ids()
+    db_manager._background_tasks = (
+        asyncio.create_task(db_manager.check_connection()),
+        asyncio.create_task(db_manager.create_indexes()),
+    )
 
 
 async def close_database() -> None:
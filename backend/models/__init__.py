@@ -6,6 +6,7 @@ from .user import (
     UserCreate,
     UserUpdate,
     UserInDB,
+    UserCredentials,
     UserResponse,
     UserLogin,
     PasswordChange,
@@ -18,6 +19,7 @@ __all__ = [
     "UserCreate",
     "UserUpdate",
     "UserInDB",
+    "UserCredentials",
     "UserResponse",
     "UserLogin",
     "PasswordChange",
@@ -4,14 +4,16 @@ Chat Conversation data models with Pydantic validation.
 from pydantic import BaseModel, Field
 from typing import List, Optional
 from datetime import datetime
-from bson import ObjectId
+
+from utils.object_id import ObjectIdStr
+from utils.timestamps import utc_now
 
 
 class Message(BaseModel):
     """Model for a single chat message"""
     role: str = Field(..., description="Message role: 'user' or 'assistant'")
     content: str = Field(..., description="Message content")
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: datetime = Field(default_factory=utc_now)
     
     class Config:
         json_schema_extra = {
@@ -46,16 +48,31 @@ class MessageCreate(BaseModel):
 class ChatConversationInDB(BaseModel):
     """Model for chat conversation stored in database"""
     id: str = Field(alias="_id")
-    user_id: str
+    user_id: ObjectIdStr
     title: Optional[str]
     conversation_type: str
     messages: List[Message]
     created_at: datetime
     updated_at: datetime
+    expires_at: Optional[datetime] = None  # Set when deleted; removed by a TTL index
     
     class Config:
         populate_by_name = True
-        json_encoders = {ObjectId: str, datetime: lambda v: v.isoformat() + 'Z'}
+        json_encoders = {datetime: lambda v: v.isoformat() + 'Z'}
+
+
+class ChatConversationSummary(BaseModel):
+    """Model for a stored chat conversation without its messages"""
+    id: str = Field(alias="_id")
+    user_id: ObjectIdStr
+    title: Optional[str]
+    conversation_type: str
+    created_at: datetime
+    updated_at: datetime
+    
+    class Config:
+        populate_by_name = True
+        json_encoders = {datetime: lambda v: v.isoformat() + 'Z'}
 
 
 class ChatConversationResponse(BaseModel):
@@ -80,3 +97,23 @@ class ChatConversationResponse(BaseModel):
                 "updated_at": "2024-01-01T00:00:00Z"
             }
         }
+
+
+class ChatConversationSummaryResponse(BaseModel):
+    """Model for a chat conversation list entry in API responses"""
+    _id: str
+    title: Optional[str]
+    conversation_type: str
+    created_at: str
+    updated_at: str
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "_id": "507f1f77bcf86cd799439011",
+                "title": "Anxiety Discussion",
+                "conversation_type": "therapy",
+                "created_at": "2024-01-01T00:00:00Z",
+                "updated_at": "2024-01-01T00:00:00Z"
+            }
+        }
@@ -4,7 +4,8 @@ Mood Log data models with Pydantic validation.
 from pydantic import BaseModel, Field
 from typing import Dict, Optional
 from datetime import datetime
-from bson import ObjectId
+
+from utils.object_id import ObjectIdStr
 
 
 class Activities(BaseModel):
@@ -45,7 +46,7 @@ class MoodLogCreate(BaseModel):
 class MoodLogInDB(BaseModel):
     """Model for mood log stored in database"""
     id: str = Field(alias="_id")
-    user_id: str
+    user_id: ObjectIdStr
     date: str
     mood: int
     energy: int
@@ -57,7 +58,6 @@ class MoodLogInDB(BaseModel):
     
     class Config:
         populate_by_name = True
-        json_encoders = {ObjectId: str}
 
 
 class MoodLogResponse(BaseModel):
@@ -4,9 +4,12 @@ User data models with Pydantic validation.
 Defines the User model and related schemas for user management.
 """
 from pydantic import BaseModel, EmailStr, Field, field_validator
-from typing import Optional
+from typing import NamedTuple, Optional
 from datetime import datetime
 from bson import ObjectId
+from bson.errors import InvalidId
+
+from utils.timestamps import utc_now
 
 
 class PyObjectId(ObjectId):
@@ -18,9 +21,13 @@ class PyObjectId(ObjectId):
     
     @classmethod
     def validate(cls, v, info):
-        if not ObjectId.is_valid(v):
+        # ObjectId(None) would generate a new id instead of failing
+        if v is None:
+            raise ValueError("Invalid ObjectId")
+        try:
+            return ObjectId(v)
+        except (InvalidId, TypeError):
             raise ValueError("Invalid ObjectId")
-        return ObjectId(v)
     
     @classmethod
     def __get_pydantic_json_schema__(cls, field_schema):
@@ -58,11 +65,22 @@ class UserProfile(BaseModel):
         }
 
 
+def _lowercase_email(v):
+    """Lowercase email strings so they are stored and compared in one form"""
+    return v.lower() if isinstance(v, str) else v
+
+
 class UserBase(BaseModel):
     """Base user model with common fields"""
     email: EmailStr = Field(..., description="User's email address")
     name: str = Field(..., min_length=1, max_length=100, description="User's full name")
     
+    @field_validator('email', mode='before')
+    @classmethod
+    def email_to_lowercase(cls, v):
+        """Store and compare emails in a single canonical form"""
+        return _lowercase_email(v)
+    
     @field_validator('name')
     @classmethod
     def name_must_not_be_empty(cls, v: str) -> str:
@@ -108,6 +126,12 @@ class UserUpdate(BaseModel):
     email: Optional[EmailStr] = None
     profile: Optional[UserProfile] = None
     
+    @field_validator('email', mode='before')
+    @classmethod
+    def email_to_lowercase(cls, v):
+        """Store and compare emails in a single canonical form"""
+        return _lowercase_email(v)
+    
     @field_validator('name')
     @classmethod
     def name_must_not_be_empty(cls, v: Optional[str]) -> Optional[str]:
@@ -129,20 +153,19 @@ class UserInDB(UserBase):
     """User model as stored in database"""
     id: str = Field(alias="_id", description="User's unique identifier")
     password_hash: str = Field(..., description="Hashed password")
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=utc_now)
     last_login: Optional[datetime] = None
     profile: UserProfile = Field(default_factory=UserProfile)
     
     class Config:
         populate_by_name = True
         arbitrary_types_allowed = True
-        json_encoders = {ObjectId: str}
         json_schema_extra = {
             "example": {
                 "_id": "507f1f77bcf86cd799439011",
                 "email": "user@example.com",
                 "name": "John Doe",
-                "password_hash": "$2b$12$...",
+                "password_hash": "$bcrypt-sha256$$2b$12$...",
                 "created_at": "2024-01-01T00:00:00Z",
                 "last_login": "2024-01-02T00:00:00Z",
                 "profile": {
@@ -156,6 +179,14 @@ class UserInDB(UserBase):
         }
 
 
+class UserCredentials(NamedTuple):
+    """Fields needed to check a login, without the profile subtree"""
+    id: str
+    email: str
+    name: str
+    password_hash: str
+
+
 class UserResponse(UserBase):
     """User model for API responses (without sensitive data)"""
     id: str = Field(alias="_id", description="User's unique identifier")
@@ -165,7 +196,6 @@ class UserResponse(UserBase):
     
     class Config:
         populate_by_name = True
-        json_encoders = {ObjectId: str}
         json_schema_extra = {
             "example": {
                 "_id": "507f1f77bcf86cd799439011",
@@ -189,6 +219,12 @@ class UserLogin(BaseModel):
     email: EmailStr
     password: str
     
+    @field_validator('email', mode='before')
+    @classmethod
+    def email_to_lowercase(cls, v):
+        """Store and compare emails in a single canonical form"""
+        return _lowercase_email(v)
+    
     class Config:
         json_schema_extra = {
             "example": {
@@ -4,7 +4,8 @@ Wellness Plan data models with Pydantic validation.
 from pydantic import BaseModel, Field
 from typing import List, Optional
 from datetime import datetime
-from bson import ObjectId
+
+from utils.object_id import ObjectIdStr
 
 
 class WellnessPlanCreate(BaseModel):
@@ -26,7 +27,7 @@ class WellnessPlanCreate(BaseModel):
 class WellnessPlanInDB(BaseModel):
     """Model for wellness plan stored in database"""
     id: str = Field(alias="_id")
-    user_id: str
+    user_id: ObjectIdStr
     activities: List[str]
     goals: List[str]
     notes: Optional[str]
@@ -34,7 +35,6 @@ class WellnessPlanInDB(BaseModel):
     
     class Config:
         populate_by_name = True
-        json_encoders = {ObjectId: str}
 
 
 class WellnessPlanResponse(BaseModel):
@@ -1,3 +1,4 @@
+import sys
 import httpx
 import asyncio
 
@@ -14,4 +15,8 @@ async def test():
         print(f'Status: {response.status_code}')
         print(f'Response: {response.json()}')
 
-asyncio.run(test())
+if sys.platform == "win32":
+    asyncio.run(test())
+else:
+    import uvloop  # uvloop is not available on Windows
+    uvloop.run(test())
@@ -2,17 +2,22 @@
 Chat Conversation Repository
 """
 import logging
-from typing import List, Optional
-from datetime import datetime
+import os
+from typing import Any, Dict, List, Optional
+from datetime import timedelta
 from bson import ObjectId
 
 from database.connection import db_manager
 from models.chat_conversation import (
     ChatConversationCreate,
     ChatConversationInDB,
+    ChatConversationSummary,
     MessageCreate,
     Message
 )
+from utils.cache import ReadThroughCache, read_cache_ttl
+from utils.object_id import parse_object_id
+from utils.timestamps import utc_now
 
 logger = logging.getLogger(__name__)
 
@@ -20,13 +25,64 @@ logger = logging.getLogger(__name__)
 class ChatRepository:
     """Repository for chat conversation database operations"""
     
+    # Conversations read by ID are reused for a few seconds so the repeated
+    # reads of one request flow cost a single query. Writes only invalidate
+    # the cache of the worker that made them, so another worker can serve a
+    # deleted or pre-write conversation until the entry expires; the cache is
+    # off by default with several workers (see read_cache_ttl)
+    CONVERSATION_CACHE_SIZE = 1024
+    CONVERSATION_CACHE_TTL_SECONDS = 5
+    
     def __init__(self):
         self.collection_name = "chat_conversations"
+        # Raw documents keyed by (conversation id, user id); each read
+        # validates a fresh model so callers never share one
+        self._conversation_cache = ReadThroughCache(
+            maxsize=self.CONVERSATION_CACHE_SIZE,
+            ttl=self.CONVERSATION_CACHE_TTL_SECONDS
+        )
     
     @property
     def collection(self):
         return db_manager.get_collection(self.collection_name)
     
+    @property
+    def max_messages(self) -> int:
+        """Get the number of most recent messages kept per conversation"""
+        return int(os.getenv("CHAT_MAX_MESSAGES", "500"))
+    
+    @property
+    def deleted_retention_days(self) -> int:
+        """Get the number of days deleted conversations are kept before removal"""
+        return int(os.getenv("CHAT_DELETED_RETENTION_DAYS", "30"))
+    
+    @property
+    def conversation_cache_ttl(self) -> float:
+        """Get the lifetime of cached conversation reads (0 disables the cache)"""
+        return read_cache_ttl("CONVERSATION_CACHE_TTL_SECONDS", self.CONVERSATION_CACHE_TTL_SECONDS)
+    
+    def _invalidate(self, conversation_id: str, user_id: str) -> None:
+        """Drop a conversation from the read cache after it changes."""
+        self._conversation_cache.invalidate((conversation_id, user_id))
+    
+    async def _load_conversation(
+        self,
+        object_id: ObjectId,
+        user_id: str
+    ) -> Optional[Dict[str, Any]]:
+        """Query a conversation document."""
+        doc = await self.collection.find_one({
+            "_id": object_id,
+            "user_id": ObjectId(user_id),
+            "expires_at": None
+        })
+        
+        if doc is None:
+            return None
+        
+        doc["_id"] = str(doc["_id"])
+        return doc
+    
     async def create_conversation(
         self,
         user_id: str,
@@ -35,14 +91,13 @@ class ChatRepository:
         """Create a new chat conversation."""
         try:
             conv_dict = conversation_data.model_dump()
-            conv_dict["user_id"] = user_id
+            conv_dict["user_id"] = ObjectId(user_id)
             conv_dict["messages"] = []
-            conv_dict["created_at"] = datetime.utcnow()
-            conv_dict["updated_at"] = datetime.utcnow()
+            conv_dict["created_at"] = conv_dict["updated_at"] = utc_now()
             
             result = await self.collection.insert_one(conv_dict)
             
-            logger.info(f"✅ Chat conversation created for user: {user_id}")
+            logger.info("✅ Chat conversation created for user: %s", user_id)
             
             return ChatConversationInDB(
                 _id=str(result.inserted_id),
@@ -54,7 +109,47 @@ class ChatRepository:
                 updated_at=conv_dict["updated_at"]
             )
         except Exception as e:
-            logger.error(f"Error creating conversation: {str(e)}")
+            logger.error("Error creating conversation: %s", e)
+            raise
+    
+    async def create_conversations_bulk(
+        self,
+        user_id: str,
+        conversations_data: List[ChatConversationCreate]
+    ) -> List[ChatConversationInDB]:
+        """Create several chat conversations with a single insert."""
+        try:
+            if not conversations_data:
+                return []
+            
+            now = utc_now()
+            docs = []
+            for conversation_data in conversations_data:
+                conv_dict = conversation_data.model_dump()
+                conv_dict["user_id"] = ObjectId(user_id)
+                conv_dict["messages"] = []
+                conv_dict["created_at"] = now
+                conv_dict["updated_at"] = now
+                docs.append(conv_dict)
+            
+            result = await self.collection.insert_many(docs, ordered=False)
+            
+            logger.info("✅ %d chat conversations created for user: %s", len(result.inserted_ids), user_id)
+            
+            return [
+                ChatConversationInDB(
+                    _id=str(inserted_id),
+                    user_id=user_id,
+                    title=conversation_data.title,
+                    conversation_type=conversation_data.conversation_type,
+                    messages=[],
+                    created_at=now,
+                    updated_at=now
+                )
+                for inserted_id, conversation_data in zip(result.inserted_ids, conversations_data)
+            ]
+        except Exception as e:
+            logger.error("Error creating conversations: %s", e)
             raise
     
     async def add_message(
@@ -65,30 +160,83 @@ class ChatRepository:
     ) -> bool:
         """Add a message to a conversation."""
         try:
-            if not ObjectId.is_valid(conversation_id):
+            object_id = parse_object_id(conversation_id)
+            if object_id is None:
                 return False
             
+            now = utc_now()
             message = Message(
                 role=message_data.role,
                 content=message_data.content,
-                timestamp=datetime.utcnow()
+                timestamp=now
             )
             
             result = await self.collection.update_one(
-                {"_id": ObjectId(conversation_id), "user_id": user_id},
+                {"_id": object_id, "user_id": ObjectId(user_id), "expires_at": None},
                 {
-                    "$push": {"messages": message.model_dump()},
-                    "$set": {"updated_at": datetime.utcnow()}
+                    "$push": {
+                        "messages": {
+                            "$each": [message.model_dump()],
+                            "$slice": -self.max_messages
+                        }
+                    },
+                    "$set": {"updated_at": now}
                 }
             )
+            self._invalidate(str(object_id), user_id)
             
             if result.modified_count > 0:
-                logger.info(f"✅ Message added to conversation: {conversation_id}")
+                logger.info("✅ Message added to conversation: %s", conversation_id)
                 return True
             
             return False
         except Exception as e:
-            logger.error(f"Error adding message: {str(e)}")
+            logger.error("Error adding message: %s", e)
+            raise
+    
+    async def add_messages_bulk(
+        self,
+        conversation_id: str,
+        user_id: str,
+        messages_data: List[MessageCreate]
+    ) -> bool:
+        """Append several messages to a conversation with a single update."""
+        try:
+            object_id = parse_object_id(conversation_id)
+            if object_id is None or not messages_data:
+                return False
+            
+            now = utc_now()
+            messages = [
+                Message(
+                    role=message_data.role,
+                    content=message_data.content,
+                    timestamp=now
+                ).model_dump()
+                for message_data in messages_data
+            ]
+            
+            result = await self.collection.update_one(
+                {"_id": object_id, "user_id": ObjectId(user_id), "expires_at": None},
+                {
+                    "$push": {
+                        "messages": {
+                            "$each": messages,
+                            "$slice": -self.max_messages
+                        }
+                    },
+                    "$set": {"updated_at": now}
+                }
+            )
+            self._invalidate(str(object_id), user_id)
+            
+            if result.modified_count > 0:
+                logger.info("✅ %d messages added to conversation: %s", len(messages), conversation_id)
+                return True
+            
+            return False
+        except Exception as e:
+            logger.error("Error adding messages: %s", e)
             raise
     
     async def get_user_conversations(
@@ -96,23 +244,25 @@ class ChatRepository:
         user_id: str,
         conversation_type: Optional[str] = None,
         limit: int = 50
-    ) -> List[ChatConversationInDB]:
-        """Get conversations for a user."""
+    ) -> List[ChatConversationSummary]:
+        """Get conversations for a user, without their messages."""
         try:
-            query = {"user_id": user_id}
+            query = {"user_id": ObjectId(user_id), "expires_at": None}
             if conversation_type:
                 query["conversation_type"] = conversation_type
             
-            cursor = self.collection.find(query).sort("updated_at", -1).limit(limit)
+            # One batch holds the whole page, so no getMore round trip is needed
+            cursor = self.collection.find(
+                query, projection={"messages": 0}
+            ).sort("updated_at", -1).limit(limit).batch_size(limit)
             
-            conversations = []
-            async for doc in cursor:
+            docs = await cursor.to_list(length=limit)
+            for doc in docs:
                 doc["_id"] = str(doc["_id"])
-                conversations.append(ChatConversationInDB(**doc))
             
-            return conversations
+            return [ChatConversationSummary.model_validate(doc) for doc in docs]
         except Exception as e:
-            logger.error(f"Error retrieving conversations: {str(e)}")
+            logger.error("Error retrieving conversations: %s", e)
             raise
     
     async def get_conversation_by_id(
@@ -122,21 +272,55 @@ class ChatRepository:
     ) -> Optional[ChatConversationInDB]:
         """Get a specific conversation by ID."""
         try:
-            if not ObjectId.is_valid(conversation_id):
+            object_id = parse_object_id(conversation_id)
+            if object_id is None:
                 return None
             
-            doc = await self.collection.find_one({
-                "_id": ObjectId(conversation_id),
-                "user_id": user_id
-            })
+            doc = await self._conversation_cache.get(
+                (str(object_id), user_id),
+                lambda: self._load_conversation(object_id, user_id),
+                ttl=self.conversation_cache_ttl
+            )
             
             if doc:
-                doc["_id"] = str(doc["_id"])
-                return ChatConversationInDB(**doc)
+                return ChatConversationInDB.model_validate(doc)
             
             return None
         except Exception as e:
-            logger.error(f"Error retrieving conversation: {str(e)}")
+            logger.error("Error retrieving conversation: %s", e)
+            raise
+    
+    async def get_conversations_by_ids(
+        self,
+        conversation_ids: List[str],
+        user_id: str
+    ) -> List[ChatConversationInDB]:
+        """Get several conversations with a single query, in the order requested."""
+        try:
+            object_ids = [
+                object_id for object_id in map(parse_object_id, conversation_ids)
+                if object_id is not None
+            ]
+            if not object_ids:
+                return []
+            
+            cursor = self.collection.find({
+                "_id": {"$in": object_ids},
+                "user_id": ObjectId(user_id),
+                "expires_at": None
+            })
+            
+            conversations = {}
+            async for doc in cursor:
+                doc["_id"] = str(doc["_id"])
+                conversations[doc["_id"]] = ChatConversationInDB.model_validate(doc)
+            
+            return [
+                conversations[str(object_id)] for object_id in object_ids
+                if str(object_id) in conversations
+            ]
+        except Exception as e:
+            logger.error("Error retrieving conversations: %s", e)
             raise
     
     async def delete_conversation(
@@ -144,23 +328,30 @@ class ChatRepository:
         conversation_id: str,
         user_id: str
     ) -> bool:
-        """Delete a conversation."""
+        """
+        Delete a conversation.
+        
+        The conversation is hidden right away and removed by the TTL index on
+        ``expires_at`` once the retention period has passed.
+        """
         try:
-            if not ObjectId.is_valid(conversation_id):
+            object_id = parse_object_id(conversation_id)
+            if object_id is None:
                 return False
             
-            result = await self.collection.delete_one({
-                "_id": ObjectId(conversation_id),
-                "user_id": user_id
-            })
+            result = await self.collection.update_one(
+                {"_id": object_id, "user_id": ObjectId(user_id), "expires_at": None},
+                {"$set": {"expires_at": utc_now() + timedelta(days=self.deleted_retention_days)}}
+            )
+            self._invalidate(str(object_id), user_id)
             
-            if result.deleted_count > 0:
-                logger.info(f"✅ Conversation deleted: {conversation_id}")
+            if result.modified_count > 0:
+                logger.info("✅ Conversation deleted: %s", conversation_id)
                 return True
             
             return False
         except Exception as e:
-            logger.error(f"Error deleting conversation: {str(e)}")
+            logger.error("Error deleting conversation: %s", e)
             raise
 
 
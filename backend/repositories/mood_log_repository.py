@@ -4,12 +4,14 @@ Mood Log Repository
 Handles database operations for mood logs.
 """
 import logging
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime
 from bson import ObjectId
 
 from database.connection import db_manager
 from models.mood_log import MoodLogCreate, MoodLogInDB
+from utils.object_id import parse_object_id
+from utils.timestamps import utc_now
 
 logger = logging.getLogger(__name__)
 
@@ -43,57 +45,163 @@ class MoodLogRepository:
         """
         try:
             mood_dict = mood_data.model_dump()
-            mood_dict["user_id"] = user_id
-            mood_dict["created_at"] = datetime.utcnow()
+            mood_dict["user_id"] = ObjectId(user_id)
+            mood_dict["created_at"] = utc_now()
             
             result = await self.collection.insert_one(mood_dict)
             mood_dict["_id"] = str(result.inserted_id)
             
-            logger.info(f"✅ Mood log created for user: {user_id}")
+            logger.info("✅ Mood log created for user: %s", user_id)
             
-            return MoodLogInDB(
-                _id=str(result.inserted_id),
-                user_id=user_id,
-                **mood_data.model_dump(),
-                created_at=mood_dict["created_at"]
-            )
+            # Reuse the inserted document rather than dumping mood_data again
+            return MoodLogInDB(**mood_dict)
             
         except Exception as e:
-            logger.error(f"Error creating mood log: {str(e)}")
+            logger.error("Error creating mood log: %s", e)
             raise
     
+    async def create_mood_logs_bulk(
+        self,
+        user_id: str,
+        mood_datas: List[MoodLogCreate]
+    ) -> List[MoodLogInDB]:
+        """
+        Create several mood logs for a user with a single insert.
+        
+        Args:
+            user_id: User's unique identifier
+            mood_datas: Mood log data, e.g. from a history import
+            
+        Returns:
+            List[MoodLogInDB]: Created mood logs, in input order
+        """
+        try:
+            if not mood_datas:
+                return []
+            
+            owner_id = ObjectId(user_id)
+            now = utc_now()
+            docs = []
+            for mood_data in mood_datas:
+                mood_dict = mood_data.model_dump()
+                mood_dict["user_id"] = owner_id
+                mood_dict["created_at"] = now
+                docs.append(mood_dict)
+            
+            result = await self.collection.insert_many(docs, ordered=False)
+            
+            logger.info("✅ %d mood logs created for user: %s", len(result.inserted_ids), user_id)
+            
+            for mood_dict, inserted_id in zip(docs, result.inserted_ids):
+                mood_dict["_id"] = str(inserted_id)
+            return [MoodLogInDB.model_validate(mood_dict) for mood_dict in docs]
+            
+        except Exception as e:
+            logger.error("Error creating mood logs: %s", e)
+            raise
+    
+    async def _find_page(
+        self,
+        user_id: str,
+        limit: int,
+        after: Optional[Tuple[datetime, ObjectId]],
+        projection: Optional[Dict[str, int]] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[Tuple[datetime, ObjectId]]]:
+        """Read one keyset page of raw documents and the next page's position."""
+        query = {"user_id": ObjectId(user_id)}
+        if after is not None:
+            created_at, log_id = after
+            query["$or"] = [
+                {"created_at": {"$lt": created_at}},
+                {"created_at": created_at, "_id": {"$lt": log_id}}
+            ]
+        
+        # One extra log tells whether another page exists without a
+        # count query; one batch holds it all, so no getMore is needed
+        cursor = self.collection.find(query, projection).sort(
+            [("created_at", -1), ("_id", -1)]
+        ).limit(limit + 1).batch_size(limit + 1)
+        
+        docs = await cursor.to_list(length=limit + 1)
+        has_next = len(docs) > limit
+        del docs[limit:]
+        
+        next_position = None
+        if has_next:
+            next_position = (docs[-1]["created_at"], docs[-1]["_id"])
+        return docs, next_position
+    
     async def get_user_mood_logs(
         self,
         user_id: str,
         limit: int = 50,
-        skip: int = 0
-    ) -> List[MoodLogInDB]:
+        after: Optional[Tuple[datetime, ObjectId]] = None
+    ) -> Tuple[List[MoodLogInDB], Optional[Tuple[datetime, ObjectId]]]:
+        """
+        Get a page of mood logs for a specific user, newest first.
+        
+        Pages are addressed by the (created_at, _id) of the last log already
+        seen, so the query is an index range scan however deep the page is.
+        
+        Args:
+            user_id: User's unique identifier
+            limit: Maximum number of logs to return
+            after: Position returned with the previous page, if any
+            
+        Returns:
+            Tuple of the mood logs and the position of the next page
+            (None when this is the last page)
+        """
+        try:
+            docs, next_position = await self._find_page(user_id, limit, after)
+            
+            for doc in docs:
+                doc["_id"] = str(doc["_id"])
+            mood_logs = [MoodLogInDB.model_validate(doc) for doc in docs]
+            
+            logger.info("Retrieved %d mood logs for user: %s", len(mood_logs), user_id)
+            return mood_logs, next_position
+            
+        except Exception as e:
+            logger.error("Error retrieving mood logs: %s", e)
+            raise
+    
+    async def get_user_mood_logs_json(
+        self,
+        user_id: str,
+        limit: int = 50,
+        after: Optional[Tuple[datetime, ObjectId]] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[Tuple[datetime, ObjectId]]]:
         """
-        Get mood logs for a specific user.
+        Get a page of mood logs as JSON-ready dicts, newest first.
+        
+        For endpoints that only re-serialize the logs: the stored documents
+        are trusted, so they skip model validation and are converted in place.
         
         Args:
             user_id: User's unique identifier
             limit: Maximum number of logs to return
-            skip: Number of logs to skip
+            after: Position returned with the previous page, if any
             
         Returns:
-            List[MoodLogInDB]: List of mood logs
+            Tuple of the mood log dicts (``_id`` and ``created_at`` as
+            strings) and the position of the next page (None when this is
+            the last page)
         """
         try:
-            cursor = self.collection.find(
-                {"user_id": user_id}
-            ).sort("created_at", -1).skip(skip).limit(limit)
+            docs, next_position = await self._find_page(
+                user_id, limit, after, projection={"user_id": 0}
+            )
             
-            mood_logs = []
-            async for doc in cursor:
+            for doc in docs:
                 doc["_id"] = str(doc["_id"])
-                mood_logs.append(MoodLogInDB(**doc))
+                doc["created_at"] = doc["created_at"].isoformat() + 'Z'
             
-            logger.info(f"Retrieved {len(mood_logs)} mood logs for user: {user_id}")
-            return mood_logs
+            logger.info("Retrieved %d mood logs for user: %s", len(docs), user_id)
+            return docs, next_position
             
         except Exception as e:
-            logger.error(f"Error retrieving mood logs: {str(e)}")
+            logger.error("Error retrieving mood logs: %s", e)
             raise
     
     async def get_mood_log_by_id(
@@ -112,22 +220,23 @@ class MoodLogRepository:
             Optional[MoodLogInDB]: Mood log if found and owned by user
         """
         try:
-            if not ObjectId.is_valid(log_id):
+            object_id = parse_object_id(log_id)
+            if object_id is None:
                 return None
             
             doc = await self.collection.find_one({
-                "_id": ObjectId(log_id),
-                "user_id": user_id
+                "_id": object_id,
+                "user_id": ObjectId(user_id)
             })
             
             if doc:
                 doc["_id"] = str(doc["_id"])
-                return MoodLogInDB(**doc)
+                return MoodLogInDB.model_validate(doc)
             
             return None
             
         except Exception as e:
-            logger.error(f"Error retrieving mood log: {str(e)}")
+            logger.error("Error retrieving mood log: %s", e)
             raise
     
     async def delete_mood_log(
@@ -146,39 +255,43 @@ class MoodLogRepository:
             bool: True if deleted, False otherwise
         """
         try:
-            if not ObjectId.is_valid(log_id):
+            object_id = parse_object_id(log_id)
+            if object_id is None:
                 return False
             
             result = await self.collection.delete_one({
-                "_id": ObjectId(log_id),
-                "user_id": user_id
+                "_id": object_id,
+                "user_id": ObjectId(user_id)
             })
             
             if result.deleted_count > 0:
-                logger.info(f"✅ Mood log deleted: {log_id}")
+                logger.info("✅ Mood log deleted: %s", log_id)
                 return True
             
             return False
             
         except Exception as e:
-            logger.error(f"Error deleting mood log: {str(e)}")
+            logger.error("Error deleting mood log: %s", e)
             raise
     
-    async def get_mood_log_count(self, user_id: str) -> int:
+    async def get_mood_log_count(self, user_id: str, max_count: Optional[int] = None) -> int:
         """
         Get total count of mood logs for a user.
         
         Args:
             user_id: User's unique identifier
+            max_count: Stop counting at this many logs (e.g. for a "99+" badge),
+                so the index scan is bounded for users with long histories
             
         Returns:
-            int: Total count of mood logs
+            int: Total count of mood logs, at most max_count when given
         """
         try:
-            count = await self.collection.count_documents({"user_id": user_id})
+            options = {"limit": max_count} if max_count else {}
+            count = await self.collection.count_documents({"user_id": ObjectId(user_id)}, **options)
             return count
         except Exception as e:
-            logger.error(f"Error counting mood logs: {str(e)}")
+            logger.error("Error counting mood logs: %s", e)
             raise
 
 
@@ -5,12 +5,16 @@ Handles all CRUD operations for users in MongoDB.
 """
 import logging
 from typing import Optional, Dict, Any
-from datetime import datetime
 from bson import ObjectId
+from pymongo import ReturnDocument
 from pymongo.errors import DuplicateKeyError
 
-from models.user import UserCreate, UserInDB, UserUpdate, UserProfile
+from models.user import UserCreate, UserCredentials, UserInDB, UserUpdate, UserProfile
 from database import db_manager
+from database.connection import EMAIL_COLLATION
+from utils.cache import ReadThroughCache, read_cache_ttl
+from utils.object_id import parse_object_id
+from utils.timestamps import utc_now
 
 logger = logging.getLogger(__name__)
 
@@ -22,14 +26,49 @@ class UserRepository:
     Provides CRUD operations and email uniqueness validation.
     """
     
+    # Users read by ID are reused for a few seconds so the repeated lookups
+    # of one request flow (auth, then the handler) cost a single query.
+    # Writes only invalidate the cache of the worker that made them, so
+    # another worker could keep authenticating a deleted user until the entry
+    # expires; the cache is off by default with several workers (see
+    # read_cache_ttl)
+    USER_CACHE_SIZE = 10_000
+    USER_CACHE_TTL_SECONDS = 5
+    
     def __init__(self):
         """Initialize user repository"""
         self.collection_name = "users"
+        # Raw documents keyed by user id; each read validates a fresh model
+        # so callers never share one
+        self._user_cache = ReadThroughCache(
+            maxsize=self.USER_CACHE_SIZE,
+            ttl=self.USER_CACHE_TTL_SECONDS
+        )
     
     def _get_collection(self):
         """Get users collection"""
         return db_manager.get_collection(self.collection_name)
     
+    @property
+    def user_cache_ttl(self) -> float:
+        """Get the lifetime of cached user reads (0 disables the cache)"""
+        return read_cache_ttl("USER_CACHE_TTL_SECONDS", self.USER_CACHE_TTL_SECONDS)
+    
+    def _invalidate(self, user_id: str) -> None:
+        """Drop a user from the read cache after it changes."""
+        self._user_cache.invalidate(user_id)
+    
+    async def _load_user(self, object_id: ObjectId) -> Optional[Dict[str, Any]]:
+        """Query a user document."""
+        user_doc = await self._get_collection().find_one({"_id": object_id})
+        
+        if not user_doc:
+            return None
+        
+        # Convert ObjectId to string
+        user_doc["_id"] = str(user_doc["_id"])
+        return user_doc
+    
     async def create_user(self, user_data: UserCreate, password_hash: str) -> UserInDB:
         """
         Create a new user in the database.
@@ -50,10 +89,10 @@ class UserRepository:
             
             # Prepare user document
             user_doc = {
-                "email": user_data.email.lower(),  # Store email in lowercase
+                "email": user_data.email,  # Lowercased by UserCreate
                 "name": user_data.name,
                 "password_hash": password_hash,
-                "created_at": datetime.utcnow(),
+                "created_at": utc_now(),
                 "last_login": None,
                 "profile": {
                     "avatar_url": None,
@@ -67,26 +106,20 @@ class UserRepository:
             # Insert user
             result = await collection.insert_one(user_doc)
             
-            # Retrieve created user
-            created_user = await collection.find_one({"_id": result.inserted_id})
-            
-            if not created_user:
-                raise ValueError("Failed to retrieve created user")
-            
-            # Convert to UserInDB model
-            created_user["_id"] = str(created_user["_id"])
-            user_in_db = UserInDB(**created_user)
+            # Build the model from the inserted document instead of reading it back
+            user_doc["_id"] = str(result.inserted_id)
+            user_in_db = UserInDB(**user_doc)
             
-            logger.info(f"✅ User created successfully: {user_data.email}")
+            logger.info("✅ User created successfully: %s", user_data.email)
             return user_in_db
             
         except DuplicateKeyError:
-            logger.warning(f"❌ Duplicate email attempted: {user_data.email}")
+            logger.warning("❌ Duplicate email attempted: %s", user_data.email)
             raise DuplicateKeyError(
                 f"User with email {user_data.email} already exists"
             )
         except Exception as e:
-            logger.error(f"Error creating user: {str(e)}")
+            logger.error("Error creating user: %s", e)
             raise
     
     async def get_user_by_email(self, email: str) -> Optional[UserInDB]:
@@ -102,8 +135,12 @@ class UserRepository:
         try:
             collection = self._get_collection()
             
-            # Search with case-insensitive email
-            user_doc = await collection.find_one({"email": email.lower()})
+            # The collation matches emails case-insensitively and lets the
+            # query use the unique email index
+            user_doc = await collection.find_one(
+                {"email": email},
+                collation=EMAIL_COLLATION
+            )
             
             if not user_doc:
                 return None
@@ -111,10 +148,46 @@ class UserRepository:
             # Convert ObjectId to string
             user_doc["_id"] = str(user_doc["_id"])
             
-            return UserInDB(**user_doc)
+            return UserInDB.model_validate(user_doc)
+            
+        except Exception as e:
+            logger.error("Error finding user by email: %s", e)
+            raise
+    
+    async def get_user_credentials(self, email: str) -> Optional[UserCredentials]:
+        """
+        Find the fields needed to check a login by email address.
+        
+        Only the id, email, name and password hash are read, so failed
+        logins don't transfer or validate the profile subtree.
+        
+        Args:
+            email: User's email address
+            
+        Returns:
+            UserCredentials if found, None otherwise
+        """
+        try:
+            collection = self._get_collection()
+            
+            user_doc = await collection.find_one(
+                {"email": email},
+                projection={"email": 1, "name": 1, "password_hash": 1},
+                collation=EMAIL_COLLATION
+            )
+            
+            if not user_doc:
+                return None
+            
+            return UserCredentials(
+                id=str(user_doc["_id"]),
+                email=user_doc["email"],
+                name=user_doc["name"],
+                password_hash=user_doc["password_hash"]
+            )
             
         except Exception as e:
-            logger.error(f"Error finding user by email: {str(e)}")
+            logger.error("Error finding user credentials: %s", e)
             raise
     
     async def get_user_by_id(self, user_id: str) -> Optional[UserInDB]:
@@ -128,24 +201,22 @@ class UserRepository:
             UserInDB if found, None otherwise
         """
         try:
-            collection = self._get_collection()
-            
             # Validate ObjectId
-            if not ObjectId.is_valid(user_id):
+            object_id = parse_object_id(user_id)
+            if object_id is None:
                 return None
             
-            user_doc = await collection.find_one({"_id": ObjectId(user_id)})
+            user_doc = await self._user_cache.get(
+                str(object_id), lambda: self._load_user(object_id), ttl=self.user_cache_ttl
+            )
             
             if not user_doc:
                 return None
             
-            # Convert ObjectId to string
-            user_doc["_id"] = str(user_doc["_id"])
-            
-            return UserInDB(**user_doc)
+            return UserInDB.model_validate(user_doc)
             
         except Exception as e:
-            logger.error(f"Error finding user by ID: {str(e)}")
+            logger.error("Error finding user by ID: %s", e)
             raise
     
     async def update_user(
@@ -170,17 +241,18 @@ class UserRepository:
             collection = self._get_collection()
             
             # Validate ObjectId
-            if not ObjectId.is_valid(user_id):
+            object_id = parse_object_id(user_id)
+            if object_id is None:
                 return None
             
-            # Build update document
-            update_doc = {}
-            if updates.name is not None:
-                update_doc["name"] = updates.name
-            if updates.email is not None:
-                update_doc["email"] = updates.email.lower()
-            if updates.profile is not None:
-                update_doc["profile"] = updates.profile.model_dump()
+            # Build update document from the provided fields; None means
+            # "leave unchanged", while nested profile values are kept whole;
+            # UserUpdate has already lowercased the email
+            update_doc = {
+                field: value
+                for field, value in updates.model_dump().items()
+                if value is not None
+            }
             
             if not update_doc:
                 # No updates provided, return current user
@@ -188,10 +260,11 @@ class UserRepository:
             
             # Update user
             result = await collection.find_one_and_update(
-                {"_id": ObjectId(user_id)},
+                {"_id": object_id},
                 {"$set": update_doc},
-                return_document=True  # Return updated document
+                return_document=ReturnDocument.AFTER
             )
+            self._invalidate(str(object_id))
             
             if not result:
                 return None
@@ -199,16 +272,16 @@ class UserRepository:
             # Convert ObjectId to string
             result["_id"] = str(result["_id"])
             
-            logger.info(f"✅ User updated successfully: {user_id}")
-            return UserInDB(**result)
+            logger.info("✅ User updated successfully: %s", user_id)
+            return UserInDB.model_validate(result)
             
         except DuplicateKeyError:
-            logger.warning(f"❌ Duplicate email in update: {updates.email}")
+            logger.warning("❌ Duplicate email in update: %s", updates.email)
             raise DuplicateKeyError(
                 f"User with email {updates.email} already exists"
             )
         except Exception as e:
-            logger.error(f"Error updating user: {str(e)}")
+            logger.error("Error updating user: %s", e)
             raise
     
     async def update_last_login(self, user_id: str) -> bool:
@@ -225,20 +298,59 @@ class UserRepository:
             collection = self._get_collection()
             
             # Validate ObjectId
-            if not ObjectId.is_valid(user_id):
+            object_id = parse_object_id(user_id)
+            if object_id is None:
                 return False
             
             result = await collection.update_one(
-                {"_id": ObjectId(user_id)},
-                {"$set": {"last_login": datetime.utcnow()}}
+                {"_id": object_id},
+                {"$set": {"last_login": utc_now()}}
             )
+            self._invalidate(str(object_id))
             
             return result.modified_count > 0
             
         except Exception as e:
-            logger.error(f"Error updating last login: {str(e)}")
+            logger.error("Error updating last login: %s", e)
             return False
     
+    async def record_login(self, user_id: str) -> Optional[UserInDB]:
+        """
+        Set the user's last login timestamp and return the updated user.
+        
+        Args:
+            user_id: User's unique identifier
+            
+        Returns:
+            Updated UserInDB if found, None otherwise
+        """
+        try:
+            collection = self._get_collection()
+            
+            # Validate ObjectId
+            object_id = parse_object_id(user_id)
+            if object_id is None:
+                return None
+            
+            user_doc = await collection.find_one_and_update(
+                {"_id": object_id},
+                {"$set": {"last_login": utc_now()}},
+                return_document=ReturnDocument.AFTER
+            )
+            self._invalidate(str(object_id))
+            
+            if not user_doc:
+                return None
+            
+            # Convert ObjectId to string
+            user_doc["_id"] = str(user_doc["_id"])
+            
+            return UserInDB.model_validate(user_doc)
+            
+        except Exception as e:
+            logger.error("Error recording login: %s", e)
+            raise
+    
     async def update_password(self, user_id: str, new_password_hash: str) -> bool:
         """
         Update user's password hash.
@@ -254,19 +366,21 @@ class UserRepository:
             collection = self._get_collection()
             
             # Validate ObjectId
-            if not ObjectId.is_valid(user_id):
+            object_id = parse_object_id(user_id)
+            if object_id is None:
                 return False
             
             result = await collection.update_one(
-                {"_id": ObjectId(user_id)},
+                {"_id": object_id},
                 {"$set": {"password_hash": new_password_hash}}
             )
+            self._invalidate(str(object_id))
             
-            logger.info(f"✅ Password updated for user: {user_id}")
+            logger.info("✅ Password updated for user: %s", user_id)
             return result.modified_count > 0
             
         except Exception as e:
-            logger.error(f"Error updating password: {str(e)}")
+            logger.error("Error updating password: %s", e)
             return False
     
     async def delete_user(self, user_id: str) -> bool:
@@ -283,19 +397,21 @@ class UserRepository:
             collection = self._get_collection()
             
             # Validate ObjectId
-            if not ObjectId.is_valid(user_id):
+            object_id = parse_object_id(user_id)
+            if object_id is None:
                 return False
             
-            result = await collection.delete_one({"_id": ObjectId(user_id)})
+            result = await collection.delete_one({"_id": object_id})
+            self._invalidate(str(object_id))
             
             if result.deleted_count > 0:
-                logger.info(f"✅ User deleted: {user_id}")
+                logger.info("✅ User deleted: %s", user_id)
                 return True
             
             return False
             
         except Exception as e:
-            logger.error(f"Error deleting user: {str(e)}")
+            logger.error("Error deleting user: %s", e)
             return False
     
     async def email_exists(self, email: str) -> bool:
@@ -311,11 +427,17 @@ class UserRepository:
         try:
             collection = self._get_collection()
             
-            count = await collection.count_documents({"email": email.lower()})
-            return count > 0
+            # Stop at the first index hit and return only the _id; the
+            # collation lets the query use the unique email index
+            doc = await collection.find_one(
+                {"email": email},
+                projection={"_id": 1},
+                collation=EMAIL_COLLATION
+            )
+            return doc is not None
             
         except Exception as e:
-            logger.error(f"Error checking email existence: {str(e)}")
+            logger.error("Error checking email existence: %s", e)
             return False
 
 
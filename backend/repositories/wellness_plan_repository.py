@@ -2,12 +2,12 @@
 Wellness Plan Repository
 """
 import logging
-from typing import List, Optional
-from datetime import datetime
+from typing import Any, Dict, List, Optional
 from bson import ObjectId
 
 from database.connection import db_manager
 from models.wellness_plan import WellnessPlanCreate, WellnessPlanInDB
+from utils.timestamps import utc_now
 
 logger = logging.getLogger(__name__)
 
@@ -30,21 +30,18 @@ class WellnessPlanRepository:
         """Create a new wellness plan for a user."""
         try:
             plan_dict = plan_data.model_dump()
-            plan_dict["user_id"] = user_id
-            plan_dict["created_at"] = datetime.utcnow()
+            plan_dict["user_id"] = ObjectId(user_id)
+            plan_dict["created_at"] = utc_now()
             
             result = await self.collection.insert_one(plan_dict)
+            plan_dict["_id"] = str(result.inserted_id)
             
-            logger.info(f"✅ Wellness plan created for user: {user_id}")
+            logger.info("✅ Wellness plan created for user: %s", user_id)
             
-            return WellnessPlanInDB(
-                _id=str(result.inserted_id),
-                user_id=user_id,
-                **plan_data.model_dump(),
-                created_at=plan_dict["created_at"]
-            )
+            # Reuse the inserted document rather than dumping plan_data again
+            return WellnessPlanInDB(**plan_dict)
         except Exception as e:
-            logger.error(f"Error creating wellness plan: {str(e)}")
+            logger.error("Error creating wellness plan: %s", e)
             raise
     
     async def get_user_wellness_plans(
@@ -53,19 +50,41 @@ class WellnessPlanRepository:
         limit: int = 10
     ) -> List[WellnessPlanInDB]:
         """Get wellness plans for a user."""
+        try:
+            # One batch holds the whole page, so no getMore round trip is needed
+            cursor = self.collection.find(
+                {"user_id": ObjectId(user_id)}
+            ).sort("created_at", -1).limit(limit).batch_size(limit)
+            
+            docs = await cursor.to_list(length=limit)
+            for doc in docs:
+                doc["_id"] = str(doc["_id"])
+            
+            return [WellnessPlanInDB.model_validate(doc) for doc in docs]
+        except Exception as e:
+            logger.error("Error retrieving wellness plans: %s", e)
+            raise
+    
+    async def get_user_wellness_plans_json(
+        self,
+        user_id: str,
+        limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        """Get wellness plans for a user as JSON-ready dicts, skipping model validation."""
         try:
             cursor = self.collection.find(
-                {"user_id": user_id}
-            ).sort("created_at", -1).limit(limit)
+                {"user_id": ObjectId(user_id)},
+                {"user_id": 0}
+            ).sort("created_at", -1).limit(limit).batch_size(limit)
             
-            plans = []
-            async for doc in cursor:
+            docs = await cursor.to_list(length=limit)
+            for doc in docs:
                 doc["_id"] = str(doc["_id"])
-                plans.append(WellnessPlanInDB(**doc))
+                doc["created_at"] = doc["created_at"].isoformat() + 'Z'
             
-            return plans
+            return docs
         except Exception as e:
-            logger.error(f"Error retrieving wellness plans: {str(e)}")
+            logger.error("Error retrieving wellness plans: %s", e)
             raise
     
     async def get_latest_wellness_plan(
@@ -75,17 +94,17 @@ class WellnessPlanRepository:
         """Get the most recent wellness plan for a user."""
         try:
             doc = await self.collection.find_one(
-                {"user_id": user_id},
+                {"user_id": ObjectId(user_id)},
                 sort=[("created_at", -1)]
             )
             
             if doc:
                 doc["_id"] = str(doc["_id"])
-                return WellnessPlanInDB(**doc)
+                return WellnessPlanInDB.model_validate(doc)
             
             return None
         except Exception as e:
-            logger.error(f"Error retrieving latest wellness plan: {str(e)}")
+            logger.error("Error retrieving latest wellness plan: %s", e)
             raise
 
 
@@ -8,7 +8,8 @@ from pydantic import BaseModel
 from typing import Optional
 import logging
 
-from models.user import UserCreate, UserResponse, UserLogin
+from models.user import UserCreate, UserInDB, UserResponse, UserLogin
+from core.dependencies import extract_token_from_header
 from services.auth_service import (
     auth_service,
     UserAlreadyExistsError,
@@ -64,33 +65,28 @@ class LogoutResponse(BaseModel):
         }
 
 
-def extract_token_from_header(authorization: Optional[str]) -> str:
+def _user_to_response(user: UserInDB) -> UserResponse:
     """
-    Extract JWT token from Authorization header.
+    Build the API view of a stored user.
+    
+    The user was validated when it was loaded, so the response is built
+    without validating again (email validation alone costs tens of
+    microseconds per call).
     
     Args:
-        authorization: Authorization header value (e.g., "Bearer <token>")
+        user: User loaded from the database
         
     Returns:
-        str: Extracted JWT token
-        
-    Raises:
-        HTTPException: If header is missing or malformed
+        UserResponse: User without sensitive fields
     """
-    if not authorization:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Authorization header missing"
-        )
-    
-    parts = authorization.split()
-    if len(parts) != 2 or parts[0].lower() != "bearer":
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid authorization header format. Expected: Bearer <token>"
-        )
-    
-    return parts[1]
+    return UserResponse.model_construct(
+        _id=user.id,
+        email=user.email,
+        name=user.name,
+        created_at=user.created_at,
+        last_login=user.last_login,
+        profile=user.profile
+    )
 
 
 @router.post(
@@ -144,14 +140,7 @@ async def register(user_data: UserCreate):
         user, access_token = await auth_service.register_user(user_data)
         
         # Convert to response model (exclude password_hash)
-        user_response = UserResponse(
-            _id=user.id,
-            email=user.email,
-            name=user.name,
-            created_at=user.created_at,
-            last_login=user.last_login,
-            profile=user.profile
-        )
+        user_response = _user_to_response(user)
         
         logger.info(f"✅ User registered successfully: {user.email}")
         
@@ -234,14 +223,7 @@ async def login(credentials: UserLogin):
         user, access_token = await auth_service.authenticate_user(credentials)
         
         # Convert to response model (exclude password_hash)
-        user_response = UserResponse(
-            _id=user.id,
-            email=user.email,
-            name=user.name,
-            created_at=user.created_at,
-            last_login=user.last_login,
-            profile=user.profile
-        )
+        user_response = _user_to_response(user)
         
         logger.info(f"✅ User logged in successfully: {user.email}")
         
@@ -388,14 +370,7 @@ async def get_current_user(authorization: Optional[str] = Header(None)):
         user = await auth_service.verify_token(token)
         
         # Convert to response model (exclude password_hash)
-        user_response = UserResponse(
-            _id=user.id,
-            email=user.email,
-            name=user.name,
-            created_at=user.created_at,
-            last_login=user.last_login,
-            profile=user.profile
-        )
+        user_response = _user_to_response(user)
         
         logger.info(f"✅ User profile retrieved: {user.email}")
         
@@ -500,14 +475,7 @@ async def update_profile(
             )
         
         # Convert to response model (exclude password_hash)
-        user_response = UserResponse(
-            _id=updated_user.id,
-            email=updated_user.email,
-            name=updated_user.name,
-            created_at=updated_user.created_at,
-            last_login=updated_user.last_login,
-            profile=updated_user.profile
-        )
+        user_response = _user_to_response(updated_user)
         
         logger.info(f"✅ User profile updated: {updated_user.email}")
         
@@ -1,22 +1,30 @@
 """
 Chat History API Routes
 """
-from fastapi import APIRouter, HTTPException, status, Depends, Query
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Request
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
 from typing import List, Optional
 import logging
 
 from models.chat_conversation import (
     ChatConversationCreate,
     ChatConversationResponse,
+    ChatConversationSummaryResponse,
+    Message,
     MessageCreate
 )
 from repositories.chat_repository import chat_repository
 from core.dependencies import get_current_user_id
+from utils.http_cache import json_response_with_etag
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/chat", tags=["Chat History"])
 
+# Serializes a conversation's message history in a single call
+_MESSAGES_ADAPTER: TypeAdapter = TypeAdapter(List[Message])
+
 
 @router.post(
     "/conversations",
@@ -50,10 +58,12 @@ async def create_conversation(
 
 @router.get(
     "/conversations",
-    response_model=List[ChatConversationResponse],
+    # Documents the response shape without validating it at runtime
+    responses={200: {"model": List[ChatConversationSummaryResponse]}},
     summary="Get user's chat conversations"
 )
 async def get_conversations(
+    request: Request,
     conversation_type: Optional[str] = Query(None, description="Filter by type: therapy or shadow_work"),
     limit: int = Query(50, ge=1, le=100),
     user_id: str = Depends(get_current_user_id)
@@ -64,17 +74,19 @@ async def get_conversations(
             user_id, conversation_type, limit
         )
         
-        return [
-            ChatConversationResponse(
-                _id=conv.id,
-                title=conv.title,
-                conversation_type=conv.conversation_type,
-                messages=[msg.model_dump() for msg in conv.messages],
-                created_at=conv.created_at.isoformat() + 'Z',
-                updated_at=conv.updated_at.isoformat() + 'Z'
-            )
+        # Plain dicts are encoded directly, without a response model pass or
+        # jsonable_encoder; the ETag lets polling clients get a 304 while the
+        # list is unchanged
+        return json_response_with_etag(request, [
+            {
+                "_id": conv.id,
+                "title": conv.title,
+                "conversation_type": conv.conversation_type,
+                "created_at": conv.created_at.isoformat() + 'Z',
+                "updated_at": conv.updated_at.isoformat() + 'Z'
+            }
             for conv in conversations
-        ]
+        ])
     except Exception as e:
         logger.error(f"Error retrieving conversations: {str(e)}")
         raise HTTPException(
@@ -85,7 +97,7 @@ async def get_conversations(
 
 @router.get(
     "/conversations/{conversation_id}",
-    response_model=ChatConversationResponse,
+    responses={200: {"model": ChatConversationResponse}},
     summary="Get a specific conversation"
 )
 async def get_conversation(
@@ -102,14 +114,18 @@ async def get_conversation(
                 detail="Conversation not found"
             )
         
-        return ChatConversationResponse(
-            _id=conversation.id,
-            title=conversation.title,
-            conversation_type=conversation.conversation_type,
-            messages=[msg.model_dump() for msg in conversation.messages],
-            created_at=conversation.created_at.isoformat() + 'Z',
-            updated_at=conversation.updated_at.isoformat() + 'Z'
-        )
+        # Returned as a response directly so the history is neither
+        # revalidated through a response model nor walked by
+        # jsonable_encoder; the adapter dumps it in one pydantic-core call
+        # and orjson encodes the datetimes
+        return ORJSONResponse({
+            "_id": conversation.id,
+            "title": conversation.title,
+            "conversation_type": conversation.conversation_type,
+            "messages": _MESSAGES_ADAPTER.dump_python(conversation.messages),
+            "created_at": conversation.created_at.isoformat() + 'Z',
+            "updated_at": conversation.updated_at.isoformat() + 'Z'
+        })
     except HTTPException:
         raise
     except Exception as e:
@@ -151,6 +167,37 @@ async def add_message(
         )
 
 
+@router.post(
+    "/messages/bulk",
+    status_code=status.HTTP_201_CREATED,
+    summary="Add several messages to a conversation"
+)
+async def add_messages_bulk(
+    conversation_id: str = Query(..., description="Conversation ID"),
+    messages_data: List[MessageCreate] = ...,
+    user_id: str = Depends(get_current_user_id)
+):
+    """Add several messages to an existing conversation in one write."""
+    try:
+        success = await chat_repository.add_messages_bulk(conversation_id, user_id, messages_data)
+        
+        if not success:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Conversation not found or not owned by user"
+            )
+        
+        return {"message": f"{len(messages_data)} messages added successfully"}
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error adding messages: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to add messages"
+        )
+
+
 @router.delete(
     "/conversations/{conversation_id}",
     status_code=status.HTTP_204_NO_CONTENT,
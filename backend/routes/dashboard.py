@@ -0,0 +1,59 @@
+"""
+Dashboard API Routes
+"""
+from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi.responses import ORJSONResponse
+import logging
+
+from services.dashboard_service import dashboard_service
+from core.dependencies import get_current_user_id
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/dashboard", tags=["Dashboard"])
+
+
+@router.get(
+    "",
+    summary="Get user's dashboard"
+)
+async def get_dashboard(
+    user_id: str = Depends(get_current_user_id)
+):
+    """Get the latest wellness plan, recent mood logs and mood log count."""
+    try:
+        snapshot = await dashboard_service.get_dashboard_snapshot(user_id)
+        plan = snapshot.latest_plan
+
+        # Returned as a response directly so FastAPI's jsonable_encoder walk
+        # is skipped
+        return ORJSONResponse({
+            "latest_plan": {
+                "_id": plan.id,
+                "activities": plan.activities,
+                "goals": plan.goals,
+                "notes": plan.notes,
+                "created_at": plan.created_at.isoformat() + 'Z'
+            } if plan else None,
+            "mood_logs": [
+                {
+                    "_id": log.id,
+                    "date": log.date,
+                    "mood": log.mood,
+                    "energy": log.energy,
+                    "anxiety": log.anxiety,
+                    "sleep": log.sleep,
+                    "activities": log.activities,
+                    "notes": log.notes,
+                    "created_at": log.created_at.isoformat() + 'Z'
+                }
+                for log in snapshot.recent_mood_logs
+            ],
+            "mood_log_count": snapshot.mood_log_count
+        })
+    except Exception as e:
+        logger.error(f"Error retrieving dashboard: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve dashboard"
+        )
@@ -1,13 +1,15 @@
 """
 Mood Log API Routes
 """
-from fastapi import APIRouter, HTTPException, status, Depends
-from typing import List
+from fastapi import APIRouter, HTTPException, status, Depends, Query
+from fastapi.responses import ORJSONResponse
+from typing import List, Optional
 import logging
 
 from models.mood_log import MoodLogCreate, MoodLogResponse
 from repositories.mood_log_repository import mood_log_repository
 from core.dependencies import get_current_user_id
+from utils.pagination import encode_cursor, decode_cursor
 
 logger = logging.getLogger(__name__)
 
@@ -47,35 +49,70 @@ async def create_mood_log(
         )
 
 
+@router.post(
+    "/bulk",
+    response_model=List[MoodLogResponse],
+    status_code=status.HTTP_201_CREATED,
+    summary="Create several mood logs"
+)
+async def create_mood_logs_bulk(
+    mood_datas: List[MoodLogCreate],
+    user_id: str = Depends(get_current_user_id)
+):
+    """Create several mood logs for the authenticated user in one write."""
+    try:
+        mood_logs = await mood_log_repository.create_mood_logs_bulk(user_id, mood_datas)
+        
+        return [
+            MoodLogResponse(
+                _id=mood_log.id,
+                date=mood_log.date,
+                mood=mood_log.mood,
+                energy=mood_log.energy,
+                anxiety=mood_log.anxiety,
+                sleep=mood_log.sleep,
+                activities=mood_log.activities,
+                notes=mood_log.notes,
+                created_at=mood_log.created_at.isoformat() + 'Z'
+            )
+            for mood_log in mood_logs
+        ]
+    except Exception as e:
+        logger.error(f"Error creating mood logs: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to create mood logs"
+        )
+
+
 @router.get(
     "",
     summary="Get user's mood logs"
 )
 async def get_mood_logs(
-    limit: int = 100,
-    skip: int = 0,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
     user_id: str = Depends(get_current_user_id)
 ):
-    """Get mood logs for the authenticated user."""
+    """Get mood logs for the authenticated user, newest first."""
+    after = None
+    if cursor is not None:
+        after = decode_cursor(cursor)
+        if after is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+    
     try:
-        mood_logs = await mood_log_repository.get_user_mood_logs(user_id, limit, skip)
+        mood_logs, next_position = await mood_log_repository.get_user_mood_logs_json(user_id, limit, after)
         
-        return {
-            "mood_logs": [
-                {
-                    "_id": log.id,
-                    "date": log.date,
-                    "mood": log.mood,
-                    "energy": log.energy,
-                    "anxiety": log.anxiety,
-                    "sleep": log.sleep,
-                    "activities": log.activities,
-                    "notes": log.notes,
-                    "created_at": log.created_at.isoformat() + 'Z'
-                }
-                for log in mood_logs
-            ]
-        }
+        # Returned as a response directly: the logs are already JSON-ready,
+        # so FastAPI's jsonable_encoder walk over every field is skipped
+        return ORJSONResponse({
+            "mood_logs": mood_logs,
+            "next_cursor": encode_cursor(*next_position) if next_position else None
+        })
     except Exception as e:
         logger.error(f"Error retrieving mood logs: {str(e)}")
         raise HTTPException(
@@ -1,13 +1,14 @@
 """
 Wellness Plan API Routes
 """
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Request
 from typing import List
 import logging
 
 from models.wellness_plan import WellnessPlanCreate, WellnessPlanResponse
 from repositories.wellness_plan_repository import wellness_plan_repository
 from core.dependencies import get_current_user_id
+from utils.http_cache import json_response_with_etag
 
 logger = logging.getLogger(__name__)
 
@@ -45,27 +46,22 @@ async def create_wellness_plan(
 
 @router.get(
     "",
-    response_model=List[WellnessPlanResponse],
+    # Documents the response shape without validating it at runtime
+    responses={200: {"model": List[WellnessPlanResponse]}},
     summary="Get user's wellness plans"
 )
 async def get_wellness_plans(
-    limit: int = 10,
+    request: Request,
+    limit: int = Query(10, ge=1, le=100),
     user_id: str = Depends(get_current_user_id)
 ):
     """Get wellness plans for the authenticated user."""
     try:
-        plans = await wellness_plan_repository.get_user_wellness_plans(user_id, limit)
+        plans = await wellness_plan_repository.get_user_wellness_plans_json(user_id, limit)
         
-        return [
-            WellnessPlanResponse(
-                _id=plan.id,
-                activities=plan.activities,
-                goals=plan.goals,
-                notes=plan.notes,
-                created_at=plan.created_at.isoformat() + 'Z'
-            )
-            for plan in plans
-        ]
+        # The stored documents are encoded directly; the ETag lets polling
+        # clients get a 304 while the list is unchanged
+        return json_response_with_etag(request, plans)
     except Exception as e:
         logger.error(f"Error retrieving wellness plans: {str(e)}")
         raise HTTPException(
@@ -40,6 +40,21 @@ class AnalysisRequest(BaseModel):
     }
 
 
+class BatchAnalysisRequest(BaseModel):
+    """
+    Request model for analyzing several texts in one call.
+    
+    Attributes:
+        items: Analysis requests to process (1-64 items)
+    """
+    items: List[AnalysisRequest] = Field(
+        ...,
+        min_length=1,
+        max_length=64,
+        description="Texts to analyze, processed together"
+    )
+
+
 class AnalysisResponse(BaseModel):
     """
     Response model for text analysis results.
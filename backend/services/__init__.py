@@ -10,6 +10,7 @@ from .auth_service import (
     TokenExpiredError,
     InvalidTokenError,
 )
+from .dashboard_service import DashboardService, DashboardSnapshot, dashboard_service
 
 __all__ = [
     "AuthService",
@@ -19,4 +20,7 @@ __all__ = [
     "UserAlreadyExistsError",
     "TokenExpiredError",
     "InvalidTokenError",
+    "DashboardService",
+    "DashboardSnapshot",
+    "dashboard_service",
 ]
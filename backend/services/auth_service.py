@@ -4,13 +4,17 @@ Authentication Service
 Handles user authentication operations including registration, login,
 and token management. Integrates password hashing, JWT tokens, and user repository.
 """
+import asyncio
 import logging
+import os
+import time
 from typing import Optional, Tuple
 from datetime import datetime
 
 from models.user import UserCreate, UserInDB, UserLogin
 from repositories.user_repository import user_repository
-from utils.password import hash_password, verify_password
+from utils.password import PREHASH_PREFIX, hash_password, verify_password
+from utils.cache import TTLCache
 from utils.jwt_token import create_access_token, verify_token
 from pymongo.errors import DuplicateKeyError
 from jwt.exceptions import InvalidTokenError, ExpiredSignatureError
@@ -50,9 +54,35 @@ class AuthService:
     Provides methods for user registration, authentication, and token management.
     """
     
+    # Decoded payloads of recently verified tokens, so repeated requests with
+    # the same token skip the JWT signature check. Entries never outlive the
+    # token's own expiry.
+    TOKEN_CACHE_SIZE = 10_000
+    TOKEN_CACHE_TTL_SECONDS = 60
+    
     def __init__(self):
         """Initialize authentication service"""
         self.user_repo = user_repository
+        self._token_cache = TTLCache(
+            maxsize=self.TOKEN_CACHE_SIZE,
+            ttl=self.TOKEN_CACHE_TTL_SECONDS
+        )
+        # bcrypt releases the GIL, so hashing in worker threads keeps the
+        # event loop free and uses every core; the limit stops a burst of
+        # logins from taking every thread of the shared executor
+        self._password_slots = asyncio.Semaphore(
+            int(os.getenv("PASSWORD_HASH_CONCURRENCY", str(os.cpu_count() or 1)))
+        )
+    
+    async def _hash_password(self, password: str) -> str:
+        """Hash a password with bcrypt in a worker thread."""
+        async with self._password_slots:
+            return await asyncio.to_thread(hash_password, password)
+    
+    async def _verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        """Check a password against its bcrypt hash in a worker thread."""
+        async with self._password_slots:
+            return await asyncio.to_thread(verify_password, plain_password, hashed_password)
     
     async def register_user(self, user_data: UserCreate) -> Tuple[UserInDB, str]:
         """
@@ -79,14 +109,14 @@ class AuthService:
         try:
             logger.info(f"Attempting to register user: {user_data.email}")
             
-            # Check if email already exists
-            existing_user = await self.user_repo.get_user_by_email(user_data.email)
-            if existing_user:
+            # Check if email already exists (reads only the _id; the unique
+            # index still rejects a concurrent duplicate on insert)
+            if await self.user_repo.email_exists(user_data.email):
                 logger.warning(f"Registration failed: Email already exists: {user_data.email}")
                 raise UserAlreadyExistsError(f"User with email {user_data.email} already exists")
             
             # Hash password
-            password_hash = hash_password(user_data.password)
+            password_hash = await self._hash_password(user_data.password)
             
             # Create user in database
             created_user = await self.user_repo.create_user(user_data, password_hash)
@@ -134,19 +164,28 @@ class AuthService:
         try:
             logger.info(f"Authentication attempt for: {credentials.email}")
             
-            # Get user by email
-            user = await self.user_repo.get_user_by_email(credentials.email)
-            if not user:
+            # Get only the fields needed to check the password
+            stored = await self.user_repo.get_user_credentials(credentials.email)
+            if not stored:
                 logger.warning(f"Authentication failed: User not found: {credentials.email}")
                 raise InvalidCredentialsError("Invalid email or password")
             
             # Verify password
-            if not verify_password(credentials.password, user.password_hash):
+            if not await self._verify_password(credentials.password, stored.password_hash):
                 logger.warning(f"Authentication failed: Invalid password for: {credentials.email}")
                 raise InvalidCredentialsError("Invalid email or password")
             
-            # Update last login timestamp
-            await self.user_repo.update_last_login(user.id)
+            # Upgrade hashes stored before passwords were pre-hashed
+            if not stored.password_hash.startswith(PREHASH_PREFIX):
+                await self.user_repo.update_password(
+                    stored.id, await self._hash_password(credentials.password)
+                )
+            
+            # Update last login timestamp and load the full user in one call
+            user = await self.user_repo.record_login(stored.id)
+            if not user:
+                logger.warning(f"Authentication failed: User removed during login: {credentials.email}")
+                raise InvalidCredentialsError("Invalid email or password")
             
             # Generate access token
             access_token = create_access_token(
@@ -204,8 +243,13 @@ class AuthService:
             >>> user = await auth_service.verify_token(token)
         """
         try:
-            # Verify and decode token
-            payload = verify_token(token)
+            # Verify and decode token, reusing a recent verification
+            payload = self._token_cache.get(token)
+            if payload is None:
+                payload = verify_token(token)
+                ttl = min(self.TOKEN_CACHE_TTL_SECONDS, payload.get("exp", 0) - time.time())
+                if ttl > 0:
+                    self._token_cache.set(token, payload, ttl=ttl)
             
             # Extract user_id
             user_id = payload.get("user_id")
@@ -285,12 +329,12 @@ class AuthService:
                 raise ValueError("User not found")
             
             # Verify current password
-            if not verify_password(current_password, user.password_hash):
+            if not await self._verify_password(current_password, user.password_hash):
                 logger.warning(f"Password change failed: Invalid current password for user: {user_id}")
                 raise InvalidCredentialsError("Current password is incorrect")
             
             # Hash new password
-            new_password_hash = hash_password(new_password)
+            new_password_hash = await self._hash_password(new_password)
             
             # Update password
             success = await self.user_repo.update_password(user_id, new_password_hash)
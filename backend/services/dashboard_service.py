@@ -0,0 +1,70 @@
+"""
+Dashboard Service
+
+Gathers the data a user's dashboard shows from several repositories with
+concurrent queries.
+"""
+import asyncio
+import logging
+from typing import List, NamedTuple, Optional
+
+from models.mood_log import MoodLogInDB
+from models.wellness_plan import WellnessPlanInDB
+from repositories.mood_log_repository import mood_log_repository
+from repositories.wellness_plan_repository import wellness_plan_repository
+
+logger = logging.getLogger(__name__)
+
+
+class DashboardSnapshot(NamedTuple):
+    """Data shown on a user's dashboard"""
+    latest_plan: Optional[WellnessPlanInDB]
+    recent_mood_logs: List[MoodLogInDB]
+    mood_log_count: int
+
+
+class DashboardService:
+    """
+    Dashboard service combining mood log and wellness plan reads.
+
+    The queries are independent, so they share the connection pool
+    concurrently and a snapshot costs one round trip of wall time
+    instead of three.
+    """
+
+    RECENT_MOOD_LOGS = 20
+
+    def __init__(self):
+        """Initialize dashboard service"""
+        self.mood_log_repo = mood_log_repository
+        self.wellness_plan_repo = wellness_plan_repository
+
+    async def get_dashboard_snapshot(self, user_id: str) -> DashboardSnapshot:
+        """
+        Get the latest wellness plan, recent mood logs and mood log count.
+
+        Args:
+            user_id: User's unique identifier
+
+        Returns:
+            DashboardSnapshot: Dashboard data for the user
+        """
+        try:
+            latest_plan, (recent_mood_logs, _), mood_log_count = await asyncio.gather(
+                self.wellness_plan_repo.get_latest_wellness_plan(user_id),
+                self.mood_log_repo.get_user_mood_logs(user_id, limit=self.RECENT_MOOD_LOGS),
+                self.mood_log_repo.get_mood_log_count(user_id),
+            )
+
+            return DashboardSnapshot(
+                latest_plan=latest_plan,
+                recent_mood_logs=recent_mood_logs,
+                mood_log_count=mood_log_count
+            )
+        except Exception as e:
+            logger.error(f"Error building dashboard snapshot: {str(e)}")
+            raise
+
+
+# Global dashboard service instance
+dashboard_service = DashboardService()
@@ -189,3 +189,14 @@ def test_high_stress_includes_safety_message():
     # High stress should trigger safety message
     if data['stress_score'] > 80:
         assert has_safety, "High stress should include safety message"
+
+
+@pytest.mark.parametrize("path, schema", [
+    ("/api/chat/conversations", "ChatConversationSummaryResponse"),
+    ("/api/wellness-plans", "WellnessPlanResponse"),
+])
+def test_list_endpoints_document_item_schema(path, schema):
+    """Test that list endpoints returning raw JSON still document their items."""
+    spec = client.get("/openapi.json").json()
+    content = spec["paths"][path]["get"]["responses"]["200"]["content"]["application/json"]
+    assert content["schema"]["items"]["$ref"] == f"#/components/schemas/{schema}"
@@ -8,9 +8,10 @@ This test verifies that password hashing is irreversible - for any password,
 the hash cannot be reversed to obtain the original password, but the correct
 password can be verified against the hash.
 """
+import bcrypt
 import pytest
 from hypothesis import given, strategies as st, settings
-from utils.password import hash_password, verify_password
+from utils.password import PREHASH_PREFIX, hash_password, verify_password
 
 
 # Strategy for generating valid passwords (at least 8 characters)
@@ -67,14 +68,15 @@ class TestPasswordHashingProperties:
         assert verify_password(password, hashed), \
             "Correct password should verify against its hash"
         
-        # Property 4: Hash should be a valid bcrypt hash format
-        # (starts with $2b$ for bcrypt)
-        assert hashed.startswith('$2b$'), \
-            "Hash should be in bcrypt format"
+        # Property 4: Hash should be a pre-hashed bcrypt hash
+        # (the scheme prefix followed by a $2b$ bcrypt hash)
+        assert hashed.startswith(PREHASH_PREFIX + '$2b$'), \
+            "Hash should be in pre-hashed bcrypt format"
         
         # Property 5: Hash should have consistent length (60 chars for bcrypt)
-        assert len(hashed) == 60, \
-            f"Bcrypt hash should be 60 characters, got {len(hashed)}"
+        bcrypt_hash = hashed[len(PREHASH_PREFIX):]
+        assert len(bcrypt_hash) == 60, \
+            f"Bcrypt hash should be 60 characters, got {len(bcrypt_hash)}"
     
     @given(password=password_strategy)
     @settings(max_examples=100, deadline=None)  # Disable deadline for slow bcrypt
@@ -173,12 +175,15 @@ class TestPasswordHashingProperties:
         # Hash the password
         hashed = hash_password(password)
         
-        # Property: Hash should be in bcrypt format
-        assert hashed.startswith('$2b$'), \
+        # Property: Hash should be the scheme prefix and a bcrypt hash
+        assert hashed.startswith(PREHASH_PREFIX), \
+            "Hash should carry the pre-hash scheme prefix"
+        bcrypt_hash = hashed[len(PREHASH_PREFIX):]
+        assert bcrypt_hash.startswith('$2b$'), \
             "Hash should use bcrypt format"
         
         # Property: Hash should contain salt information
-        parts = hashed.split('$')
+        parts = bcrypt_hash.split('$')
         assert len(parts) == 4, \
             "Bcrypt hash should have 4 parts: empty, version, cost, salt+hash"
         
@@ -222,6 +227,42 @@ class TestPasswordHashingProperties:
                     "Original password should still verify"
 
 
+
+class TestPasswordHashSchemes:
+    """
+    Tests for SHA-256 pre-hashed bcrypt hashes and legacy bcrypt hashes.
+    """
+    
+    @pytest.fixture(autouse=True)
+    def fast_rounds(self, monkeypatch):
+        """Keep bcrypt cheap; the scheme, not the cost, is under test."""
+        monkeypatch.setenv("BCRYPT_ROUNDS", "4")
+    
+    def test_legacy_hash_still_verifies(self):
+        """A bcrypt hash of the raw password, stored before pre-hashing, still verifies."""
+        legacy = bcrypt.hashpw(b"LegacyPass123", bcrypt.gensalt(rounds=4)).decode('utf-8')
+        
+        assert legacy.startswith('$2b$')
+        assert verify_password("LegacyPass123", legacy)
+        assert not verify_password("WrongPass123", legacy)
+    
+    def test_prefixed_hash_verifies(self):
+        """A hash from hash_password carries the prefix and verifies."""
+        hashed = hash_password("SecurePass123")
+        
+        assert hashed.startswith(PREHASH_PREFIX + '$2b$')
+        assert verify_password("SecurePass123", hashed)
+        assert not verify_password("SecurePass124", hashed)
+    
+    def test_long_password_is_not_truncated(self):
+        """Passwords that differ only after bcrypt's 72-byte limit do not match."""
+        password = "a" * 80
+        hashed = hash_password(password)
+        
+        assert verify_password(password, hashed)
+        assert not verify_password("a" * 72 + "b" * 8, hashed)
+
+
 if __name__ == "__main__":
     # Run tests with pytest
     pytest.main([__file__, "-v", "--tb=short"])
@@ -4,14 +4,41 @@ Unit tests for InsightSphere AI backend components.
 These tests verify individual functions and methods work correctly.
 """
 
+import asyncio
+import sys
+import threading
+from datetime import datetime
+from types import SimpleNamespace
+
+from bson import ObjectId
+import httpx
+
 import pytest
-from core.models_nlp import TextAnalyzer
+from core.models_nlp import TextAnalyzer, text_analyzer
 from core.suggestions import SuggestionGenerator
+from core.ai_therapist import AITherapist
+from core.batching import DynamicBatcher
+from core.keyword_scanner import KeywordScanner
+from core.dependencies import extract_token_from_header
+from utils.object_id import parse_object_id
+from utils.cache import ReadThroughCache, read_cache_ttl
+from utils.http_cache import etag_matches, json_response_with_etag
+from starlette.requests import Request
+from utils.pagination import encode_cursor, decode_cursor
+from models.chat_conversation import ChatConversationSummary, MessageCreate
+from repositories.chat_repository import ChatRepository
+from repositories.mood_log_repository import MoodLogRepository
+from repositories.user_repository import UserRepository
+from services.auth_service import AuthService
+from services.dashboard_service import DashboardService
+from utils.jwt_token import create_access_token
+from fastapi import HTTPException
 
 
 # Initialize components
 analyzer = TextAnalyzer()
 suggestion_gen = SuggestionGenerator()
+therapist = AITherapist(api_key=None)
 
 
 class TestTextCleaning:
@@ -36,6 +63,11 @@ class TestTextCleaning:
         words = analyzer._tokenize(text)
         assert len(words) == 5
         assert words == ['i', 'am', 'feeling', 'happy', 'today']
+    
+    def test_word_count_matches_tokenize(self):
+        """Test that word counting agrees with tokenization."""
+        for text in ["i am feeling happy today", "i don't know...", "-- !", ""]:
+            assert analyzer._word_count(text) == len(analyzer._tokenize(text))
 
 
 class TestEmotionDetection:
@@ -216,3 +248,531 @@ class TestAnalysisIntegration:
         result = analyzer.analyze_text(text)
         
         assert result['primary_emotion'].lower() in result['summary'].lower()
+    
+    def test_repeated_analysis_returns_fresh_results(self):
+        """Test that cached analyses are not affected by mutating a result."""
+        text = "I always feel so sad and worried about everything"
+        first = analyzer.analyze_text(text)
+        first['emotions']['sadness'] = 99.0
+        first['cognitive_distortions'].append('mutated')
+        
+        second = analyzer.analyze_text(text.upper())
+        assert second['emotions']['sadness'] != 99.0
+        assert 'mutated' not in second['cognitive_distortions']
+    
+    def test_shared_analyzer_reset_clears_cache(self):
+        """Test that the process-wide analyzer can drop its cached results."""
+        text_analyzer.analyze_text("I am feeling calm and relaxed today")
+        assert len(text_analyzer._analysis_cache) > 0
+        
+        text_analyzer.reset()
+        assert len(text_analyzer._analysis_cache) == 0
+    
+    def test_batch_matches_single_analysis(self):
+        """Test that batch analysis agrees with analyzing texts one at a time."""
+        texts = [
+            "I am so happy and grateful today",
+            "I always feel anxious and nothing works",
+            "I am so happy and grateful today",
+            "...",
+        ]
+        batch = analyzer.analyze_batch(texts)
+        
+        assert len(batch) == len(texts)
+        for text, result in zip(texts, batch):
+            single = analyzer.analyze_text(text)
+            result.pop('timestamp')
+            single.pop('timestamp')
+            assert result == single
+
+
+class TestKeywordScanning:
+    """Tests for single-pass keyword scanning in the AI therapist."""
+    
+    def test_scanner_finds_overlapping_keywords(self):
+        """Test that overlapping and prefix keywords are all reported."""
+        scanner = KeywordScanner({'a': ['no point'], 'b': ['no point living'], 'c': ['pointless']})
+        assert scanner.scan("there is no pointless living") == {'a', 'c'}
+        assert scanner.scan("no point living") == {'a', 'b'}
+    
+    def test_scanner_reports_every_occurrence(self):
+        """Test that finditer yields the start of each occurrence."""
+        scanner = KeywordScanner({'a': ['sad', 'saddest'], 'b': ['dd']})
+        assert sorted(scanner.finditer("sad saddest")) == [(0, 'sad'), (4, 'sad'), (4, 'saddest'), (6, 'dd')]
+    
+    def test_analyzer_counts_whole_words_only(self):
+        """Test that emotion keywords glued to other words are not counted."""
+        assert analyzer.analyze_text("I am sadly bluesy")['emotions']['sadness'] == 0.0
+        assert analyzer.analyze_text("I am sad")['emotions']['sadness'] > 0.0
+    
+    def test_crisis_highest_severity_wins(self):
+        """Test that the highest matching severity is reported."""
+        result = therapist.assess_crisis_level("I feel hopeless and want to die")
+        assert result['crisis_detected'] is True
+        assert result['severity'] == 'high'
+    
+    def test_no_crisis(self):
+        """Test that neutral messages are not flagged."""
+        result = therapist.assess_crisis_level("I had a nice lunch")
+        assert result['crisis_detected'] is False
+        assert result['severity'] == 'none'
+    
+    def test_fallback_category_order(self):
+        """Test that the first matching category in priority order is used."""
+        assert therapist.classify("my boss makes me anxious").fallback_category == 'anxiety'
+        assert therapist.classify("exam tomorrow").fallback_category == 'work'
+        assert therapist.classify("hello there").fallback_category is None
+    
+    def test_classify_combines_crisis_and_fallback(self):
+        """Test that one classification carries both results."""
+        result = therapist.classify("i feel worthless at work")
+        assert result.crisis['severity'] == 'low'
+        assert result.fallback_category == 'work'
+
+
+class TestDynamicBatcher:
+    """Tests for shutting down the request batcher."""
+    
+    def test_stop_fails_batch_in_progress(self):
+        """Test that callers whose batch is being processed are failed on stop."""
+        release = threading.Event()
+        
+        def slow_batch(items):
+            release.wait(5)
+            return items
+        
+        async def run():
+            batcher = DynamicBatcher(slow_batch, max_delay=0)
+            await batcher.start()
+            caller = asyncio.create_task(batcher.process_batched("text"))
+            while not batcher._inflight:
+                await asyncio.sleep(0.001)
+            await batcher.stop()
+            release.set()
+            with pytest.raises(RuntimeError, match="Batcher stopped"):
+                await asyncio.wait_for(caller, 1)
+        
+        asyncio.run(run())
+
+
+class TestGeminiFallback:
+    """Tests for signalling a Gemini failure to the chat route."""
+    
+    def test_failed_call_returns_none(self):
+        """Test that an API error yields None instead of a canned reply."""
+        client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(500)))
+        gemini = AITherapist(api_key="test-key")
+        
+        async def run():
+            async with client:
+                return await gemini.generate_response_async(client, "I feel anxious", [])
+        
+        assert asyncio.run(run()) is None
+    
+    def test_fallback_uses_classification(self):
+        """Test that the fallback reply follows the message's category."""
+        anxious = therapist.fallback_response("I feel anxious", None, therapist.classify("i feel anxious"))
+        assert anxious != therapist.fallback_response("hello there")
+        assert anxious == therapist.fallback_response("So anxious today")
+
+
+class TestTokenExtraction:
+    """Tests for parsing the Authorization header."""
+    
+    def test_bearer_token_extracted(self):
+        """Test that the token follows a case-insensitive Bearer scheme."""
+        assert extract_token_from_header("Bearer abc.def.ghi") == "abc.def.ghi"
+        assert extract_token_from_header("bearer abc.def.ghi") == "abc.def.ghi"
+    
+    @pytest.mark.parametrize("header", ["Bearer\tabc.def.ghi", "Bearer   abc.def.ghi", "Bearer abc.def.ghi "])
+    def test_surrounding_whitespace_accepted(self, header):
+        """Test that any whitespace separator is accepted, as with str.split."""
+        assert extract_token_from_header(header) == "abc.def.ghi"
+    
+    @pytest.mark.parametrize("header", [
+        "Bearer", "Bearer ", "Bearer \t ", "Basic abc", "Bearerabc", "Bearer a b", "Bearer a\tb", "Bearer a\nb"
+    ])
+    def test_malformed_header_rejected(self, header):
+        """Test that malformed headers raise 401."""
+        with pytest.raises(HTTPException) as exc_info:
+            extract_token_from_header(header)
+        assert exc_info.value.status_code == 401
+
+
+class TestObjectIdParsing:
+    """Tests for converting ids from requests to ObjectIds."""
+    
+    def test_valid_id_parsed(self):
+        """Test that a 24-character hex id is converted."""
+        assert str(parse_object_id("507f1f77bcf86cd799439011")) == "507f1f77bcf86cd799439011"
+    
+    @pytest.mark.parametrize("value", ["", "not-an-id", "507f1f77bcf86cd79943901z", None, 42])
+    def test_invalid_id_returns_none(self, value):
+        """Test that malformed ids are rejected without raising."""
+        assert parse_object_id(value) is None
+    
+    def test_stored_object_id_exposed_as_string(self):
+        """Test that user ids stored as ObjectIds load as hex strings."""
+        conversation = ChatConversationSummary.model_validate({
+            "_id": "507f1f77bcf86cd799439011",
+            "user_id": parse_object_id("507f191e810c19729de860ea"),
+            "title": None,
+            "conversation_type": "therapy",
+            "created_at": "2024-01-01T00:00:00",
+            "updated_at": "2024-01-01T00:00:00",
+        })
+        assert conversation.user_id == "507f191e810c19729de860ea"
+
+
+class TestPaginationCursor:
+    """Tests for keyset pagination cursor tokens."""
+    
+    def test_cursor_round_trip(self):
+        """Test that a token decodes to the position it was built from."""
+        created_at = datetime(2024, 1, 2, 3, 4, 5, 123000)
+        token = encode_cursor(created_at, "507f1f77bcf86cd799439011")
+        position = decode_cursor(token)
+        assert position[0] == created_at
+        assert str(position[1]) == "507f1f77bcf86cd799439011"
+    
+    @pytest.mark.parametrize("token", ["", "not a cursor", encode_cursor(datetime(2024, 1, 1), "bad-id")])
+    def test_malformed_cursor_rejected(self, token):
+        """Test that malformed tokens decode to None."""
+        assert decode_cursor(token) is None
+
+
+class TestReadThroughCache:
+    """Tests for the read-through cache shared by the repositories."""
+    
+    @staticmethod
+    def _loader(calls):
+        async def load():
+            calls.append(1)
+            await asyncio.sleep(0)
+            return {"n": len(calls)}
+        return load
+    
+    def test_concurrent_and_repeated_reads_share_one_load(self):
+        """Test that concurrent misses and later hits cost a single load."""
+        cache = ReadThroughCache(maxsize=8, ttl=60)
+        calls = []
+        
+        async def read_many():
+            results = await asyncio.gather(*[cache.get("k", self._loader(calls)) for _ in range(3)])
+            results.append(await cache.get("k", self._loader(calls)))
+            return results
+        
+        results = asyncio.run(read_many())
+        assert len(calls) == 1
+        assert all(result == {"n": 1} for result in results)
+    
+    def test_invalidate_forces_reload(self):
+        """Test that an invalidated key is loaded again."""
+        cache = ReadThroughCache(maxsize=8, ttl=60)
+        calls = []
+        
+        async def read_invalidate_read():
+            await cache.get("k", self._loader(calls))
+            cache.invalidate("k")
+            return await cache.get("k", self._loader(calls))
+        
+        assert asyncio.run(read_invalidate_read()) == {"n": 2}
+    
+    def test_load_in_flight_during_invalidate_is_not_cached(self):
+        """Test that a read started before a write does not cache its result."""
+        cache = ReadThroughCache(maxsize=8, ttl=60)
+        calls = []
+        
+        async def invalidate_mid_load():
+            stale = asyncio.ensure_future(cache.get("k", self._loader(calls)))
+            await asyncio.sleep(0)
+            cache.invalidate("k")
+            await stale
+            return await cache.get("k", self._loader(calls))
+        
+        assert asyncio.run(invalidate_mid_load()) == {"n": 2}
+    
+    def test_missing_values_are_not_cached(self):
+        """Test that None results are returned without being cached."""
+        cache = ReadThroughCache(maxsize=8, ttl=60)
+        
+        async def load_none():
+            return None
+        
+        assert asyncio.run(cache.get("k", load_none)) is None
+        assert len(cache) == 0
+    
+    def test_zero_ttl_disables_cache(self):
+        """Test that a TTL of 0 loads on every read."""
+        cache = ReadThroughCache(maxsize=8, ttl=60)
+        calls = []
+        
+        async def read_twice():
+            await cache.get("k", self._loader(calls), ttl=0)
+            return await cache.get("k", self._loader(calls), ttl=0)
+        
+        assert asyncio.run(read_twice()) == {"n": 2}
+        assert len(cache) == 0
+    
+    @pytest.mark.parametrize("env, expected", [
+        ({"ENV": "dev"}, 5),
+        ({"ENV": "production", "WEB_CONCURRENCY": "1"}, 5),
+        ({"ENV": "production", "WEB_CONCURRENCY": "4"}, 0),
+        ({"ENV": "production", "WEB_CONCURRENCY": "4", "TEST_CACHE_TTL": "2"}, 2),
+    ])
+    def test_ttl_is_off_with_several_workers(self, monkeypatch, env, expected):
+        """Test that the default TTL only applies to a single worker unless overridden."""
+        monkeypatch.delenv("TEST_CACHE_TTL", raising=False)
+        for name, value in env.items():
+            monkeypatch.setenv(name, value)
+        assert read_cache_ttl("TEST_CACHE_TTL", 5) == expected
+
+
+class _FakeCollection:
+    """In-memory stand-in for a collection returning one fixed document."""
+    
+    def __init__(self, doc):
+        self.doc = doc
+        self.reads = 0
+    
+    async def find_one(self, query):
+        self.reads += 1
+        return {**self.doc, "_id": query["_id"]}
+    
+    async def update_one(self, query, update):
+        return SimpleNamespace(modified_count=1)
+
+
+class _CachedChatRepository(ChatRepository):
+    """Chat repository reading from an in-memory collection."""
+    
+    def __init__(self):
+        super().__init__()
+        self.fake_collection = _FakeCollection({
+            "user_id": ObjectId("507f191e810c19729de860ea"), "title": None,
+            "conversation_type": "therapy", "messages": [],
+            "created_at": datetime(2024, 1, 1), "updated_at": datetime(2024, 1, 1),
+        })
+    
+    @property
+    def collection(self):
+        return self.fake_collection
+
+
+class _CachedUserRepository(UserRepository):
+    """User repository reading from an in-memory collection."""
+    
+    def __init__(self):
+        super().__init__()
+        self.fake_collection = _FakeCollection({
+            "email": "user@example.com", "name": "Test User",
+            "password_hash": "hash", "created_at": datetime(2024, 1, 1),
+        })
+    
+    def _get_collection(self):
+        return self.fake_collection
+
+
+class TestRepositoryCacheInvalidation:
+    """Tests that repository writes invalidate their cached reads."""
+    
+    conversation_id = "507f1f77bcf86cd799439011"
+    user_id = "507f191e810c19729de860ea"
+    
+    def test_adding_a_message_invalidates_conversation(self):
+        """Test that adding a message forces the next conversation read to query."""
+        repo = _CachedChatRepository()
+        
+        async def read_write_read():
+            await repo.get_conversation_by_id(self.conversation_id, self.user_id)
+            await repo.get_conversation_by_id(self.conversation_id, self.user_id)
+            await repo.add_message(self.conversation_id, self.user_id, MessageCreate(role="user", content="hi"))
+            await repo.get_conversation_by_id(self.conversation_id, self.user_id)
+        
+        asyncio.run(read_write_read())
+        assert repo.fake_collection.reads == 2
+    
+    def test_password_change_invalidates_user(self):
+        """Test that a password change forces the next user read to query."""
+        repo = _CachedUserRepository()
+        
+        async def read_write_read():
+            await repo.get_user_by_id(self.user_id)
+            await repo.get_user_by_id(self.user_id)
+            await repo.update_password(self.user_id, "new-hash")
+            await repo.get_user_by_id(self.user_id)
+        
+        asyncio.run(read_write_read())
+        assert repo.fake_collection.reads == 2
+    
+    def test_user_cache_off_with_several_workers(self, monkeypatch):
+        """Test that user reads are not cached when several workers run."""
+        monkeypatch.delenv("USER_CACHE_TTL_SECONDS", raising=False)
+        monkeypatch.setenv("ENV", "production")
+        monkeypatch.setenv("WEB_CONCURRENCY", "4")
+        repo = _CachedUserRepository()
+        
+        async def read_twice():
+            await repo.get_user_by_id(self.user_id)
+            await repo.get_user_by_id(self.user_id)
+        
+        asyncio.run(read_twice())
+        assert repo.fake_collection.reads == 2
+
+
+class TestDashboardSnapshot:
+    """Tests for the concurrent dashboard reads."""
+    
+    def test_reads_run_concurrently(self):
+        """Test that the repository reads overlap instead of running in turn."""
+        running = []
+        peak = []
+        
+        async def read(result):
+            running.append(1)
+            peak.append(len(running))
+            await asyncio.sleep(0)
+            running.pop()
+            return result
+        
+        service = DashboardService()
+        service.wellness_plan_repo = SimpleNamespace(get_latest_wellness_plan=lambda user_id: read(None))
+        service.mood_log_repo = SimpleNamespace(
+            get_user_mood_logs=lambda user_id, limit: read(([], None)),
+            get_mood_log_count=lambda user_id: read(0),
+        )
+        
+        snapshot = asyncio.run(service.get_dashboard_snapshot("507f191e810c19729de860ea"))
+        assert snapshot == (None, [], 0)
+        assert max(peak) == 3
+
+
+class _FakeMoodLogCursor:
+    """Chainable stand-in for a Motor cursor over stored mood logs."""
+    
+    def __init__(self, docs):
+        self.docs = docs
+    
+    def sort(self, keys):
+        return self
+    
+    def limit(self, limit):
+        self.docs = self.docs[:limit]
+        return self
+    
+    def batch_size(self, size):
+        return self
+    
+    async def to_list(self, length):
+        return [dict(doc) for doc in self.docs[:length]]
+
+
+class _PagedMoodLogRepository(MoodLogRepository):
+    """Mood log repository reading from a fixed list of stored logs."""
+    
+    def __init__(self, count):
+        super().__init__()
+        self.stored = [
+            {
+                "_id": ObjectId(), "user_id": ObjectId(), "date": "2024-01-01", "mood": 5, "energy": 5,
+                "anxiety": 5, "sleep": 5, "activities": {"exercise": True},
+                "notes": "", "created_at": datetime(2024, 1, 1, 12, 0, index),
+            }
+            for index in range(count)
+        ]
+    
+    @property
+    def collection(self):
+        return SimpleNamespace(find=self._find)
+    
+    def _find(self, query, projection=None):
+        docs = self.stored
+        if projection:
+            docs = [{key: value for key, value in doc.items() if key not in projection} for doc in docs]
+        return _FakeMoodLogCursor(docs)
+
+
+class TestMoodLogPages:
+    """Tests for mood log keyset pages."""
+    
+    user_id = "507f191e810c19729de860ea"
+    
+    def test_exactly_full_last_page_has_no_next_position(self):
+        """Test that a full page with nothing after it ends pagination."""
+        repo = _PagedMoodLogRepository(3)
+        logs, next_position = asyncio.run(repo.get_user_mood_logs(self.user_id, limit=3))
+        assert len(logs) == 3
+        assert next_position is None
+    
+    def test_json_page_is_serializable(self):
+        """Test that JSON pages stringify ids and timestamps."""
+        repo = _PagedMoodLogRepository(3)
+        logs, next_position = asyncio.run(repo.get_user_mood_logs_json(self.user_id, limit=2))
+        assert len(logs) == 2
+        assert logs[0]["_id"] == str(repo.stored[0]["_id"])
+        assert logs[0]["created_at"] == "2024-01-01T12:00:00Z"
+        assert "user_id" not in logs[0]
+        assert next_position == (repo.stored[1]["created_at"], repo.stored[1]["_id"])
+
+
+class TestTokenVerificationCache:
+    """Tests for reusing recent JWT verifications."""
+    
+    user_id = "507f191e810c19729de860ea"
+    
+    def test_repeated_token_is_decoded_once(self, monkeypatch):
+        """Test that the same token skips the signature check the second time."""
+        decodes = []
+        # The services package re-exports the auth_service instance under the
+        # module's name, so look the module up directly
+        auth_service_module = sys.modules[AuthService.__module__]
+        verify = auth_service_module.verify_token
+        
+        def counting_verify(token):
+            decodes.append(token)
+            return verify(token)
+        
+        monkeypatch.setattr(auth_service_module, "verify_token", counting_verify)
+        
+        service = AuthService()
+        service.user_repo = _CachedUserRepository()
+        token = create_access_token(self.user_id)
+        
+        async def verify_twice():
+            return [await service.verify_token(token) for _ in range(2)]
+        
+        users = asyncio.run(verify_twice())
+        assert [user.id for user in users] == [self.user_id, self.user_id]
+        assert len(decodes) == 1
+
+
+class TestETagResponses:
+    """Tests for ETag revalidation of list responses."""
+    
+    @staticmethod
+    def _request(if_none_match=None):
+        headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+        return Request({"type": "http", "method": "GET", "headers": headers})
+    
+    def test_unchanged_content_returns_304(self):
+        """Test that a matching If-None-Match gets an empty 304."""
+        content = [{"_id": "1", "title": "Plan"}]
+        first = json_response_with_etag(self._request(), content)
+        assert first.status_code == 200
+        
+        second = json_response_with_etag(self._request(first.headers["etag"]), content)
+        assert second.status_code == 304
+        assert second.body == b""
+        assert second.headers["etag"] == first.headers["etag"]
+    
+    @pytest.mark.parametrize("header, expected", [
+        (None, False),
+        ('"abc"', True),
+        ('W/"abc"', True),
+        ('"old", "abc"', True),
+        ("*", True),
+        ('"other"', False),
+    ])
+    def test_if_none_match_parsing(self, header, expected):
+        """Test weak comparison against single, listed and wildcard tags."""
+        assert etag_matches(header, '"abc"') is expected
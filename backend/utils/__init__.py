@@ -11,6 +11,12 @@ from .jwt_token import (
     is_token_expired,
     extract_user_id,
 )
+from .cache import ReadThroughCache, TTLCache, read_cache_ttl
+from .http_cache import etag_matches, json_response_with_etag, make_etag
+from .object_id import ObjectIdStr, parse_object_id
+from .pagination import encode_cursor, decode_cursor
+from .timestamps import utc_now, utc_now_iso
+from .workers import worker_count
 
 __all__ = [
     "hash_password",
@@ -23,4 +29,17 @@ __all__ = [
     "get_token_expiration",
     "is_token_expired",
     "extract_user_id",
+    "ReadThroughCache",
+    "TTLCache",
+    "read_cache_ttl",
+    "etag_matches",
+    "json_response_with_etag",
+    "make_etag",
+    "ObjectIdStr",
+    "parse_object_id",
+    "encode_cursor",
+    "decode_cursor",
+    "utc_now",
+    "utc_now_iso",
+    "worker_count",
 ]
@@ -0,0 +1,212 @@
+"""
+In-process caching utilities.
+
+Provides a small bounded LRU cache whose entries expire after a time-to-live,
+and a read-through wrapper that shares concurrent loads of the same key.
+"""
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from utils.workers import worker_count
+
+
+def read_cache_ttl(env_var: str, default: float) -> float:
+    """
+    Get the TTL of a per-process read cache.
+
+    Invalidation only reaches the worker that made the write, so with several
+    workers another one can serve a stale entry until it expires. Unless the
+    environment variable sets a TTL, caching is therefore off (0) when more
+    than one worker runs.
+
+    Args:
+        env_var: Environment variable overriding the TTL in seconds (0 disables)
+        default: TTL used with a single worker
+
+    Returns:
+        float: TTL in seconds
+    """
+    value = os.getenv(env_var)
+    if value is not None:
+        return float(value)
+    return default if worker_count() == 1 else 0
+
+
+class TTLCache:
+    """
+    Bounded LRU mapping whose entries expire after ``ttl`` seconds.
+
+    Intended for use from the event loop thread; it performs no locking.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        timer: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of entries kept (least recently used evicted first)
+            ttl: Default entry lifetime in seconds
+            timer: Monotonic clock used for expiry
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._timer = timer
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Get a cached value.
+
+        Args:
+            key: Cache key
+            default: Value returned on miss or expiry
+
+        Returns:
+            Cached value, or ``default``
+        """
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+
+        expires_at, value = entry
+        if expires_at <= self._timer():
+            del self._data[key]
+            return default
+
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Store a value.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+            ttl: Optional lifetime override in seconds
+        """
+        expires_at = self._timer() + (self.ttl if ttl is None else ttl)
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Remove a key and return its value (expired or not).
+
+        Args:
+            key: Cache key
+            default: Value returned if the key is absent
+
+        Returns:
+            Removed value, or ``default``
+        """
+        entry = self._data.pop(key, None)
+        return default if entry is None else entry[1]
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._data.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, self) is not self
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class ReadThroughCache:
+    """
+    TTLCache in front of an async loader.
+
+    Concurrent misses for one key share a single load, and ``invalidate``
+    both drops the cached value and detaches a load already in flight so a
+    read that started before a write never caches its stale result.
+    ``None`` results are returned but not cached, and a TTL of 0 or less
+    disables caching so every read loads.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        timer: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of entries kept (least recently used evicted first)
+            ttl: Entry lifetime in seconds
+            timer: Monotonic clock used for expiry
+        """
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl, timer=timer)
+        # Loads in flight, shared by concurrent misses for the same key
+        self._pending: Dict[Hashable, asyncio.Task] = {}
+
+    async def get(
+        self,
+        key: Hashable,
+        load: Callable[[], Awaitable[Any]],
+        ttl: Optional[float] = None
+    ) -> Any:
+        """
+        Get a cached value, loading it on a miss.
+
+        Args:
+            key: Cache key
+            load: Coroutine function producing the value for ``key``
+            ttl: Optional lifetime override in seconds (0 or less bypasses the cache)
+
+        Returns:
+            Cached or freshly loaded value
+        """
+        if ttl is None:
+            ttl = self._cache.ttl
+        if ttl <= 0:
+            return await load()
+
+        value = self._cache.get(key)
+        if value is not None:
+            return value
+
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = asyncio.ensure_future(self._load(key, load, ttl))
+            self._pending[key] = pending
+            pending.add_done_callback(
+                lambda task: self._pending.pop(key)
+                if self._pending.get(key) is task else None
+            )
+        # Shielded so one cancelled caller doesn't cancel the shared load
+        return await asyncio.shield(pending)
+
+    async def _load(self, key: Hashable, load: Callable[[], Awaitable[Any]], ttl: float) -> Any:
+        """Run a load and cache its result unless the key was invalidated meanwhile."""
+        value = await load()
+        if value is not None and self._pending.get(key) is asyncio.current_task():
+            self._cache.set(key, value, ttl)
+        return value
+
+    def invalidate(self, key: Hashable) -> None:
+        """
+        Drop a key after its source data changes.
+
+        Args:
+            key: Cache key
+        """
+        self._cache.pop(key)
+        self._pending.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._cache)
@@ -0,0 +1,72 @@
+"""
+HTTP caching utilities.
+
+Serves JSON bodies with an ETag so polling clients that already hold the
+current content get an empty ``304 Not Modified`` instead of the full body.
+"""
+import hashlib
+from typing import Any, Optional
+
+import orjson
+from fastapi import Request
+from fastapi.responses import Response
+
+# Authenticated per-user data: browsers may store it, but must revalidate
+# on every use and shared caches must not keep it
+_CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(body: bytes) -> str:
+    """
+    Build a strong ETag for a response body.
+
+    Args:
+        body: Encoded response body
+
+    Returns:
+        str: Quoted entity tag
+    """
+    return f'"{hashlib.blake2s(body, digest_size=8).hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match header value against an ETag.
+
+    Args:
+        if_none_match: Header value, possibly a comma-separated list
+        etag: Current entity tag
+
+    Returns:
+        bool: True if the client's copy is current
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so W/ prefixes are ignored
+    return any(
+        candidate.strip().removeprefix("W/") == etag
+        for candidate in if_none_match.split(",")
+    )
+
+
+def json_response_with_etag(request: Request, content: Any) -> Response:
+    """
+    Encode content as JSON and answer 304 when the client already has it.
+
+    Args:
+        request: Incoming request, read for If-None-Match
+        content: JSON-serializable response content
+
+    Returns:
+        Response: 200 with the body, or 304 without one, both carrying the ETag
+    """
+    body = orjson.dumps(content)
+    etag = make_etag(body)
+    headers = {"ETag": etag, "Cache-Control": _CACHE_CONTROL}
+
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=body, media_type="application/json", headers=headers)
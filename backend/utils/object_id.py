@@ -0,0 +1,39 @@
+"""
+ObjectId utilities.
+
+Parses ObjectId strings with a single conversion instead of validating
+with ``ObjectId.is_valid`` and then parsing again, and provides a string
+field type for ids stored as ObjectIds.
+"""
+from typing import Annotated, Any, Optional
+from bson import ObjectId
+from bson.errors import InvalidId
+from pydantic import BeforeValidator
+
+
+def parse_object_id(value: Any) -> Optional[ObjectId]:
+    """
+    Convert a value to an ObjectId.
+
+    Args:
+        value: ObjectId, 24-character hex string or 12-byte value
+
+    Returns:
+        Optional[ObjectId]: The ObjectId, or None if the value is not valid
+    """
+    # ObjectId(None) would generate a new id
+    if value is None:
+        return None
+    try:
+        return ObjectId(value)
+    except (InvalidId, TypeError):
+        return None
+
+
+def _object_id_to_str(value: Any) -> Any:
+    """Stringify ObjectIds and pass every other value through unchanged."""
+    return str(value) if isinstance(value, ObjectId) else value
+
+
+# Model field for an id stored as an ObjectId and exposed as its hex string
+ObjectIdStr = Annotated[str, BeforeValidator(_object_id_to_str)]
@@ -0,0 +1,47 @@
+"""
+Pagination utilities.
+
+Encodes keyset pagination positions as opaque URL-safe cursor tokens.
+"""
+import base64
+import binascii
+from datetime import datetime
+from typing import Optional, Tuple
+
+from bson import ObjectId
+
+from .object_id import parse_object_id
+
+
+def encode_cursor(created_at: datetime, object_id: str) -> str:
+    """
+    Build a cursor token for the position after a document.
+
+    Args:
+        created_at: Sort timestamp of the last document returned
+        object_id: ID of the last document returned
+
+    Returns:
+        str: Opaque URL-safe token
+    """
+    raw = f"{created_at.isoformat()}|{object_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> Optional[Tuple[datetime, ObjectId]]:
+    """
+    Parse a cursor token built by ``encode_cursor``.
+
+    Args:
+        token: Cursor token from a previous page
+
+    Returns:
+        Optional[Tuple[datetime, ObjectId]]: The position, or None if the token is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode()
+        created_at, _, object_id = raw.partition("|")
+        position = (datetime.fromisoformat(created_at), parse_object_id(object_id))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None
+    return position if position[1] is not None else None
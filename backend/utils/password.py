@@ -2,13 +2,29 @@
 Password hashing and verification utilities.
 
 Uses bcrypt for secure password hashing with configurable rounds.
+Passwords are pre-hashed with SHA-256 so bcrypt sees a fixed 44-byte input:
+long passphrases are not truncated at bcrypt's 72-byte limit and NUL bytes
+cannot end the input early.
 """
+import base64
+import hashlib
 import os
 import logging
+from typing import Final
+
 import bcrypt
 
 logger = logging.getLogger(__name__)
 
+# Marks stored hashes whose bcrypt input is the pre-hashed password; hashes
+# without it predate pre-hashing and are checked against the raw password
+PREHASH_PREFIX: Final[str] = "$bcrypt-sha256$"
+
+
+def _prehash(password: str) -> bytes:
+    """Reduce a password to the base64 of its SHA-256 digest."""
+    return base64.b64encode(hashlib.sha256(password.encode('utf-8')).digest())
+
 
 def get_bcrypt_rounds() -> int:
     """
@@ -37,7 +53,7 @@ def hash_password(password: str) -> str:
         password: Plain text password to hash
         
     Returns:
-        str: Hashed password (bcrypt hash as string)
+        str: Hashed password (``PREHASH_PREFIX`` followed by the bcrypt hash)
         
     Raises:
         ValueError: If password is empty or invalid
@@ -45,7 +61,7 @@ def hash_password(password: str) -> str:
     Example:
         >>> hashed = hash_password("MySecurePassword123")
         >>> print(hashed)
-        $2b$12$...
+        $bcrypt-sha256$$2b$12$...
     """
     if not password:
         raise ValueError("Password cannot be empty")
@@ -57,13 +73,12 @@ def hash_password(password: str) -> str:
         # Get bcrypt rounds from environment
         rounds = get_bcrypt_rounds()
         
-        # Generate salt and hash password
+        # Generate salt and hash the pre-hashed password
         salt = bcrypt.gensalt(rounds=rounds)
-        password_bytes = password.encode('utf-8')
-        hashed = bcrypt.hashpw(password_bytes, salt)
+        hashed = bcrypt.hashpw(_prehash(password), salt)
         
         # Return as string
-        return hashed.decode('utf-8')
+        return PREHASH_PREFIX + hashed.decode('utf-8')
         
     except Exception as e:
         logger.error(f"Error hashing password: {str(e)}")
@@ -74,6 +89,9 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verify a password against its hash.
     
+    Accepts both pre-hashed hashes from ``hash_password`` and plain bcrypt
+    hashes stored before pre-hashing was introduced.
+    
     Args:
         plain_password: Plain text password to verify
         hashed_password: Hashed password to compare against
@@ -95,11 +113,14 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         return False
     
     try:
-        password_bytes = plain_password.encode('utf-8')
-        hashed_bytes = hashed_password.encode('utf-8')
+        if hashed_password.startswith(PREHASH_PREFIX):
+            password_bytes = _prehash(plain_password)
+            hashed_password = hashed_password[len(PREHASH_PREFIX):]
+        else:
+            password_bytes = plain_password.encode('utf-8')
         
         # Verify password
-        return bcrypt.checkpw(password_bytes, hashed_bytes)
+        return bcrypt.checkpw(password_bytes, hashed_password.encode('utf-8'))
         
     except Exception as e:
         logger.error(f"Error verifying password: {str(e)}")
@@ -0,0 +1,49 @@
+"""
+Timestamp utilities.
+
+Provides a fast UTC ISO 8601 formatter for response timestamps and the
+current UTC time for stored documents.
+"""
+import time
+from datetime import datetime, timezone
+from typing import Optional, Tuple
+
+# (whole second, formatted "YYYY-MM-DDTHH:MM:SS") for the last second seen
+_second_cache: Tuple[Optional[int], str] = (None, '')
+
+
+def utc_now_iso() -> str:
+    """
+    Get the current UTC time as an ISO 8601 string.
+
+    The date/time part is formatted at most once per second and reused;
+    only the microseconds are formatted on every call.
+
+    Returns:
+        str: Timestamp like ``2024-01-01T12:00:00.123456Z``
+    """
+    global _second_cache
+
+    now = time.time()
+    second = int(now)
+
+    cached_second, prefix = _second_cache
+    if cached_second != second:
+        prefix = time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(second))
+        _second_cache = (second, prefix)
+
+    return f"{prefix}.{int((now - second) * 1_000_000):06d}Z"
+
+
+def utc_now() -> datetime:
+    """
+    Get the current UTC time as a naive datetime.
+
+    Replaces the deprecated ``datetime.utcnow()``. The result stays naive
+    because MongoDB returns naive UTC datetimes and responses append ``Z``
+    to ``isoformat()``.
+
+    Returns:
+        datetime: Current UTC time without tzinfo
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None)
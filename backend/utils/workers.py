@@ -0,0 +1,19 @@
+"""
+Server worker settings.
+"""
+import os
+
+
+def worker_count() -> int:
+    """
+    Get the number of worker processes the server runs.
+
+    ENV=dev runs a single auto-reloading worker; any other ENV runs
+    WEB_CONCURRENCY workers, defaulting to the CPU count.
+
+    Returns:
+        int: Number of worker processes
+    """
+    if os.getenv("ENV", "dev") == "dev":
+        return 1
+    return int(os.getenv("WEB_CONCURRENCY", str(os.cpu_count() or 1)))